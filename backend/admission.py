@@ -0,0 +1,196 @@
+"""Admission control for the expensive ``/ai/*`` endpoints.
+
+Three layers decide whether a call may reach the LLM:
+
+* a token bucket per (user, endpoint), so one client cannot burn the quota;
+* a global concurrency limit on in-flight AI calls;
+* a bounded priority queue in front of that limit, where interactive calls
+  (assessments, evaluations) are admitted ahead of bulk ones (learning paths).
+
+Anything that cannot be admitted quickly is shed with 429 (per-user limit) or
+503 (service saturated) and a Retry-After hint instead of piling up.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+INTERACTIVE = 0
+STANDARD = 1
+BULK = 2
+
+# endpoint -> (priority, tokens per second per user, burst per user)
+ENDPOINT_POLICIES: Dict[str, Tuple[int, float, int]] = {
+    "assessment-questions": (INTERACTIVE, 0.5, 5),
+    "skill-evaluation": (INTERACTIVE, 1.0, 10),
+    "interview-questions": (INTERACTIVE, 0.5, 5),
+    "personalized-questions": (STANDARD, 0.2, 3),
+    "career-recommendation": (STANDARD, 0.2, 3),
+    "market-insights": (STANDARD, 0.2, 3),
+    "learning-path": (BULK, 0.05, 2),
+}
+DEFAULT_POLICY = (STANDARD, 0.2, 3)
+MAX_TRACKED_BUCKETS = 100_000
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take one token; return 0 on success or the seconds until one is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+
+def endpoint_name(path: str) -> str:
+    """Endpoint key for an /ai/ path, without its path parameters"""
+    parts = path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 else ""
+
+
+def client_address(peer: str, forwarded_for: Optional[str], trusted_proxies: FrozenSet[str]) -> str:
+    """Address of the client behind any trusted proxies in front of the app
+
+    X-Forwarded-For is only read when the peer itself is a trusted proxy, and
+    then from the right, skipping trusted hops: entries further left were
+    written by the client and could be anything.
+    """
+    if peer not in trusted_proxies or not forwarded_for:
+        return peer
+    for hop in reversed([hop.strip() for hop in forwarded_for.split(",")]):
+        if hop and hop not in trusted_proxies:
+            return hop
+    return peer
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int = 16, max_queue: int = 64, queue_timeout: float = 5.0,
+                 rate_multiplier: float = 1.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate_multiplier = rate_multiplier
+        self.in_flight = 0
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {"rate_limited": 0, "queue_full": 0, "queue_timeout": 0, "evicted": 0}
+        self.total_wait = 0.0
+
+    def policy(self, endpoint: str) -> Tuple[int, float, int]:
+        return ENDPOINT_POLICIES.get(endpoint, DEFAULT_POLICY)
+
+    def _check_rate(self, user_key: str, endpoint: str, now: float) -> None:
+        _, rate, burst = self.policy(endpoint)
+        key = (user_key, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate * self.rate_multiplier, burst, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > MAX_TRACKED_BUCKETS:
+                # Least recently used buckets are full again by now anyway
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        wait = bucket.take(now)
+        if wait:
+            self.rejected["rate_limited"] += 1
+            raise AdmissionRejected(429, "Too many AI requests for this user", wait)
+
+    def _queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _retry_hint(self) -> float:
+        # Rough time for the current backlog to drain through the concurrency limit
+        return self.queue_timeout * (1 + self._queue_depth() / max(1, self.max_concurrent))
+
+    def _evict_lowest(self, priority: int) -> bool:
+        """Shed the lowest-priority waiter if it ranks below a new arrival"""
+        live = [entry for entry in self._waiters if not entry[2].done()]
+        if not live:
+            return False
+        victim = max(live, key=lambda entry: (entry[0], entry[1]))
+        if victim[0] <= priority:
+            return False
+        victim[2].set_exception(AdmissionRejected(503, "Shed in favour of interactive requests", self._retry_hint()))
+        self.rejected["evicted"] += 1
+        return True
+
+    async def acquire(self, user_key: str, endpoint: str) -> None:
+        now = time.monotonic()
+        self._check_rate(user_key, endpoint, now)
+
+        if self.in_flight < self.max_concurrent and not self._queue_depth():
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        priority = self.policy(endpoint)[0]
+        if self._queue_depth() >= self.max_queue and not self._evict_lowest(priority):
+            self.rejected["queue_full"] += 1
+            raise AdmissionRejected(503, "AI service is at capacity", self._retry_hint())
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.queued += 1
+        try:
+            # release() hands its slot over by resolving the future
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # The slot was handed over in the same instant; give it back
+                self.release()
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.rejected["queue_timeout"] += 1
+            raise AdmissionRejected(503, "Timed out waiting for AI capacity", self._retry_hint())
+        finally:
+            self.total_wait += time.monotonic() - now
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self._queue_depth(),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+            "avg_queue_wait_ms": round(self.total_wait / self.queued * 1000, 3) if self.queued else 0.0,
+            "tracked_buckets": len(self._buckets),
+        }
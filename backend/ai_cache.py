@@ -0,0 +1,232 @@
+"""Shared cache for the hot, non-personalized AI responses.
+
+Assessment questions per skill, interview questions per career path and market
+insights are the same for every user, so their completions are cached by
+endpoint and arguments. Concurrent misses for one key share a single LLM call.
+
+Right after a deploy the cache is empty, so a warm-up pass fills it for the
+keys that matter most: a configured list plus the most requested keys from
+the access log, which is persisted to MongoDB so it survives restarts. The
+pass runs under a small concurrency cap and is repeated before entries expire.
+
+When workers share a snapshot (see ``shared_snapshot``), ``shared`` holds the
+responses the publisher generated; a local miss is served from there before
+calling the LLM, and ``export`` hands this cache's entries to the next snapshot.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOG_COLLECTION = "ai_access_log"
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ENTRIES = 5000
+MAX_TRACKED_KEYS = 10_000
+
+CacheKey = Tuple[str, Tuple[str, ...]]
+
+# Set while warming so fetch() regenerates an entry instead of serving it
+_refreshing = contextvars.ContextVar("ai_cache_refreshing", default=False)
+
+
+def make_key(endpoint: str, *args: str) -> CacheKey:
+    return endpoint, tuple(str(arg).strip().lower() for arg in args)
+
+
+def _counted(counts: Dict[CacheKey, int], key: CacheKey) -> Dict[CacheKey, int]:
+    """``counts`` with one more access of ``key``, capped at MAX_TRACKED_KEYS keys"""
+    counts[key] = counts.get(key, 0) + 1
+    if len(counts) > MAX_TRACKED_KEYS:
+        # Keys come from request paths; keep the hotter half, one-off keys are not worth warming
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        counts = dict(ranked[:MAX_TRACKED_KEYS // 2])
+    return counts
+
+
+def _log_id(key: CacheKey) -> str:
+    """Access log ``_id`` of a key; hashed from its JSON form, so no two argument tuples share one"""
+    endpoint, args = key
+    return hashlib.sha1(json.dumps([endpoint, list(args)]).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[CacheKey, asyncio.Future] = {}
+        self.access_counts: Dict[CacheKey, int] = {}
+        self._unsaved_counts: Dict[CacheKey, int] = {}
+        # Responses published by another process; anything with get(key) -> (expires at, value) or None
+        self.shared: Any = None
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.coalesced = 0
+        self.warmup: Dict[str, Any] = {"state": "idle", "total": 0, "done": 0, "failed": 0,
+                                       "skipped": 0, "runs": 0, "last_started": None, "last_finished": None}
+
+    def _record_access(self, key: CacheKey) -> None:
+        self.access_counts = _counted(self.access_counts, key)
+        self._unsaved_counts = _counted(self._unsaved_counts, key)
+
+    def fresh(self, key: CacheKey, horizon: float = 0.0) -> bool:
+        """Whether a key is cached and will still be valid ``horizon`` seconds from now"""
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic() + horizon
+
+    def servable(self, key: CacheKey) -> bool:
+        """Whether ``fetch`` would answer a key from this cache or the shared one, without producing it"""
+        if self.fresh(key):
+            return True
+        return self.shared is not None and self.shared.get(key) is not None
+
+    async def fetch(self, key: CacheKey, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for a key, produced at most once at a time when missing or stale"""
+        refreshing = _refreshing.get()
+        if not refreshing:
+            self._record_access(key)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            shared = self.shared.get(key) if self.shared is not None else None
+            if shared is not None:
+                # Unix expiry times carry across processes; monotonic ones do not
+                self._store(key, time.monotonic() + shared[0] - time.time(), shared[1])
+                self.hits += 1
+                self.shared_hits += 1
+                return shared[1]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        if not refreshing:
+            self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await produce()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Waiters should fall back like on any failure, not be cancelled themselves
+                future.set_exception(RuntimeError("AI response generation was cancelled"))
+            else:
+                future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        self._store(key, time.monotonic() + self.ttl, value)
+        future.set_result(value)
+        return value
+
+    def _store(self, key: CacheKey, expires: float, value: Any) -> None:
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def export(self) -> List[Tuple[CacheKey, float, Any]]:
+        """Valid entries as (key, expires at as a Unix time, value)"""
+        now, wall_now = time.monotonic(), time.time()
+        return [(key, wall_now + expires - now, value)
+                for key, (expires, value) in self._entries.items() if expires > now]
+
+    def hot_keys(self, limit: int) -> List[CacheKey]:
+        ranked = sorted(self.access_counts.items(), key=lambda item: item[1], reverse=True)
+        return [key for key, _ in ranked[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "warmup": dict(self.warmup),
+        }
+
+
+async def load_access_log(db, limit: int) -> List[CacheKey]:
+    """Most requested keys recorded by earlier workers"""
+    cursor = db[ACCESS_LOG_COLLECTION].find({}, {"endpoint": 1, "args": 1}).sort("count", -1).limit(limit)
+    return [(doc["endpoint"], tuple(doc["args"])) async for doc in cursor]
+
+
+async def save_access_log(db, cache: ResponseCache) -> int:
+    """Add the access counts gathered since the last save to the shared log"""
+    counts, cache._unsaved_counts = cache._unsaved_counts, {}
+    if not counts:
+        return 0
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"_id": _log_id((endpoint, args))},
+            {"$inc": {"count": count}, "$set": {"last_seen": now},
+             "$setOnInsert": {"endpoint": endpoint, "args": list(args)}},
+            upsert=True,
+        )
+        for (endpoint, args), count in counts.items()
+    ]
+    await db[ACCESS_LOG_COLLECTION].bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+async def warm(cache: ResponseCache, keys: Iterable[CacheKey],
+               producers: Dict[str, Callable[..., Awaitable[Any]]], concurrency: int = 4,
+               horizon: float = 0.0) -> Dict[str, Any]:
+    """Regenerate every key that is missing or expires within ``horizon`` seconds"""
+    keys = list(dict.fromkeys(key for key in keys if key[0] in producers))
+    progress = cache.warmup
+    progress.update(state="running", total=len(keys), done=0, failed=0, skipped=0,
+                    last_started=datetime.utcnow().isoformat())
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def warm_one(key: CacheKey) -> None:
+        if cache.fresh(key, horizon):
+            progress["skipped"] += 1
+            return
+        async with semaphore:
+            previous = cache._entries.get(key)
+            token = _refreshing.set(True)
+            try:
+                await producers[key[0]](*key[1])
+            except Exception as e:
+                logger.warning("AI cache warm-up failed", extra={"key": repr(key), "error": str(e)})
+            finally:
+                _refreshing.reset(token)
+        # Producers fall back to mock data instead of raising, so check the cache
+        if cache.fresh(key) and cache._entries.get(key) is not previous:
+            progress["done"] += 1
+        else:
+            progress["failed"] += 1
+
+    try:
+        await asyncio.gather(*(warm_one(key) for key in keys))
+        progress["state"] = "idle"
+    except asyncio.CancelledError:
+        progress["state"] = "cancelled"
+        raise
+    finally:
+        progress["runs"] += 1
+        progress["last_finished"] = datetime.utcnow().isoformat()
+    return dict(progress)
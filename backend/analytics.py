@@ -0,0 +1,312 @@
+"""Cohort analytics materialized into summary collections.
+
+The heavy lifting runs as MongoDB aggregation pipelines on the server, and the
+results are written into small ``cohort_*`` collections. Requests only ever read
+those summaries, so cohort statistics cost the same whether there are ten
+learners or ten million. Every API worker runs the refresh loop, but each
+interval only the worker that claims it in ``cohort_refresh_claims`` refreshes.
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+SKILL_DISTRIBUTION_COLLECTION = "cohort_skill_distribution"
+CAREER_MATCH_COLLECTION = "cohort_career_match"
+INTERVIEW_SCORES_COLLECTION = "cohort_interview_scores"
+REFRESH_CLAIMS_COLLECTION = "cohort_refresh_claims"
+REFRESH_CLAIM_ID = "cohort_views"
+
+DEFAULT_COHORT = "beginner"
+ALL_COHORTS = "all"
+SCORE_BUCKET_WIDTH = 10
+
+
+def _cohort_expr() -> Dict[str, Any]:
+    """Cohort key for a user document (currently the experience level)"""
+    return {"$ifNull": ["$experience_level", DEFAULT_COHORT]}
+
+
+def skill_distribution_pipeline(refreshed_at: datetime) -> List[Dict[str, Any]]:
+    """Per-cohort, per-skill level histogram merged into its summary collection"""
+    return [
+        {"$project": {
+            "cohort": _cohort_expr(),
+            "skills": {"$objectToArray": {"$ifNull": ["$current_skills", {}]}},
+        }},
+        {"$unwind": "$skills"},
+        {"$group": {
+            "_id": {"cohort": "$cohort", "skill": "$skills.k", "level": "$skills.v"},
+            "count": {"$sum": 1},
+        }},
+        {"$group": {
+            "_id": {"cohort": "$_id.cohort", "skill": "$_id.skill"},
+            "learners": {"$sum": "$count"},
+            "level_total": {"$sum": {"$multiply": ["$_id.level", "$count"]}},
+            "levels": {"$push": {"k": {"$toString": "$_id.level"}, "v": "$count"}},
+        }},
+        {"$project": {
+            "_id": {"$concat": ["$_id.cohort", ":", "$_id.skill"]},
+            "cohort": "$_id.cohort",
+            "skill": "$_id.skill",
+            "learners": 1,
+            "level_total": 1,
+            "avg_level": {"$round": [{"$divide": ["$level_total", "$learners"]}, 2]},
+            "level_counts": {"$arrayToObject": "$levels"},
+            "refreshed_at": {"$literal": refreshed_at},
+        }},
+        {"$merge": {
+            "into": SKILL_DISTRIBUTION_COLLECTION,
+            "on": "_id",
+            "whenMatched": "replace",
+            "whenNotMatched": "insert",
+        }},
+    ]
+
+
+def career_match_pipeline(career_paths: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sum of career-match ratios per cohort, mirroring calculate_career_match"""
+    match_fields = {}
+    for path_id, career_path in career_paths.items():
+        required_skills = career_path["required_skills"]
+        total_required = sum(required_skills.values())
+        if total_required == 0:
+            match_fields[path_id] = {"$literal": 0.0}
+            continue
+        capped_levels = [
+            {"$min": [{"$ifNull": [f"$current_skills.{skill}", 0]}, level]}
+            for skill, level in required_skills.items()
+        ]
+        match_fields[path_id] = {"$divide": [{"$add": capped_levels}, total_required]}
+
+    group_stage = {"_id": "$cohort", "learners": {"$sum": 1}}
+    for path_id in match_fields:
+        group_stage[path_id] = {"$sum": f"$matches.{path_id}"}
+
+    return [
+        {"$project": {"cohort": _cohort_expr(), "matches": match_fields}},
+        {"$group": group_stage},
+    ]
+
+
+def interview_scores_pipeline() -> List[Dict[str, Any]]:
+    """Completed interview counts per cohort, career path and score bucket
+
+    The cohort is the interviewing user's, looked up at refresh time like the
+    user-based views.
+    """
+    last_bucket = 100 - SCORE_BUCKET_WIDTH
+    return [
+        {"$match": {"completed_at": {"$exists": True}}},
+        {"$lookup": {"from": "users", "localField": "user_id", "foreignField": "_id", "as": "user"}},
+        {"$project": {
+            "cohort": {"$ifNull": [{"$arrayElemAt": ["$user.experience_level", 0]}, DEFAULT_COHORT]},
+            "career_path": 1,
+            "score": 1,
+            "bucket": {"$min": [
+                last_bucket,
+                {"$multiply": [{"$floor": {"$divide": ["$score", SCORE_BUCKET_WIDTH]}}, SCORE_BUCKET_WIDTH]},
+            ]},
+        }},
+        {"$group": {
+            "_id": {"cohort": "$cohort", "career_path": "$career_path", "bucket": "$bucket"},
+            "count": {"$sum": 1},
+            "score_total": {"$sum": "$score"},
+        }},
+    ]
+
+
+def _bucket_label(bucket: float) -> str:
+    low = int(bucket)
+    high = 100 if low + SCORE_BUCKET_WIDTH >= 100 else low + SCORE_BUCKET_WIDTH - 1
+    return f"{low}-{high}"
+
+
+async def refresh_skill_distribution(db, refreshed_at: datetime) -> None:
+    """Rebuild the skill distribution view and drop rows that disappeared"""
+    await db.users.aggregate(skill_distribution_pipeline(refreshed_at)).to_list(length=None)
+    await db[SKILL_DISTRIBUTION_COLLECTION].delete_many({"refreshed_at": {"$lt": refreshed_at}})
+
+
+async def refresh_career_match(db, career_paths: Dict[str, Dict[str, Any]], refreshed_at: datetime) -> None:
+    """Rebuild the per-cohort average career match view"""
+    rows = await db.users.aggregate(career_match_pipeline(career_paths)).to_list(length=None)
+
+    operations = []
+    for row in rows:
+        cohort = row["_id"]
+        learners = row["learners"]
+        for path_id in career_paths:
+            match_sum = row.get(path_id, 0.0)
+            operations.append(ReplaceOne(
+                {"_id": f"{cohort}:{path_id}"},
+                {
+                    "cohort": cohort,
+                    "career_path": path_id,
+                    "learners": learners,
+                    "match_sum": match_sum,
+                    "avg_match_percentage": round(match_sum / learners * 100, 2) if learners else 0.0,
+                    "refreshed_at": refreshed_at,
+                },
+                upsert=True,
+            ))
+
+    if operations:
+        await db[CAREER_MATCH_COLLECTION].bulk_write(operations, ordered=False)
+    await db[CAREER_MATCH_COLLECTION].delete_many({"refreshed_at": {"$lt": refreshed_at}})
+
+
+async def refresh_interview_scores(db, refreshed_at: datetime) -> None:
+    """Rebuild the per-cohort interview score histogram view"""
+    rows = await db.mock_interviews.aggregate(interview_scores_pipeline()).to_list(length=None)
+
+    per_path: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        key = (row["_id"]["cohort"], row["_id"]["career_path"])
+        summary = per_path.setdefault(key, {"completed": 0, "score_total": 0.0, "histogram": {}})
+        summary["completed"] += row["count"]
+        summary["score_total"] += row["score_total"]
+        summary["histogram"][_bucket_label(row["_id"]["bucket"])] = row["count"]
+
+    operations = [
+        ReplaceOne(
+            {"_id": f"{cohort}:{career_path}"},
+            {
+                "cohort": cohort,
+                "career_path": career_path,
+                "completed": summary["completed"],
+                "score_total": summary["score_total"],
+                "avg_score": round(summary["score_total"] / summary["completed"], 2),
+                "histogram": summary["histogram"],
+                "refreshed_at": refreshed_at,
+            },
+            upsert=True,
+        )
+        for (cohort, career_path), summary in per_path.items()
+    ]
+
+    if operations:
+        await db[INTERVIEW_SCORES_COLLECTION].bulk_write(operations, ordered=False)
+    await db[INTERVIEW_SCORES_COLLECTION].delete_many({"refreshed_at": {"$lt": refreshed_at}})
+
+
+async def refresh_cohort_views(db, career_paths: Dict[str, Dict[str, Any]]) -> datetime:
+    """Recompute every materialized cohort view"""
+    refreshed_at = datetime.utcnow()
+    await asyncio.gather(
+        refresh_skill_distribution(db, refreshed_at),
+        refresh_career_match(db, career_paths, refreshed_at),
+        refresh_interview_scores(db, refreshed_at),
+    )
+    return refreshed_at
+
+
+async def claim_refresh(db, interval_seconds: float) -> bool:
+    """Claim the refresh that is due, so only one of the workers sharing the database runs it
+
+    The claim document holds when the next refresh is due. Moving that time
+    forward only succeeds for the worker that finds it in the past; the others
+    fail to match, or collide on ``_id`` when the document does not exist yet.
+    """
+    now = datetime.utcnow()
+    try:
+        result = await db[REFRESH_CLAIMS_COLLECTION].update_one(
+            {"_id": REFRESH_CLAIM_ID, "next_due": {"$lte": now}},
+            {"$set": {"next_due": now + timedelta(seconds=interval_seconds), "claimed_at": now,
+                      "claimed_by": f"{socket.gethostname()}:{os.getpid()}"}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return bool(result.modified_count or result.upserted_id is not None)
+
+
+async def run_refresh_loop(db, career_paths: Dict[str, Dict[str, Any]], interval_seconds: float) -> None:
+    """Refresh the cohort views forever on a fixed interval, in one worker per interval"""
+    while True:
+        try:
+            if await claim_refresh(db, interval_seconds):
+                await refresh_cohort_views(db, career_paths)
+        except Exception as e:
+            logger.warning("Cohort analytics refresh failed", extra={"error": str(e)})
+        await asyncio.sleep(interval_seconds)
+
+
+def _combine_skill_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fold per-cohort skill rows into a single distribution per skill"""
+    combined: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        skill = combined.setdefault(row["skill"], {"learners": 0, "level_total": 0, "level_counts": {}})
+        skill["learners"] += row["learners"]
+        skill["level_total"] += row["level_total"]
+        for level, count in row["level_counts"].items():
+            skill["level_counts"][level] = skill["level_counts"].get(level, 0) + count
+
+    for skill in combined.values():
+        skill["avg_level"] = round(skill.pop("level_total") / skill["learners"], 2) if skill["learners"] else 0.0
+    return combined
+
+
+def _combine_match_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fold per-cohort career match rows into a single average per path"""
+    combined: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        path = combined.setdefault(row["career_path"], {"learners": 0, "match_sum": 0.0})
+        path["learners"] += row["learners"]
+        path["match_sum"] += row["match_sum"]
+
+    return {
+        path_id: {
+            "learners": path["learners"],
+            "avg_match_percentage": round(path["match_sum"] / path["learners"] * 100, 2) if path["learners"] else 0.0,
+        }
+        for path_id, path in combined.items()
+    }
+
+
+def _combine_interview_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fold per-cohort interview rows into a single histogram per path"""
+    combined: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        path = combined.setdefault(row["career_path"], {"completed": 0, "score_total": 0.0, "histogram": {}})
+        path["completed"] += row["completed"]
+        path["score_total"] += row["score_total"]
+        for bucket, count in row["histogram"].items():
+            path["histogram"][bucket] = path["histogram"].get(bucket, 0) + count
+
+    return {
+        path_id: {
+            "completed": path["completed"],
+            "avg_score": round(path["score_total"] / path["completed"], 2) if path["completed"] else 0.0,
+            "histogram": path["histogram"],
+        }
+        for path_id, path in combined.items()
+    }
+
+
+async def read_cohort_stats(db, cohort: Optional[str] = None) -> Dict[str, Any]:
+    """Read cohort statistics from the materialized views only"""
+    query = {} if cohort in (None, ALL_COHORTS) else {"cohort": cohort}
+
+    skill_rows, match_rows, interview_rows = await asyncio.gather(
+        db[SKILL_DISTRIBUTION_COLLECTION].find(query, {"_id": 0}).to_list(length=None),
+        db[CAREER_MATCH_COLLECTION].find(query, {"_id": 0}).to_list(length=None),
+        db[INTERVIEW_SCORES_COLLECTION].find(query, {"_id": 0}).to_list(length=None),
+    )
+
+    refreshed = [row["refreshed_at"] for row in skill_rows + match_rows + interview_rows]
+
+    return {
+        "cohort": cohort or ALL_COHORTS,
+        "skill_distribution": _combine_skill_rows(skill_rows),
+        "career_match": _combine_match_rows(match_rows),
+        "interview_scores": _combine_interview_rows(interview_rows),
+        "refreshed_at": max(refreshed).isoformat() if refreshed else None,
+    }
@@ -0,0 +1,106 @@
+"""Local answer grading by text similarity, without calling the LLM.
+
+Reference and candidate answers are turned into hashed character n-gram
+vectors (3-5 grams inside word boundaries, English stop words removed,
+sublinear term frequency, L2 normalized), so "deploying" still overlaps with
+"deployment". The cosine similarity of each reference/answer pair is the
+row-wise dot product of the two normalized matrices, so a whole batch is
+graded in one sparse matrix operation. The hashing vectorizer is stateless,
+which keeps a pair's score independent of whatever else is in the batch.
+
+scikit-learn is imported on first use; ``available()`` is False without it and
+callers fall back to keyword scoring.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+MAX_SCORE = 10
+# Similarities at or below LOW score 0, at or above HIGH score full marks
+LOW_SIMILARITY = 0.1
+HIGH_SIMILARITY = 0.6
+MIN_TERM_LENGTH = 4
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+@lru_cache(maxsize=1)
+def _models():
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfTransformer
+
+    def preprocess(text: str) -> str:
+        return " ".join(word for word in _WORD.findall(text.lower()) if word not in ENGLISH_STOP_WORDS)
+
+    vectorizer = HashingVectorizer(analyzer="char_wb", ngram_range=(3, 5), n_features=2 ** 18,
+                                   preprocessor=preprocess, alternate_sign=False, norm=None)
+    weighting = TfidfTransformer(use_idf=False, sublinear_tf=True, norm="l2")
+    return vectorizer, weighting, ENGLISH_STOP_WORDS
+
+
+def available() -> bool:
+    try:
+        _models()
+    except ImportError:
+        return False
+    return True
+
+
+def similarities(references: Sequence[str], answers: Sequence[str]) -> List[float]:
+    """Cosine similarity of each reference with the answer at the same index"""
+    if len(references) != len(answers):
+        raise ValueError("references and answers must have the same length")
+    if not references:
+        return []
+    vectorizer, weighting, _ = _models()
+    matrix = weighting.fit_transform(vectorizer.transform([*references, *answers]))
+    count = len(references)
+    return matrix[:count].multiply(matrix[count:]).sum(axis=1).A1.tolist()
+
+
+def similarity_to_score(similarity: float) -> int:
+    scaled = (similarity - LOW_SIMILARITY) / (HIGH_SIMILARITY - LOW_SIMILARITY)
+    return int(round(min(1.0, max(0.0, scaled)) * MAX_SCORE))
+
+
+def score_answers(references: Sequence[str], answers: Sequence[str]) -> List[int]:
+    """Scores out of 10 for a batch of reference/answer pairs"""
+    return [similarity_to_score(similarity) for similarity in similarities(references, answers)]
+
+
+def reference_text(question: Dict[str, Any]) -> str:
+    """What a good answer to a question should say, or "" if the question has nothing to compare with"""
+    parts = [question.get("expected_answer") or "", " ".join(question.get("expected_keywords") or [])]
+    return " ".join(part for part in parts if part).strip()
+
+
+def key_terms(reference: str, answer: str, limit: int = 5) -> Tuple[List[str], List[str]]:
+    """Reference terms the answer covers and the ones it misses, by shared word prefix"""
+    _, _, stop_words = _models()
+    answer_prefixes = {word[:MIN_TERM_LENGTH] for word in _WORD.findall(answer.lower())}
+    covered: List[str] = []
+    missing: List[str] = []
+    for term in dict.fromkeys(_WORD.findall(reference.lower())):
+        if len(term) < MIN_TERM_LENGTH or term in stop_words:
+            continue
+        (covered if term[:MIN_TERM_LENGTH] in answer_prefixes else missing).append(term)
+    return covered[:limit], missing[:limit]
+
+
+def evaluate_answer(reference: str, answer: str) -> Dict[str, Any]:
+    """Evaluation in the same shape the LLM returns for /ai/skill-evaluation"""
+    score = score_answers([reference], [answer])[0]
+    covered, missing = key_terms(reference, answer)
+    if score >= 8:
+        feedback = "Strong answer that covers the key points."
+    elif score >= 5:
+        feedback = "Reasonable answer, but some expected points are missing or only touched on."
+    else:
+        feedback = "The answer does not address most of what the question asks for."
+    return {
+        "score": f"{score}/{MAX_SCORE}",
+        "feedback": feedback,
+        "strengths": [f"Covers {term}" for term in covered] or ["Attempted the question"],
+        "areas_for_improvement": [f"Explain {term}" for term in missing],
+        "suggestions": ["Use concrete examples and the correct terminology"],
+        "method": "local_similarity",
+    }
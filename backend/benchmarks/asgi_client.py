@@ -0,0 +1,106 @@
+"""Minimal in-process ASGI client for driving the FastAPI app without sockets."""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+class ASGIResponse:
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in headers}
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ASGIClient:
+    """Send HTTP requests and lifespan events straight into an ASGI application"""
+
+    def __init__(self, app, client_host: str = "127.0.0.1"):
+        self.app = app
+        self.client_host = client_host
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_events: Optional[asyncio.Queue] = None
+
+    async def request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                      json_body: Any = None, headers: Optional[Dict[str, str]] = None) -> ASGIResponse:
+        body = b"" if json_body is None else json.dumps(json_body).encode("utf-8")
+        raw_headers = [(b"host", b"testserver"), (b"content-length", str(len(body)).encode())]
+        if json_body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode("latin-1"), value.encode("latin-1")))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "root_path": "",
+            "query_string": urlencode(params or {}, doseq=True).encode("utf-8"),
+            "headers": raw_headers,
+            "client": (self.client_host, 50000),
+            "server": ("testserver", 80),
+        }
+
+        request_sent = False
+        response_done = asyncio.Event()
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+        response_done.set()
+        return ASGIResponse(status, response_headers, b"".join(chunks))
+
+    async def get(self, path: str, **kwargs) -> ASGIResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> ASGIResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def startup(self) -> None:
+        """Run the application's lifespan startup handlers"""
+        self._lifespan_queue = asyncio.Queue()
+        self._lifespan_events = asyncio.Queue()
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan_task = asyncio.create_task(
+            self.app(scope, self._lifespan_queue.get, self._lifespan_events.put)
+        )
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        message = await self._lifespan_events.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"Application startup failed: {message.get('message', '')}")
+
+    async def shutdown(self) -> None:
+        """Run the application's lifespan shutdown handlers"""
+        if not self._lifespan_task:
+            return
+        await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+        await self._lifespan_events.get()
+        await self._lifespan_task
+        self._lifespan_task = None
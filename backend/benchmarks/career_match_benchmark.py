@@ -0,0 +1,65 @@
+"""Throughput of the career match recompute across process pool sizes.
+
+Run from the backend directory:
+
+    python -m benchmarks.career_match_benchmark --users 1000000
+    python -m benchmarks.career_match_benchmark --users 200000 --workers 1 2 4 8
+
+Generates synthetic users' skills, then scores them in batches with
+``jobs.recompute_career_matches.score_batch`` on pools of each requested
+size, the way the job does minus MongoDB. Reports users/sec and
+the speedup over one worker, which should stay close to the worker count up
+to the number of cores.
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import career_matching
+from benchmarks import synthetic
+from jobs import recompute_career_matches
+
+
+def make_batches(users: int, batch_size: int, seed: int) -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    skills = [synthetic.make_skills(rng, count=rng.randint(2, 8)) for _ in range(users)]
+    return [skills[start:start + batch_size] for start in range(0, users, batch_size)]
+
+
+def measure(batches: List[List[Dict[str, Any]]], workers: int, top_k: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start the workers before timing
+        list(pool.map(recompute_career_matches.score_batch, [[{}]] * workers, [top_k] * workers))
+        started = time.perf_counter()
+        results = pool.map(recompute_career_matches.score_batch, batches, [top_k] * len(batches))
+        processed = sum(len(result) for result in results)
+        return processed / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--batch-size", type=int, default=recompute_career_matches.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--top-k", type=int, default=career_matching.DEFAULT_TOP_K)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="pool sizes to compare (default: powers of two up to the core count)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    pool_sizes = args.workers or sorted({min(2 ** power, cores) for power in range(cores.bit_length() + 1)})
+    batches = make_batches(args.users, args.batch_size, args.seed)
+    print(f"{args.users} users in {len(batches)} batches, {cores} cores")
+
+    baseline = None
+    for workers in pool_sizes:
+        throughput = measure(batches, workers, args.top_k)
+        baseline = baseline or throughput
+        print(f"{workers:>3} workers  {throughput:>12,.0f} users/sec  {throughput / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
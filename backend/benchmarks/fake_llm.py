@@ -0,0 +1,101 @@
+"""Deterministic stand-in for the Groq client.
+
+Exposes the same ``client.chat.completions.create(...)`` surface the backend
+calls and answers with well-formed JSON for each prompt the API sends, after a
+configurable log-normal latency. The latency is spent in ``time.sleep`` like a
+synchronous SDK call; the LLM gateway runs synchronous clients on a worker
+thread, so the fake exercises the same path a blocking client would.
+"""
+import json
+import math
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+
+def _questions(count: int, **extra) -> List[Dict[str, Any]]:
+    return [dict({"question": f"Synthetic question {i + 1}", "type": "technical"}, **extra) for i in range(count)]
+
+
+def fake_payload(prompt: str) -> Dict[str, Any]:
+    """Pick a response shape matching the prompt the API sent"""
+    text = prompt.lower()
+    if "assessment questions for" in text and "personalized" not in text:
+        return {"questions": _questions(5, options=["A", "B", "C", "D"], correct_answer="A", explanation="Because")}
+    if "interview questions for" in text:
+        return {"questions": _questions(10, category="core", expected_answer="A clear, structured answer", tips="Be concrete")}
+    if "personalized assessment questions" in text:
+        return {
+            "questions": _questions(5, category="core", expected_answer="A plan", tips="Be specific", career_relevance="High"),
+            "personalized_insights": "Synthetic insight",
+            "recommendations": ["Practice", "Build projects"],
+        }
+    if "learning path" in text:
+        return {
+            "learning_path": [
+                {"phase": i + 1, "title": f"Phase {i + 1}", "skills_to_learn": ["python"], "resources": ["Docs"],
+                 "time_estimate": "40", "projects": ["Project"], "milestones": ["Milestone"]}
+                for i in range(4)
+            ],
+            "total_time": "160",
+            "difficulty": "intermediate",
+            "recommendations": ["Stay consistent"],
+        }
+    if "market insights" in text:
+        return {
+            "demand_trend": "high",
+            "growth_rate": "15%",
+            "salary_range": {"min": "500000", "max": "1500000"},
+            "hot_skills": ["python", "sql"],
+            "market_opportunities": ["Remote work"],
+            "challenges": ["Competition"],
+            "recommendations": ["Upskill"],
+        }
+    if "recommend 3-5 career paths" in text:
+        return {"recommendations": [
+            {"career_path": "Data Analyst", "match_score": "80%", "reason": "Analytical skills",
+             "next_steps": ["Learn SQL"], "market_outlook": "positive"},
+        ]}
+    if "evaluate this answer" in text:
+        return {"score": "8/10", "feedback": "Solid", "strengths": ["Clarity"],
+                "areas_for_improvement": ["Depth"], "suggestions": ["Add examples"]}
+    return {}
+
+
+class _Completions:
+    def __init__(self, owner: "FakeGroqClient"):
+        self._owner = owner
+
+    def create(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 1000, **kwargs):
+        owner = self._owner
+        time.sleep(owner.sample_latency())
+        with owner._lock:
+            owner.calls += 1
+            owner.calls_by_model[model] = owner.calls_by_model.get(model, 0) + 1
+        content = json.dumps(fake_payload(messages[-1]["content"]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeGroqClient:
+    """Groq look-alike with log-normal latency around a median in milliseconds"""
+
+    def __init__(self, median_ms: float = 300.0, sigma: float = 0.5, seed: int = 7):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.calls = 0
+        self.calls_by_model: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self))
+
+    def sample_latency(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        with self._lock:
+            factor = self._random.lognormvariate(0.0, self.sigma)
+        return self.median_ms * factor / 1000.0
+
+    def expected_p99_ms(self) -> float:
+        return self.median_ms * math.exp(2.326 * self.sigma)
@@ -0,0 +1,387 @@
+"""In-memory stand-in for the Motor database used by main.py.
+
+Implements the subset of the Motor collection API the backend calls (find_one,
+find, find_one_and_update, insert/update/replace/delete, bulk_write,
+count_documents, create_index)
+with the query and update operators it relies on. Documents are copied on the
+way in and out so handlers see the same isolation a real server gives them.
+Aggregation pipelines are not emulated; point the harness at a local mongod
+for anything that needs them.
+"""
+import copy
+import uuid
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+_MISSING = object()
+
+
+def _get_path(document: Dict[str, Any], path: str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return _MISSING
+    return value
+
+
+def _set_path(document: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    target = document
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+def _unset_path(document: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    target = document
+    for part in parts[:-1]:
+        target = target.get(part)
+        if not isinstance(target, dict):
+            return
+    target.pop(parts[-1], None)
+
+
+def _compare(op: str, value: Any, argument: Any) -> bool:
+    if op == "$exists":
+        return (value is not _MISSING) == bool(argument)
+    if op == "$eq":
+        return _equals(value, argument)
+    if op == "$ne":
+        return not _equals(value, argument)
+    if op == "$in":
+        return any(_equals(value, candidate) for candidate in argument)
+    if op == "$nin":
+        return not any(_equals(value, candidate) for candidate in argument)
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > argument
+        if op == "$gte":
+            return value >= argument
+        if op == "$lt":
+            return value < argument
+        if op == "$lte":
+            return value <= argument
+    except TypeError:
+        return False
+    raise NotImplementedError(f"Query operator {op} is not supported by the fake database")
+
+
+def _equals(value: Any, expected: Any) -> bool:
+    if value is _MISSING:
+        return expected is None
+    if isinstance(value, list) and not isinstance(expected, list):
+        return expected in value
+    return value == expected
+
+
+def matches(document: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """Whether a document satisfies a MongoDB-style filter"""
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(document, sub) for sub in condition):
+                return False
+            continue
+        if key == "$and":
+            if not all(matches(document, sub) for sub in condition):
+                return False
+            continue
+
+        value = _get_path(document, key)
+        if isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            if not all(_compare(op, value, argument) for op, argument in condition.items()):
+                return False
+        elif not _equals(value, condition):
+            return False
+    return True
+
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    document = copy.deepcopy(document)
+    if not projection:
+        return document
+
+    include = {field for field, flag in projection.items() if flag and field != "_id"}
+    if include:
+        projected = {}
+        if projection.get("_id", 1):
+            projected["_id"] = document.get("_id")
+        for field in include:
+            value = _get_path(document, field)
+            if value is not _MISSING:
+                _set_path(projected, field, value)
+        return projected
+
+    for field, flag in projection.items():
+        if not flag:
+            _unset_path(document, field)
+    return document
+
+
+def _apply_update(document: Dict[str, Any], update: Dict[str, Any], inserting: bool) -> None:
+    for op, fields in update.items():
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            for path, value in fields.items():
+                _set_path(document, path, copy.deepcopy(value))
+        elif op == "$setOnInsert":
+            continue
+        elif op == "$unset":
+            for path in fields:
+                _unset_path(document, path)
+        elif op == "$inc":
+            for path, amount in fields.items():
+                current = _get_path(document, path)
+                _set_path(document, path, (0 if current is _MISSING else current) + amount)
+        elif op in ("$push", "$addToSet"):
+            for path, value in fields.items():
+                current = _get_path(document, path)
+                items = [] if current is _MISSING else current
+                values = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                for item in values:
+                    if op == "$push" or item not in items:
+                        items.append(copy.deepcopy(item))
+                _set_path(document, path, items)
+        else:
+            raise NotImplementedError(f"Update operator {op} is not supported by the fake database")
+
+
+def _sort_key(field: str):
+    def key(document):
+        value = _get_path(document, field)
+        # Missing and None sort first, as in MongoDB
+        return (0, "") if value is _MISSING or value is None else (1, value)
+    return key
+
+
+class FakeCursor:
+    """Async cursor over a snapshot of matching documents"""
+
+    def __init__(self, documents: List[Dict[str, Any]], projection: Optional[Dict[str, Any]] = None):
+        self._documents = documents
+        self._projection = projection
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction: int = 1) -> "FakeCursor":
+        keys = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        for field, field_direction in reversed(keys):
+            self._documents.sort(key=_sort_key(field), reverse=field_direction < 0)
+        return self
+
+    def skip(self, count: int) -> "FakeCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "FakeCursor":
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int) -> "FakeCursor":
+        return self
+
+    def _window(self) -> List[Dict[str, Any]]:
+        end = self._skip + self._limit if self._limit else None
+        return self._documents[self._skip:end]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._window():
+            yield _project(document, self._projection)
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        window = self._window()
+        if length:
+            window = window[:length]
+        return [_project(document, self._projection) for document in window]
+
+
+class FakeCollection:
+    """Dictionary-backed collection keyed by _id"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._documents: Dict[Any, Dict[str, Any]] = {}
+        self.indexes: List[Tuple[Any, Dict[str, Any]]] = []
+
+    def _matching(self, query: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        document_id = (query or {}).get("_id")
+        if document_id is not None and not isinstance(document_id, dict):
+            document = self._documents.get(document_id)
+            return [document] if document is not None and matches(document, query) else []
+        return [document for document in self._documents.values() if matches(document, query)]
+
+    async def find_one(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None, **kwargs):
+        found = self._matching(query)
+        return _project(found[0], projection) if found else None
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None,
+             sort=None, limit: int = 0, skip: int = 0, batch_size: int = 0, **kwargs) -> FakeCursor:
+        cursor = FakeCursor(self._matching(query), projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    async def count_documents(self, query: Optional[Dict[str, Any]] = None, **kwargs) -> int:
+        return len(self._matching(query))
+
+    def _insert(self, document: Dict[str, Any]) -> Any:
+        document = copy.deepcopy(document)
+        document.setdefault("_id", uuid.uuid4().hex)
+        if document["_id"] in self._documents:
+            raise DuplicateKeyError(f"Duplicate _id {document['_id']!r} in {self.name}", 11000)
+        self._documents[document["_id"]] = document
+        return document["_id"]
+
+    async def insert_one(self, document: Dict[str, Any], **kwargs):
+        return SimpleNamespace(inserted_id=self._insert(document), acknowledged=True)
+
+    async def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True, **kwargs):
+        inserted_ids, write_errors = [], []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": e.code, "errmsg": str(e)})
+                if ordered:
+                    break
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors, "nInserted": len(inserted_ids)})
+        return SimpleNamespace(inserted_ids=inserted_ids, acknowledged=True)
+
+    def _update(self, query, update, upsert: bool, many: bool) -> SimpleNamespace:
+        found = self._matching(query)
+        if not many:
+            found = found[:1]
+
+        modified = 0
+        for document in found:
+            before = copy.deepcopy(document)
+            _apply_update(document, update, inserting=False)
+            modified += document != before
+
+        upserted_id = None
+        if not found and upsert:
+            document = {key: value for key, value in (query or {}).items() if not key.startswith("$") and not isinstance(value, dict)}
+            _apply_update(document, update, inserting=True)
+            upserted_id = self._insert(document)
+
+        return SimpleNamespace(matched_count=len(found), modified_count=modified, upserted_id=upserted_id, acknowledged=True)
+
+    async def update_one(self, query, update, upsert: bool = False, **kwargs):
+        return self._update(query, update, upsert, many=False)
+
+    async def update_many(self, query, update, upsert: bool = False, **kwargs):
+        return self._update(query, update, upsert, many=True)
+
+    async def find_one_and_update(self, query, update, projection: Optional[Dict[str, Any]] = None,
+                                  upsert: bool = False, return_document: bool = ReturnDocument.BEFORE, **kwargs):
+        found = self._matching(query)[:1]
+        before = _project(found[0], projection) if found else None
+        result = self._update(query, update, upsert, many=False)
+        if return_document != ReturnDocument.AFTER:
+            return before
+        document = self._documents.get(found[0]["_id"] if found else result.upserted_id)
+        return _project(document, projection) if document is not None else None
+
+    def _replace(self, query, replacement, upsert: bool) -> SimpleNamespace:
+        found = self._matching(query)[:1]
+        if found:
+            document_id = found[0]["_id"]
+            replacement = copy.deepcopy(replacement)
+            replacement["_id"] = document_id
+            modified = int(self._documents[document_id] != replacement)
+            self._documents[document_id] = replacement
+            return SimpleNamespace(matched_count=1, modified_count=modified, upserted_id=None, acknowledged=True)
+        upserted_id = None
+        if upsert:
+            replacement = dict(replacement)
+            if "_id" in (query or {}):
+                replacement.setdefault("_id", query["_id"])
+            upserted_id = self._insert(replacement)
+        return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=upserted_id, acknowledged=True)
+
+    async def replace_one(self, query, replacement, upsert: bool = False, **kwargs):
+        return self._replace(query, replacement, upsert)
+
+    def _delete(self, query, many: bool) -> SimpleNamespace:
+        found = self._matching(query)
+        if not many:
+            found = found[:1]
+        for document in found:
+            del self._documents[document["_id"]]
+        return SimpleNamespace(deleted_count=len(found), acknowledged=True)
+
+    async def delete_one(self, query, **kwargs):
+        return self._delete(query, many=False)
+
+    async def delete_many(self, query, **kwargs):
+        return self._delete(query, many=True)
+
+    async def bulk_write(self, operations, ordered: bool = True, **kwargs):
+        inserted = matched = modified = deleted = upserted = 0
+        for operation in operations:
+            kind = type(operation).__name__
+            if kind == "InsertOne":
+                self._insert(operation._doc)
+                inserted += 1
+                continue
+            if kind in ("UpdateOne", "UpdateMany"):
+                result = self._update(operation._filter, operation._doc, operation._upsert, many=kind == "UpdateMany")
+            elif kind == "ReplaceOne":
+                result = self._replace(operation._filter, operation._doc, operation._upsert)
+            elif kind in ("DeleteOne", "DeleteMany"):
+                deleted += self._delete(operation._filter, many=kind == "DeleteMany").deleted_count
+                continue
+            else:
+                raise NotImplementedError(f"Bulk operation {kind} is not supported by the fake database")
+            matched += result.matched_count
+            modified += result.modified_count
+            upserted += result.upserted_id is not None
+        return SimpleNamespace(
+            inserted_count=inserted, matched_count=matched, modified_count=modified,
+            deleted_count=deleted, upserted_count=upserted, acknowledged=True,
+        )
+
+    async def create_index(self, keys, **kwargs) -> str:
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        self.indexes.append((keys, kwargs))
+        return kwargs.get("name") or "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    def aggregate(self, pipeline, **kwargs):
+        raise NotImplementedError("Aggregation pipelines need a real mongod; pass --mongo-url")
+
+
+class FakeDatabase:
+    """Motor-style database whose collections spring into existence on access"""
+
+    def __init__(self):
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        if name not in self._collections:
+            self._collections[name] = FakeCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, name: str, **kwargs) -> Dict[str, Any]:
+        return {"ok": 1.0}
+
+    async def seed(self, dataset: Dict[str, List[Dict[str, Any]]]) -> None:
+        for name, documents in dataset.items():
+            await self[name].insert_many(documents)
@@ -0,0 +1,114 @@
+"""Page latency of the history endpoints at increasing depth, against a real mongod.
+
+Run from the backend directory with a local MongoDB:
+
+    python -m benchmarks.history_benchmark --mongo-url mongodb://localhost:27017 --records 50000
+
+Seeds one user with ``--records`` mock interviews (plus other users' noise)
+into a scratch database, creates the history indexes, and times fetching the
+page at several depths two ways: keyset pagination with ``history.fetch_page``
+and the skip/limit query it replaces. For each it also prints the index keys
+MongoDB examined, which stays at one page's worth for keyset pages and grows
+with depth for skip. The in-memory fake has no indexes, so this benchmark needs
+mongod.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+import history
+
+DATABASE = "educursus_history_benchmark"
+
+
+async def seed(db, records: int, seed_value: int) -> None:
+    rng = random.Random(seed_value)
+    base = datetime(2024, 1, 1)
+    await db.mock_interviews.drop()
+    batch = []
+    for index in range(records * 2):
+        user_id = "heavy-user" if index % 2 == 0 else f"user-{rng.randint(0, 999)}"
+        batch.append({
+            "_id": f"interview-{index:08d}",
+            "user_id": user_id,
+            "career_path": "ml_engineer",
+            "questions": [{"question": "x" * 200, "difficulty": "medium"}] * 5,
+            "answers": [{"answer": "y" * 400}] * 5,
+            "score": rng.random() * 100,
+            "started_at": base + timedelta(seconds=index * 37),
+        })
+        if len(batch) == 5000:
+            await db.mock_interviews.insert_many(batch)
+            batch = []
+    if batch:
+        await db.mock_interviews.insert_many(batch)
+    await history.ensure_indexes(db)
+
+
+async def keys_examined(cursor) -> int:
+    plan = await cursor.explain()
+    return plan["executionStats"]["totalKeysExamined"]
+
+
+async def measure(db, depth_pages: int, page_size: int, repeats: int) -> Dict[str, Any]:
+    feed = history.INTERVIEWS
+    # Walk to the page with cursors, as a client would
+    cursor = None
+    for _ in range(depth_pages):
+        cursor = (await history.fetch_page(db, feed, "heavy-user", cursor, page_size))["next_cursor"]
+
+    keyset_times, skip_times = [], []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await history.fetch_page(db, feed, "heavy-user", cursor, page_size)
+        keyset_times.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await (db[feed.collection].find({"user_id": "heavy-user"}, feed.projection)
+               .sort([(feed.sort_field, -1), ("_id", -1)]).skip(depth_pages * page_size).limit(page_size)
+               .to_list(length=page_size))
+        skip_times.append((time.perf_counter() - started) * 1000)
+
+    sort = [(feed.sort_field, -1), ("_id", -1)]
+    keyset_keys = await keys_examined(db[feed.collection].find(
+        history.page_query(feed, "heavy-user", cursor), feed.projection).sort(sort).limit(page_size + 1))
+    skip_keys = await keys_examined(db[feed.collection].find({"user_id": "heavy-user"}, feed.projection)
+                                    .sort(sort).skip(depth_pages * page_size).limit(page_size))
+    return {
+        "keyset_ms": statistics.median(keyset_times), "skip_ms": statistics.median(skip_times),
+        "keyset_keys": keyset_keys, "skip_keys": skip_keys,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[DATABASE]
+    await seed(db, args.records, args.seed)
+
+    last_page = args.records // args.page_size - 1
+    print(f"{args.records} interviews for one user, pages of {args.page_size}")
+    print(f"{'page':>6} {'keyset ms':>10} {'keys':>6} {'skip ms':>10} {'keys':>8}")
+    for depth in sorted({0, 10, 100, last_page // 2, last_page}):
+        result = await measure(db, depth, args.page_size, args.repeats)
+        print(f"{depth:>6} {result['keyset_ms']:>10.2f} {result['keyset_keys']:>6} "
+              f"{result['skip_ms']:>10.2f} {result['skip_keys']:>8}")
+    await client.drop_database(DATABASE)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017")
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=history.DEFAULT_PAGE_SIZE)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
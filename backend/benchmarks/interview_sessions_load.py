@@ -0,0 +1,132 @@
+"""Local load test for live interview sessions.
+
+Run from the backend directory:
+
+    python -m benchmarks.interview_sessions_load --sessions 5000 --questions 10
+
+Opens many concurrent sessions on one event loop, answers every question with a
+random think time and finishes each session, exactly as the Socket.IO handlers
+would. Reports per-answer handling latency, event-loop lag, memory per live
+session and the write-behind flush statistics.
+
+By default writes go to a sink that only simulates server latency, so the loop
+lag reflects the session engine rather than the CPU cost of the in-memory
+database; pass --db memory to persist into benchmarks.fake_mongo instead.
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import List
+
+from benchmarks import synthetic
+from benchmarks.fake_mongo import FakeDatabase
+from benchmarks.load_test import percentile
+from interview_sessions import InterviewSessionManager
+
+
+class LatencySink:
+    """Database whose bulk writes only wait for a simulated round-trip"""
+
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+        self.completed = set()
+        self.mock_interviews = self
+
+    async def bulk_write(self, operations, ordered: bool = True):
+        await asyncio.sleep(self.latency_ms / 1000)
+        for operation in operations:
+            if "completed_at" in operation._doc["$set"]:
+                self.completed.add(operation._filter["_id"])
+        return SimpleNamespace(modified_count=len(operations))
+
+    async def count_completed(self) -> int:
+        return len(self.completed)
+
+
+def question_factory(count: int, seed: int):
+    rng = random.Random(seed)
+    questions = [
+        {"question": f"Question {i}", "type": "technical", "expected_keywords": rng.sample(synthetic.ANSWER_WORDS, 4)}
+        for i in range(count)
+    ]
+    return lambda career_path: [dict(question) for question in questions]
+
+
+async def measure_loop_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.01) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, (time.perf_counter() - started - interval) * 1000))
+
+
+async def run(args: argparse.Namespace) -> None:
+    db = FakeDatabase() if args.db == "memory" else LatencySink(args.db_latency_ms)
+    manager = InterviewSessionManager(db, question_factory(args.questions, args.seed),
+                                      flush_interval=args.flush_interval, flush_batch_size=args.flush_batch_size)
+    manager.start()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions = [manager.start_session(f"user{i}", "data_analyst") for i in range(args.sessions)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    answer_latencies: List[float] = []
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(lag_samples, stop))
+
+    async def candidate(index: int) -> None:
+        rng = random.Random(args.seed + index)
+        session_id = sessions[index].session_id
+        for question_index in range(args.questions):
+            await asyncio.sleep(rng.uniform(0, args.think_time))
+            started = time.perf_counter()
+            manager.submit_answer(session_id, question_index, {"answer": synthetic.make_answer(rng, args.answer_words)})
+            answer_latencies.append((time.perf_counter() - started) * 1000)
+        manager.finish_session(session_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(candidate(i) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await lag_task
+    await manager.stop()
+
+    answer_latencies.sort()
+    lag_samples.sort()
+    if args.db == "memory":
+        persisted = await db.mock_interviews.count_documents({"completed_at": {"$exists": True}})
+    else:
+        persisted = await db.count_completed()
+    stats = manager.stats()
+
+    print(f"sessions:            {args.sessions}")
+    print(f"answers:             {len(answer_latencies)} in {elapsed:.2f} s ({len(answer_latencies) / elapsed:,.0f}/s)")
+    print(f"answer p50/p99:      {percentile(answer_latencies, 0.5):.3f} / {percentile(answer_latencies, 0.99):.3f} ms")
+    print(f"loop lag p50/p99:    {percentile(lag_samples, 0.5):.2f} / {percentile(lag_samples, 0.99):.2f} ms")
+    print(f"memory per session:  {(after - before) / args.sessions / 1024:.2f} KiB")
+    print(f"flushes:             {stats['flushes']} ({stats['flushed_documents']} documents, "
+          f"{stats['flushed_documents'] / max(1, stats['flushes']):.0f} per batch)")
+    print(f"persisted completed: {persisted}/{args.sessions}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--answer-words", type=int, default=60)
+    parser.add_argument("--think-time", type=float, default=0.5, help="max seconds between answers")
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    parser.add_argument("--flush-batch-size", type=int, default=500)
+    parser.add_argument("--db", choices=["sink", "memory"], default="sink")
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
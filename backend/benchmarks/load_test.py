@@ -0,0 +1,264 @@
+"""End-to-end load test for the API with synthetic data and a fake LLM.
+
+Run from the backend directory:
+
+    python -m benchmarks.load_test --users 1000 --requests 20000 --concurrency 64 \\
+        --output results/load-$(git rev-parse --short HEAD).json
+    python -m benchmarks.load_test --compare results/load-abc123.json results/load-def456.json
+
+The app is driven in-process through its ASGI interface, so the numbers measure
+the application itself rather than the network stack. Data lives in an
+in-memory Motor stand-in unless --mongo-url points at a local mongod, and the
+Groq client is replaced by a fake with log-normal latency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks import synthetic
+from benchmarks.asgi_client import ASGIClient
+from benchmarks.fake_llm import FakeGroqClient
+from benchmarks.fake_mongo import FakeDatabase
+
+# Relative weights of each user action in the replayed traffic
+ENDPOINT_MIX = [
+    ("login", 25),
+    ("profile", 25),
+    ("skill_gap", 20),
+    ("ai_questions", 15),
+    ("interview_submit", 15),
+]
+
+Sample = Tuple[str, int, float]
+
+
+async def _timed(samples: List[Sample], route: str, call: Awaitable) -> Any:
+    started = time.perf_counter()
+    response = await call
+    samples.append((route, response.status, (time.perf_counter() - started) * 1000))
+    return response
+
+
+async def login(client: ASGIClient, rng: random.Random, user: Dict[str, Any], samples: List[Sample]) -> None:
+    await _timed(samples, "POST /auth/login", client.post(
+        "/auth/login", json_body={"email": user["email"], "password": user["password"]}))
+
+
+async def profile(client: ASGIClient, rng: random.Random, user: Dict[str, Any], samples: List[Sample]) -> None:
+    await _timed(samples, "GET /auth/profile/{user_id}", client.get(f"/auth/profile/{user['_id']}"))
+
+
+async def skill_gap(client: ASGIClient, rng: random.Random, user: Dict[str, Any], samples: List[Sample]) -> None:
+    await _timed(samples, "POST /skill-gap-analysis", client.post(
+        "/skill-gap-analysis", params={"user_id": user["_id"], "career_path_id": rng.choice(synthetic.CAREER_PATH_IDS)}))
+
+
+async def ai_questions(client: ASGIClient, rng: random.Random, user: Dict[str, Any], samples: List[Sample]) -> None:
+    skill = rng.choice(synthetic.SKILLS)
+    await _timed(samples, "GET /ai/assessment-questions/{skill_name}", client.get(
+        f"/ai/assessment-questions/{skill}", headers={"x-user-id": user["_id"]}))
+
+
+async def interview_submit(client: ASGIClient, rng: random.Random, user: Dict[str, Any], samples: List[Sample]) -> None:
+    started = await _timed(samples, "POST /mock-interview", client.post(
+        "/mock-interview", params={"user_id": user["_id"], "career_path_id": rng.choice(synthetic.CAREER_PATH_IDS)}))
+    if started.status != 200:
+        return
+    interview = started.json()
+    answers = [{"answer": synthetic.make_answer(rng)} for _ in interview["questions"]]
+    await _timed(samples, "POST /mock-interview/{interview_id}/submit", client.post(
+        f"/mock-interview/{interview['interview_id']}/submit", json_body=answers))
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "login": login,
+    "profile": profile,
+    "skill_gap": skill_gap,
+    "ai_questions": ai_questions,
+    "interview_submit": interview_submit,
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    by_route: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample[0], []).append(sample)
+
+    def stats(group: List[Sample]) -> Dict[str, Any]:
+        latencies = sorted(latency for _, _, latency in group)
+        return {
+            "count": len(group),
+            "errors": sum(1 for _, status, _ in group if status >= 400),
+            "rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "overall": stats(samples),
+        "routes": {route: stats(group) for route, group in sorted(by_route.items())},
+    }
+
+
+async def open_database(mongo_url: Optional[str], dataset: Dict[str, List[Dict[str, Any]]]):
+    if not mongo_url:
+        database = FakeDatabase()
+        await database.seed(dataset)
+        return database
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+    database = AsyncIOMotorClient(mongo_url).educursus_loadtest
+    for name, documents in dataset.items():
+        await database[name].drop()
+        if documents:
+            await database[name].insert_many(documents)
+    return database
+
+
+def install_fakes(main_module, database, llm_client) -> None:
+    """Point the application module at the benchmark database and LLM"""
+    main_module.db = database
+    main_module.interview_manager.db = database
+    main_module.llm_gateway.client = llm_client
+    if main_module.write_buffer is not None:
+        main_module.write_buffer.db = database
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    # Background jobs would compete with the measured traffic
+    os.environ.setdefault("ANALYTICS_REFRESH_SECONDS", "0")
+    # Every simulated user comes from this one client, which vouches for them like a gateway would
+    os.environ.setdefault("AI_TRUSTED_CALLERS", "127.0.0.1")
+    import main
+
+    dataset = synthetic.generate_dataset(args.users, seed=args.seed)
+    database = await open_database(args.mongo_url, dataset)
+    llm_client = FakeGroqClient(median_ms=args.llm_median_ms, sigma=args.llm_sigma, seed=args.seed)
+    install_fakes(main, database, llm_client)
+
+    client = ASGIClient(main.app)
+    await client.startup()
+
+    users = dataset["users"]
+    names = [name for name, _ in ENDPOINT_MIX]
+    weights = [weight for _, weight in ENDPOINT_MIX]
+    samples: List[Sample] = []
+    issued = 0
+    deadline = time.perf_counter() + args.duration if args.duration else None
+
+    async def worker(worker_id: int) -> None:
+        nonlocal issued
+        rng = random.Random(args.seed * 1000 + worker_id)
+        while issued < args.requests and (deadline is None or time.perf_counter() < deadline):
+            issued += 1
+            scenario = SCENARIOS[rng.choices(names, weights)[0]]
+            await scenario(client, rng, rng.choice(users), samples)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    await client.shutdown()
+
+    result = summarize(samples, elapsed)
+    result.update({
+        "commit": _git_commit(),
+        "recorded_at": datetime.utcnow().isoformat(),
+        "config": {
+            "users": args.users,
+            "requests": args.requests,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "llm_median_ms": args.llm_median_ms,
+            "llm_sigma": args.llm_sigma,
+            "database": "mongod" if args.mongo_url else "in-memory",
+        },
+        "llm_calls": llm_client.calls,
+    })
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"{'route':<45} {'count':>7} {'err':>5} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    rows = list(result["routes"].items()) + [("overall", result["overall"])]
+    for route, stats in rows:
+        print(f"{route:<45} {stats['count']:>7} {stats['errors']:>5} {stats['rps']:>9.1f} "
+              f"{stats['p50_ms']:>8.2f}ms {stats['p95_ms']:>7.2f}ms {stats['p99_ms']:>7.2f}ms")
+
+
+def compare(before_path: str, after_path: str) -> None:
+    """Print per-route p95/p99/RPS changes between two saved runs"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+    print(f"{'route':<45} {'p95 before':>11} {'p95 after':>10} {'p99 before':>11} {'p99 after':>10} {'rps change':>11}")
+    routes = sorted(set(before["routes"]) | set(after["routes"]))
+    for route in routes + ["overall"]:
+        old = before["overall"] if route == "overall" else before["routes"].get(route)
+        new = after["overall"] if route == "overall" else after["routes"].get(route)
+        if not old or not new:
+            print(f"{route:<45} {'(only in one run)':>11}")
+            continue
+        rps_change = (new["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        print(f"{route:<45} {old['p95_ms']:>9.2f}ms {new['p95_ms']:>8.2f}ms "
+              f"{old['p99_ms']:>9.2f}ms {new['p99_ms']:>8.2f}ms {rps_change:>+10.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=10000, help="total user actions to replay")
+    parser.add_argument("--duration", type=float, default=0.0, help="stop after this many seconds (0 = no limit)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-median-ms", type=float, default=300.0)
+    parser.add_argument("--llm-sigma", type=float, default=0.5)
+    parser.add_argument("--mongo-url", help="use a local mongod instead of the in-memory stand-in")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two saved result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
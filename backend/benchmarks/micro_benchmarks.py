@@ -0,0 +1,239 @@
+"""Micro-benchmarks for the pure functions on the request path.
+
+Run from the backend directory:
+
+    python -m benchmarks.micro_benchmarks --save-baseline   # record on the reference machine
+    python -m benchmarks.micro_benchmarks                   # compare, exit 1 on regression, 2 without a baseline
+    python -m benchmarks.micro_benchmarks --filter skill_gap --tolerance 0.5
+
+Each function is exercised with small, realistic and large synthetic inputs.
+Timing is the median of several rounds; allocations are the peak traced bytes
+of a single call and the bytes still held afterwards. A case regresses when its
+median time or peak allocation exceeds the baseline by more than --tolerance.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import synthetic
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro_benchmarks.json")
+ROUNDS = 7
+
+
+class Case:
+    """One function call with fixed inputs; fresh_args rebuilds inputs the function mutates"""
+
+    def __init__(self, name: str, func: Callable, make_args: Callable[[], Tuple], fresh_args: bool = False):
+        self.name = name
+        self.func = func
+        self.make_args = make_args
+        self.fresh_args = fresh_args
+
+
+def _skill_catalog(rng: random.Random, size: int) -> List[str]:
+    base = synthetic.SKILLS
+    return base[:size] if size <= len(base) else base + [f"skill_{i}" for i in range(size - len(base))]
+
+
+def _career_path(rng: random.Random, skills: List[str], phases: int) -> Dict[str, Any]:
+    return {
+        "name": "Synthetic Path",
+        "description": "Generated for benchmarking",
+        "required_skills": {skill: rng.randint(4, 9) for skill in skills},
+        "market_demand": 0.8,
+        "salary_range": {"min": 500000, "max": 1500000},
+        "learning_path": [
+            {"skill": skills[i % len(skills)], "resources": [f"Course {i}", f"Book {i}"], "time_estimate": rng.randint(10, 80)}
+            for i in range(phases)
+        ],
+    }
+
+
+def _interview(rng: random.Random, questions: int, answer_words: int) -> Tuple[List[Dict], List[Dict]]:
+    question_list = [
+        {"question": f"Question {i}", "type": "technical", "expected_keywords": rng.sample(synthetic.ANSWER_WORDS, 4)}
+        for i in range(questions)
+    ]
+    answers = [{"answer": synthetic.make_answer(rng, answer_words)} for _ in range(questions)]
+    return question_list, answers
+
+
+def build_cases(main_module) -> List[Case]:
+    rng = random.Random(1234)
+    constraints = {"part_time": True, "budget_limited": True, "remote_only": True}
+    cases: List[Case] = []
+
+    for size_name, user_size, required_size in (("small", 5, 5), ("realistic", 15, 6), ("large", 1000, 1000)):
+        catalog = _skill_catalog(rng, max(user_size, required_size))
+        user_skills = {skill: rng.randint(0, 10) for skill in catalog[:user_size]}
+        required = {skill: rng.randint(4, 9) for skill in rng.sample(catalog, required_size)}
+        path = _career_path(rng, list(required), 3)
+        cases.append(Case(f"calculate_skill_gap[{size_name}]", main_module.calculate_skill_gap,
+                          lambda u=user_skills, r=required: (u, r)))
+        cases.append(Case(f"calculate_career_match[{size_name}]", main_module.calculate_career_match,
+                          lambda u=user_skills, p=path: (u, p)))
+
+    for size_name, questions, words in (("small", 2, 30), ("realistic", 10, 150), ("large", 100, 2000)):
+        question_list, answers = _interview(rng, questions, words)
+        cases.append(Case(f"evaluate_interview_answers[{size_name}]", main_module.evaluate_interview_answers,
+                          lambda q=question_list, a=answers: (q, a, "data_analyst")))
+
+    for size_name, skills, phases in (("small", 5, 3), ("realistic", 6, 12), ("large", 1000, 1000)):
+        path = _career_path(rng, _skill_catalog(rng, skills), phases)
+        # Inputs are rebuilt for every call in case the function mutates them
+        cases.append(Case(f"apply_constraints_to_path[{size_name}]", main_module.apply_constraints_to_path,
+                          lambda p=path: (json.loads(json.dumps(p)), dict(constraints)), fresh_args=True))
+        cases.append(Case(f"calculate_completion_time[{size_name}]", main_module.calculate_completion_time,
+                          lambda p=path: (p, {"part_time": True})))
+
+    for size_name, skills in (("small", 5), ("realistic", 15), ("large", 1000)):
+        # Levels >= 5 make the skill loop scan every entry before falling through
+        user_skills = {skill: rng.randint(5, 10) for skill in _skill_catalog(rng, skills)}
+        cases.append(Case(f"generate_personalized_mock_questions[{size_name}]",
+                          main_module.generate_personalized_mock_questions,
+                          lambda u=user_skills: (u, ["data", "ai"], "intermediate", "data_analyst", None)))
+
+    spellings = ["Python 3", "JS", "Node.js", "Data Viz", "SQL Server", "Pyhton", "machine learning", "AWS", "Excel"]
+    for size_name, skills in (("small", 5), ("realistic", 15), ("large", 1000)):
+        # Mostly repeated spellings, as in real profiles, plus names the registry does not know
+        names = [rng.choice(spellings) if i % 4 else f"{rng.choice(spellings)} {i}" for i in range(skills)]
+        user_skills = {name: rng.randint(1, 10) for name in names}
+        cases.append(Case(f"normalize_skill_levels[{size_name}]", main_module.skills.normalize_skill_levels,
+                          lambda u=user_skills: (u,)))
+
+    for size_name, items in (("small", 50), ("realistic", 2000), ("large", 100000)):
+        index = main_module.catalog_search.CatalogIndex()
+        index.sync(synthetic.iter_catalog_items(items))
+        index.warm_terms(index.terms())
+        cases.append(Case(f"catalog_typeahead[{size_name}]", index.typeahead, lambda: ("python da",)))
+        cases.append(Case(f"catalog_search[{size_name}]", index.search,
+                          lambda: ("docker deployment",)))
+
+    return cases
+
+
+def _time_case(case: Case) -> Dict[str, float]:
+    if case.fresh_args:
+        # Per-call timing so the input rebuild stays outside the measurement
+        samples = []
+        for _ in range(ROUNDS):
+            calls = []
+            deadline = time.perf_counter() + 0.2
+            while time.perf_counter() < deadline or len(calls) < 3:
+                args = case.make_args()
+                started = time.perf_counter_ns()
+                case.func(*args)
+                calls.append(time.perf_counter_ns() - started)
+            samples.append(statistics.median(calls))
+    else:
+        args = case.make_args()
+        timer = timeit.Timer(lambda: case.func(*args))
+        number, _ = timer.autorange()
+        samples = [total / number * 1e9 for total in timer.repeat(repeat=ROUNDS, number=number)]
+
+    return {"median_ns": statistics.median(samples), "min_ns": min(samples)}
+
+
+def _allocations(case: Case) -> Dict[str, int]:
+    args = case.make_args()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = case.func(*args)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_alloc_bytes": max(0, peak - before), "retained_bytes": max(0, after - before)}
+
+
+def run_cases(cases: List[Case]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for case in cases:
+        results[case.name] = dict(_time_case(case), **_allocations(case))
+        stats = results[case.name]
+        print(f"{case.name:<55} {stats['median_ns'] / 1000:>12.2f} us  {stats['peak_alloc_bytes'] / 1024:>10.1f} KiB peak")
+    return results
+
+
+def find_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                     tolerance: float) -> List[str]:
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in ("median_ns", "peak_alloc_bytes"):
+            # Small absolute floors keep timer noise and allocator jitter from flapping
+            floor = 200 if metric == "median_ns" else 512
+            limit = reference[metric] * (1 + tolerance) + floor
+            if stats[metric] > limit:
+                regressions.append(f"{name}: {metric} {stats[metric]:.0f} > baseline {reference[metric]:.0f}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    parser.add_argument("--output", help="also write this run's results as JSON")
+    args = parser.parse_args()
+
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        # A gate that cannot compare must not pass
+        print(f"No baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+        sys.exit(2)
+
+    import main as main_module
+
+    cases = [case for case in build_cases(main_module) if not args.filter or args.filter in case.name]
+    results = run_cases(cases)
+    document = {"python": sys.version.split()[0], "machine": platform.machine(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if args.save_baseline:
+        existing: Dict[str, Any] = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                existing = json.load(f).get("results", {})
+        existing.update(results)
+        document["results"] = existing
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    unrecorded = sorted(name for name in results if name not in baseline)
+    if unrecorded:
+        print(f"\nNot in the baseline, so not checked: {', '.join(unrecorded)}")
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
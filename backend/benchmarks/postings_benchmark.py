@@ -0,0 +1,74 @@
+"""Ingest synthetic job postings and time searches against the mapped index.
+
+Run from the backend directory:
+
+    python -m benchmarks.postings_benchmark --postings 200000
+
+Writes the postings as JSON Lines, builds the index with jobs.ingest_postings
+into a temporary directory and reports ingest throughput plus p50/p95/p99
+search latency for a fixed query mix.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import job_postings
+from benchmarks import synthetic
+from jobs import ingest_postings
+
+QUERIES = [
+    ("python", None, None),
+    ("react node.js developer", None, None),
+    ("machine learning tensorflow", "ml_engineer", None),
+    ("sql tableau dashboards", "data_analyst", "Bangalore"),
+    ("express mongodb apis", None, "Pune"),
+    ("scalable production pipelines kubernetes", None, None),
+]
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=ingest_postings.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the query mix")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        dump = os.path.join(workdir, "postings.jsonl")
+        with open(dump, "w", encoding="utf-8") as f:
+            for posting in synthetic.iter_postings(args.postings, args.seed):
+                f.write(json.dumps(posting) + "\n")
+
+        output = os.path.join(workdir, "index")
+        meta = ingest_postings.build([dump], output, args.chunk_size, ingest_postings.DEFAULT_WINDOW_DAYS)
+        size = sum(os.path.getsize(os.path.join(output, name)) for name in os.listdir(output))
+        print(f"ingest: {meta['documents']} postings in {meta['seconds']}s "
+              f"({meta['documents'] / meta['seconds']:.0f}/s), {meta['terms']} terms, {size / 1e6:.1f} MB on disk")
+
+        started = time.perf_counter()
+        index = job_postings.PostingsIndex.open(output)
+        print(f"open: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+        for query, career, location in QUERIES:
+            timings = []
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                result = index.search(query, career_path_id=career, location=location, limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"search {query!r} career={career} location={location}: {result['total']} hits, "
+                  f"p50 {statistics.median(timings):.2f} ms, p95 {_percentile(timings, 0.95):.2f} ms, "
+                  f"p99 {_percentile(timings, 0.99):.2f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Bytes on the wire and serialization CPU for the large AI payloads.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization_benchmark
+    python -m benchmarks.serialization_benchmark --answer-words 600 --skills 60
+
+Each payload is rendered three ways: FastAPI's default path
+(``jsonable_encoder`` + ``JSONResponse``), ``FastJSONResponse``, and
+``FastJSONResponse`` with the echoed request fields omitted. For each, the
+table shows the raw size, the gzip and brotli sizes, and the median time to
+serialize and to compress.
+"""
+import argparse
+import gzip
+import random
+import statistics
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks import synthetic
+from benchmarks.fake_llm import fake_payload
+from compression import brotli
+from serialization import FastJSONResponse, omit_fields
+
+ROUNDS = 7
+
+
+def build_payloads(rng: random.Random, answer_words: int, skills: int) -> Dict[str, Tuple[Dict[str, Any], Tuple[str, ...]]]:
+    """Endpoint -> (response body, echoed fields), shaped like the real endpoints"""
+    user_skills = {f"{rng.choice(synthetic.SKILLS)}_{i}": rng.randint(1, 10) for i in range(skills)}
+    generated_at = datetime.now().isoformat()
+    learning_path = fake_payload("learning path")
+    learning_path["learning_path"] *= 3
+    return {
+        "skill-evaluation": ({
+            "skill_name": "python",
+            "question_context": synthetic.make_answer(rng, 40),
+            "user_answer": synthetic.make_answer(rng, answer_words),
+            "evaluation": fake_payload("evaluate this answer"),
+            "evaluated_at": generated_at,
+        }, ("skill_name", "question_context", "user_answer")),
+        "career-recommendation": ({
+            "user_skills": user_skills,
+            "interests": rng.sample(synthetic.ANSWER_WORDS, 8),
+            "experience_level": "intermediate",
+            "recommendations": fake_payload("recommend 3-5 career paths")["recommendations"] * 5,
+            "generated_at": generated_at,
+        }, ("user_skills", "interests", "experience_level")),
+        "learning-path": ({
+            "career_goal": "data_scientist",
+            "user_skills": user_skills,
+            "constraints": {"hours_per_week": 10, "budget": "free", "deadline_months": 6},
+            "learning_path": learning_path,
+            "generated_at": generated_at,
+        }, ("career_goal", "user_skills", "constraints")),
+        "interview-questions": ({
+            "career_path": "data_analyst",
+            "user_level": "intermediate",
+            "questions": fake_payload("interview questions for")["questions"],
+            "generated_at": generated_at,
+        }, ("career_path", "user_level")),
+    }
+
+
+def default_render(content: Dict[str, Any]) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_render(content: Dict[str, Any]) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def median_us(func: Callable, number: int) -> float:
+    return statistics.median(timeit.repeat(func, number=number, repeat=ROUNDS)) / number * 1e6
+
+
+def measure(name: str, render: Callable[[Dict[str, Any]], bytes], content: Dict[str, Any], number: int) -> Dict[str, Any]:
+    body = render(content)
+    row = {
+        "variant": name,
+        "raw_bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+        "serialize_us": median_us(lambda: render(content), number),
+        "gzip_us": median_us(lambda: gzip.compress(body, compresslevel=6), number),
+    }
+    if brotli is not None:
+        row["br_bytes"] = len(brotli.compress(body, quality=4))
+        row["br_us"] = median_us(lambda: brotli.compress(body, quality=4), number)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answer-words", type=int, default=300)
+    parser.add_argument("--skills", type=int, default=40)
+    parser.add_argument("--number", type=int, default=200, help="calls per timing round")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    payloads = build_payloads(random.Random(args.seed), args.answer_words, args.skills)
+    print(f"{'endpoint':<22} {'variant':<14} {'raw':>8} {'gzip':>8} {'br':>8} "
+          f"{'serialize':>11} {'gzip cpu':>10} {'br cpu':>10}")
+    for endpoint, (content, echo_fields) in payloads.items():
+        rows: List[Dict[str, Any]] = [
+            measure("default", default_render, content, args.number),
+            measure("fast", fast_render, content, args.number),
+            measure("fast no-echo", fast_render, omit_fields(content, echo_fields), args.number),
+        ]
+        for row in rows:
+            br_bytes = row.get("br_bytes", "-")
+            br_us = f"{row['br_us']:.1f}us" if "br_us" in row else "-"
+            print(f"{endpoint:<22} {row['variant']:<14} {row['raw_bytes']:>8} {row['gzip_bytes']:>8} {br_bytes:>8} "
+                  f"{row['serialize_us']:>9.1f}us {row['gzip_us']:>8.1f}us {br_us:>10}")
+        speedup = rows[0]["serialize_us"] / rows[1]["serialize_us"] if rows[1]["serialize_us"] else 0.0
+        print(f"{'':<22} serialization speedup {speedup:.1f}x, "
+              f"no-echo gzip size {rows[2]['gzip_bytes'] / rows[0]['gzip_bytes']:.0%} of default")
+
+
+if __name__ == "__main__":
+    main()
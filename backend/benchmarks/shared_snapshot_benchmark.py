@@ -0,0 +1,162 @@
+"""Per-worker memory and startup time with and without a shared snapshot.
+
+Run from the backend directory:
+
+    python -m benchmarks.shared_snapshot_benchmark --workers 4 --catalog-items 50000
+
+Starts ``--workers`` API processes side by side, each importing ``main`` into
+a fresh interpreter with the catalog_items collection holding synthetic
+entries in the in-memory database. Without sharing every worker indexes and
+scores the catalog itself. With sharing a publisher process does it once and
+writes a snapshot (as ``serve.py`` would), and the workers map it. Each worker
+reports the time from ``import main`` to a finished warm-up, and, once all of
+them are up, its RSS, PSS (shared pages split between the processes mapping
+them) and private memory from /proc. The in-memory database is emptied before
+measuring, since MongoDB would hold that data in its own process. An "empty"
+run with no catalog items gives the floor both modes start from.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_LINE = "worker ready"
+
+
+def memory() -> Dict[str, float]:
+    """RSS, PSS and private memory of this process in MiB (Linux only)"""
+    values: Dict[str, float] = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                values[name] = int(rest.split()[0]) / 1024
+    return {"rss_mb": values["Rss"], "pss_mb": values["Pss"],
+            "private_mb": values["Private_Clean"] + values["Private_Dirty"]}
+
+
+async def _seeded_database(items: int, seed: int):
+    from benchmarks import synthetic
+    from benchmarks.fake_mongo import FakeDatabase
+
+    database = FakeDatabase()
+    await database.seed({"catalog_items": [dict(item, _id=item["id"])
+                                           for item in synthetic.iter_catalog_items(items, seed=seed)]})
+    return database
+
+
+async def _child(args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ.setdefault("ANALYTICS_REFRESH_SECONDS", "0")
+    # Workers attached to a snapshot never read catalog_items, so they get an empty database
+    shared_worker = args.child == "worker" and os.getenv("SHARED_SNAPSHOT_DIR")
+    database = await _seeded_database(0 if shared_worker else args.catalog_items, args.seed)
+    started = time.perf_counter()
+    import main
+    from benchmarks.asgi_client import ASGIClient
+    from benchmarks.fake_llm import FakeGroqClient
+    from benchmarks.fake_mongo import FakeDatabase
+    from benchmarks.load_test import install_fakes
+
+    install_fakes(main, database, FakeGroqClient(median_ms=0))
+    if args.child == "publish":
+        version = await main.publish_shared_snapshot(warm_ai=False)
+        return {"publish_ms": (time.perf_counter() - started) * 1000, "version": version}
+
+    client = ASGIClient(main.app)
+    await client.startup()
+    while not (await client.get("/health/ready")).json()["warmup_complete"]:
+        await asyncio.sleep(0.005)
+    ready_ms = (time.perf_counter() - started) * 1000
+    for query in ("python data", "machine learning project", "cloud"):
+        await client.get("/catalog/search", params={"q": query})
+        await client.get("/catalog/typeahead", params={"q": query[:-2]})
+
+    install_fakes(main, FakeDatabase(), FakeGroqClient(median_ms=0))
+    del database
+    gc.collect()
+    # Wait until every worker is up, so shared pages are split between all of them
+    print(READY_LINE, flush=True)
+    sys.stdin.readline()
+    result = {"ready_ms": ready_ms, "catalog_items": len(main.catalog_index), **memory()}
+    await client.shutdown()
+    return result
+
+
+def _command(args: argparse.Namespace, role: str) -> List[str]:
+    return [sys.executable, "-m", "benchmarks.shared_snapshot_benchmark", "--child", role,
+            "--catalog-items", str(args.catalog_items), "--seed", str(args.seed)]
+
+
+def _last_json(output: str) -> Dict[str, Any]:
+    # Log lines go to the same stdout; the result is the last line that is not one
+    for line in reversed(output.strip().splitlines()):
+        decoded = json.loads(line)
+        if "ts" not in decoded:
+            return decoded
+    raise ValueError("no result from the child process")
+
+
+def run_workers(args: argparse.Namespace, environment: Dict[str, str]) -> List[Dict[str, Any]]:
+    workers = [subprocess.Popen(_command(args, "worker"), cwd=BACKEND_DIR, env=environment, text=True,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE) for _ in range(args.workers)]
+    for worker in workers:
+        while True:
+            line = worker.stdout.readline()
+            if not line:
+                raise RuntimeError("a worker exited before it was ready")
+            if line.strip() == READY_LINE:
+                break
+    results = []
+    for worker in workers:
+        output, _ = worker.communicate("measure\n")
+        results.append(_last_json(output))
+    return results
+
+
+def report(label: str, results: List[Dict[str, Any]]) -> None:
+    # Totals are what the host pays for all workers; for PSS that counts shared pages once
+    for metric in ("ready_ms", "rss_mb", "pss_mb", "private_mb"):
+        values = [result[metric] for result in results]
+        print(f"{label:<8} {metric:<11} mean {sum(values) / len(values):>9.1f}  max {max(values):>9.1f}  "
+              f"total {sum(values):>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--catalog-items", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", choices=["worker", "publish"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args))), flush=True)
+        return
+
+    base = dict(os.environ, AI_WARMUP_INTERVAL_SECONDS="0")
+    base.pop("SHARED_SNAPSHOT_DIR", None)
+    print(f"{args.workers} workers, {args.catalog_items} catalog items")
+    report("empty", run_workers(argparse.Namespace(**dict(vars(args), catalog_items=0)), base))
+    report("local", run_workers(args, base))
+
+    directory = tempfile.mkdtemp(prefix="educursus-snapshot-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    try:
+        shared = dict(base, SHARED_SNAPSHOT_DIR=directory)
+        published = _last_json(subprocess.check_output(_command(args, "publish"), cwd=BACKEND_DIR,
+                                                       env=shared, text=True))
+        print(f"publish  build and write snapshot {published['publish_ms']:.1f} ms (once per host)")
+        report("shared", run_workers(args, shared))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Scan throughput of packed skill vectors versus the ``current_skills`` map.
+
+Run from the backend directory:
+
+    python -m benchmarks.skill_vector_benchmark --users 500000
+
+Encodes synthetic users as the BSON a ``users`` scan would receive, once with
+the ``current_skills`` projection and once with the ``skill_vector``
+projection, then times turning each into a users x vocabulary level matrix:
+decoding plus a per-skill loop for the map, decoding plus
+``skill_vectors.decode_matrix`` for the vectors. Reports users/sec and bytes
+per user on the wire. No MongoDB needed.
+"""
+import argparse
+import random
+import time
+from typing import List
+
+import bson
+import numpy as np
+
+import skill_vectors
+import skills
+from benchmarks import synthetic
+
+
+def dict_matrix(batch: bytes, vocabulary: skill_vectors.SkillVocabulary) -> np.ndarray:
+    documents = bson.decode_all(batch)
+    matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.int8)
+    for row, document in enumerate(documents):
+        for name, level in document["current_skills"].items():
+            column = vocabulary.index.get(name)
+            if column is not None:
+                matrix[row, column] = level
+    return matrix
+
+
+def vector_matrix(batch: bytes, vocabulary: skill_vectors.SkillVocabulary) -> np.ndarray:
+    documents = bson.decode_all(batch)
+    return skill_vectors.decode_matrix([document[skill_vectors.VECTOR_FIELD] for document in documents],
+                                       len(vocabulary))
+
+
+def time_scan(batches: List[bytes], decode, vocabulary: skill_vectors.SkillVocabulary, users: int) -> float:
+    started = time.perf_counter()
+    for batch in batches:
+        decode(batch, vocabulary)
+    return users / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=skill_vectors.DEFAULT_SCAN_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = skill_vectors.SkillVocabulary(skill_vectors.VOCABULARY_VERSION, skill_vectors.initial_skills())
+    dict_batches: List[bytes] = []
+    vector_batches: List[bytes] = []
+    for start in range(0, args.users, args.batch_size):
+        dict_docs, vector_docs = [], []
+        for index in range(start, min(start + args.batch_size, args.users)):
+            levels = skills.normalize_skill_levels(synthetic.make_skills(rng, count=rng.randint(2, 8)))
+            dict_docs.append(bson.encode({"_id": str(index), "current_skills": levels}))
+            vector_docs.append(bson.encode({"_id": str(index),
+                                            skill_vectors.VECTOR_FIELD: bson.Binary(vocabulary.encode(levels)),
+                                            skill_vectors.VERSION_FIELD: vocabulary.version}))
+        dict_batches.append(b"".join(dict_docs))
+        vector_batches.append(b"".join(vector_docs))
+
+    # Same matrix either way
+    assert np.array_equal(dict_matrix(dict_batches[0], vocabulary), vector_matrix(vector_batches[0], vocabulary))
+
+    print(f"{args.users} users, vocabulary of {len(vocabulary)} skills")
+    for label, batches, decode in (("current_skills map", dict_batches, dict_matrix),
+                                   ("packed skill_vector", vector_batches, vector_matrix)):
+        throughput = time_scan(batches, decode, vocabulary, args.users)
+        wire = sum(len(batch) for batch in batches) / args.users
+        print(f"{label:<22} {throughput:>12,.0f} users/sec  {wire:6.1f} bytes/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Cold-start benchmark: import time, time to first request and time to ready.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup_benchmark --rounds 5
+    python -m benchmarks.startup_benchmark --import-profile 15
+
+Every round starts a fresh interpreter so nothing is already imported. The
+child process imports ``main``, points it at the in-memory database and fake
+LLM, runs the ASGI startup events and serves one request; it then polls
+``/health/ready`` until the background warm-up has finished. Times are measured
+from just before ``import main``. --import-profile runs ``python -X importtime``
+and lists the slowest top-level imports.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _child() -> Dict[str, Any]:
+    started = time.perf_counter()
+    os.environ.setdefault("ANALYTICS_REFRESH_SECONDS", "0")
+    import main
+    imported = time.perf_counter()
+
+    from benchmarks.asgi_client import ASGIClient
+    from benchmarks.fake_llm import FakeGroqClient
+    from benchmarks.fake_mongo import FakeDatabase
+    from benchmarks.load_test import install_fakes
+
+    install_fakes(main, FakeDatabase(), FakeGroqClient(median_ms=0))
+    client = ASGIClient(main.app)
+    await client.startup()
+    response = await client.get("/career-paths")
+    first_request = time.perf_counter()
+
+    ready_at = None
+    while True:
+        health = await client.get("/health/ready")
+        status = health.json()
+        if ready_at is None and health.status == 200:
+            ready_at = time.perf_counter()
+        if status["warmup_complete"]:
+            break
+        await asyncio.sleep(0.005)
+    complete = time.perf_counter()
+    await client.shutdown()
+
+    return {
+        "import_ms": (imported - started) * 1000,
+        "first_request_ms": (first_request - started) * 1000,
+        "first_request_status": response.status,
+        "ready_ms": (ready_at - started) * 1000,
+        "warmup_complete_ms": (complete - started) * 1000,
+        "steps": {name: step["state"] for name, step in status["steps"].items()},
+    }
+
+
+def run_round() -> Dict[str, Any]:
+    output = subprocess.check_output([sys.executable, "-m", "benchmarks.startup_benchmark", "--child"],
+                                     cwd=BACKEND_DIR, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(top: int) -> None:
+    """Print the slowest imports by cumulative time from python -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        name = name.rstrip()[1:]
+        depth = len(name) - len(name.lstrip())
+        # main itself plus what it imports directly; deeper levels are noise here
+        if depth <= 2:
+            rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    print(f"{'module':<40} {'cumulative':>12} {'self':>10}")
+    for cumulative_us, self_us, name in rows[:top]:
+        print(f"{name:<40} {cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--import-profile", type=int, metavar="N", help="list the N slowest imports instead")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child())))
+        return
+    if args.import_profile:
+        import_profile(args.import_profile)
+        return
+
+    rounds: List[Dict[str, Any]] = [run_round() for _ in range(args.rounds)]
+    metrics = ["import_ms", "first_request_ms", "ready_ms", "warmup_complete_ms"]
+    summary = {
+        metric: {
+            "median": round(statistics.median(r[metric] for r in rounds), 2),
+            "max": round(max(r[metric] for r in rounds), 2),
+        }
+        for metric in metrics
+    }
+
+    print(f"{'metric':<22} {'median':>10} {'max':>10}")
+    for metric in metrics:
+        print(f"{metric:<22} {summary[metric]['median']:>8.1f}ms {summary[metric]['max']:>8.1f}ms")
+    print(f"warm-up steps: {rounds[-1]['steps']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"rounds": rounds, "summary": summary}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
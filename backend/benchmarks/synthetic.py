@@ -0,0 +1,191 @@
+"""Seeded synthetic data for benchmarks and load tests.
+
+Every generator takes a ``random.Random`` so the same seed always produces the
+same users, assessments and interviews, which keeps benchmark runs comparable
+between commits.
+"""
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+SKILLS = [
+    "python", "sql", "excel", "statistics", "data_visualization",
+    "javascript", "react", "nodejs", "database", "git",
+    "machine_learning", "deep_learning", "mathematics", "mlops", "cloud",
+]
+CAREER_PATH_IDS = ["data_analyst", "fullstack_developer", "ml_engineer"]
+INTERESTS = ["ai", "web", "data", "cloud", "design", "security", "mobile"]
+EXPERIENCE_LEVELS = ["beginner", "intermediate", "advanced"]
+ANSWER_WORDS = [
+    "data", "cleaning", "imputation", "analysis", "validation", "impact", "decision",
+    "results", "communication", "rest", "graphql", "api", "endpoints", "state", "context",
+    "redux", "hooks", "overfitting", "underfitting", "generalization", "deployment",
+    "mlops", "monitoring", "scaling", "team", "project", "customer", "performance",
+]
+
+POSTING_TITLES = {
+    "data_analyst": ["Data Analyst", "Business Analyst", "Senior Data Analyst", "BI Analyst"],
+    "fullstack_developer": ["Full Stack Developer", "MERN Stack Developer", "Web Developer", "Fullstack Engineer"],
+    "ml_engineer": ["Machine Learning Engineer", "Data Scientist", "ML Engineer", "AI Engineer"],
+}
+POSTING_SKILL_NAMES = {
+    "data_analyst": ["Python", "SQL", "Excel", "Tableau", "Power BI", "Statistics", "Pandas"],
+    "fullstack_developer": ["JavaScript", "React.js", "Node.js", "Express", "MongoDB", "Git", "TypeScript", "HTML5"],
+    "ml_engineer": ["Python", "scikit-learn", "TensorFlow", "PyTorch", "MLOps", "AWS", "Kubernetes", "Docker"],
+}
+POSTING_CITIES = ["Bangalore", "Mumbai", "Pune", "Hyderabad", "Delhi", "Chennai", "Noida", "Gurgaon"]
+POSTING_WORDS = [
+    "build", "scalable", "pipelines", "dashboards", "stakeholders", "deliver", "insights", "features",
+    "production", "collaborate", "ownership", "agile", "customers", "quality", "testing", "design",
+    "reports", "models", "services", "apis", "clean", "maintainable", "product", "growth", "startup",
+]
+
+CATALOG_TOPICS = [
+    "python", "sql", "excel", "statistics", "tableau", "javascript", "react", "node", "express", "mongodb",
+    "git", "docker", "kubernetes", "tensorflow", "pytorch", "pandas", "numpy", "regression", "clustering",
+    "dashboards", "api", "graphql", "testing", "deployment", "cloud", "aws", "security", "algorithms",
+]
+CATALOG_WORDS = [
+    "build", "analyze", "introduction", "advanced", "practical", "hands", "project", "guide", "fundamentals",
+    "workshop", "masterclass", "bootcamp", "data", "web", "app", "pipeline", "model", "service", "realtime",
+]
+PROJECT_TYPES = ["data_analysis", "machine_learning", "web_development", "devops", "visualization"]
+
+EPOCH = datetime(2024, 1, 1)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_skills(rng: random.Random, vocabulary: Optional[List[str]] = None, count: int = 5) -> Dict[str, int]:
+    vocabulary = vocabulary or SKILLS
+    return {skill: rng.randint(0, 10) for skill in rng.sample(vocabulary, min(count, len(vocabulary)))}
+
+
+def make_answer(rng: random.Random, words: int = 40) -> str:
+    return " ".join(rng.choice(ANSWER_WORDS) for _ in range(words))
+
+
+def make_user(rng: random.Random, index: int) -> Dict[str, Any]:
+    return {
+        "_id": _uuid(rng),
+        "username": f"learner{index}",
+        "email": f"learner{index}@example.com",
+        "password": f"password{index}",
+        "interests": rng.sample(INTERESTS, 2),
+        "current_skills": make_skills(rng, count=rng.randint(2, 8)),
+        "career_goals": [rng.choice(CAREER_PATH_IDS)],
+        "learning_preferences": {"style": rng.choice(["video", "reading", "projects"])},
+        "experience_level": rng.choice(EXPERIENCE_LEVELS),
+        "preferred_location": "India",
+        "time_available": rng.randint(5, 40),
+        "budget_constraints": rng.choice(["low", "moderate", "high"]),
+        "level": rng.randint(1, 10),
+        "experience_points": rng.randint(0, 5000),
+        "badges": [],
+        "completed_projects": [],
+        "created_at": (EPOCH + timedelta(minutes=index)).isoformat(),
+    }
+
+
+def make_assessment(rng: random.Random, user_id: str, index: int) -> Dict[str, Any]:
+    return {
+        "_id": _uuid(rng),
+        "user_id": user_id,
+        "skill_name": rng.choice(SKILLS),
+        "score": rng.randint(0, 10),
+        "assessment_type": rng.choice(["quiz", "coding", "ai"]),
+        "timestamp": EPOCH + timedelta(minutes=index),
+    }
+
+
+def make_interview(rng: random.Random, user_id: str, index: int, questions: int = 2) -> Dict[str, Any]:
+    question_list = [
+        {
+            "question": f"Synthetic question {q}",
+            "type": "technical",
+            "expected_keywords": rng.sample(ANSWER_WORDS, 4),
+        }
+        for q in range(questions)
+    ]
+    started_at = EPOCH + timedelta(minutes=index)
+    return {
+        "_id": _uuid(rng),
+        "user_id": user_id,
+        "career_path": rng.choice(CAREER_PATH_IDS),
+        "questions": question_list,
+        "answers": [{"answer": make_answer(rng)} for _ in question_list],
+        "score": round(rng.uniform(0, 100), 2),
+        "feedback": "",
+        "started_at": started_at,
+        "completed_at": started_at + timedelta(minutes=20),
+    }
+
+
+def iter_users(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_user(rng, index)
+
+
+def generate_dataset(users: int, assessments_per_user: int = 3, interviews_per_user: int = 1,
+                     seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Users plus their assessments and interviews, keyed by collection name"""
+    rng = random.Random(seed)
+    dataset = {"users": [], "skill_assessments": [], "mock_interviews": []}
+    for index in range(users):
+        user = make_user(rng, index)
+        dataset["users"].append(user)
+        for n in range(assessments_per_user):
+            dataset["skill_assessments"].append(make_assessment(rng, user["_id"], index * assessments_per_user + n))
+        for n in range(interviews_per_user):
+            dataset["mock_interviews"].append(make_interview(rng, user["_id"], index * interviews_per_user + n))
+    return dataset
+
+
+def make_posting(rng: random.Random, index: int) -> Dict[str, Any]:
+    career = rng.choice(CAREER_PATH_IDS)
+    listed = rng.sample(POSTING_SKILL_NAMES[career], rng.randint(3, 6))
+    low = rng.randint(3, 20)
+    description = " ".join(rng.choice(POSTING_WORDS) for _ in range(rng.randint(40, 120)))
+    return {
+        "job_title": rng.choice(POSTING_TITLES[career]),
+        "company": f"Company {rng.randint(1, 500)}",
+        "location": f"{rng.choice(POSTING_CITIES)}, India",
+        "key_skills": ", ".join(listed),
+        "description": f"{description} Experience with {' and '.join(listed[:2])} required.",
+        "salary": f"{low}-{low + rng.randint(2, 10)} LPA",
+        "date_posted": (EPOCH + timedelta(days=rng.randint(0, 365))).date().isoformat(),
+        "url": f"https://jobs.example.com/{index}",
+    }
+
+
+def iter_postings(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_posting(rng, index)
+
+
+def make_catalog_item(rng: random.Random, index: int) -> Dict[str, Any]:
+    topics = rng.sample(CATALOG_TOPICS, 2)
+    # A per-item made-up word gives the vocabulary a long tail, as course titles do
+    title = f"{rng.choice(CATALOG_WORDS).title()} {topics[0].title()} {rng.choice(CATALOG_WORDS)} x{index % 5000}"
+    return {
+        "id": f"synthetic:{index}",
+        "kind": rng.choice(["project", "resource"]),
+        "career_path_id": rng.choice(CAREER_PATH_IDS),
+        "title": title,
+        "description": " ".join(rng.choice(CATALOG_WORDS + CATALOG_TOPICS) for _ in range(rng.randint(8, 30))),
+        "skills": topics,
+        "difficulty": rng.choice(EXPERIENCE_LEVELS),
+        "project_type": rng.choice(PROJECT_TYPES),
+        "estimated_time": rng.randint(2, 80),
+    }
+
+
+def iter_catalog_items(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_catalog_item(rng, index)
@@ -0,0 +1,135 @@
+"""Request latency of burst writes with and without the write-behind buffer.
+
+Run from the backend directory:
+
+    python -m benchmarks.write_behind_benchmark --requests 5000 --concurrency 200 --db-latency-ms 5
+
+Fires a burst of ``POST /skill-assessment`` and ``POST /mock-interview``
+requests through the ASGI app against the in-memory database, with every
+MongoDB write delayed by ``--db-latency-ms`` to stand in for a loaded server.
+The burst runs once writing directly and once through a write-behind buffer
+logging to a temporary directory, and reports p50/p99 request latency,
+throughput and the buffer's flush statistics.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import write_behind
+from benchmarks import synthetic
+from benchmarks.asgi_client import ASGIClient
+from benchmarks.fake_llm import FakeGroqClient
+from benchmarks.fake_mongo import FakeDatabase
+from benchmarks.load_test import install_fakes, percentile
+
+DELAYED_METHODS = ("insert_one", "insert_many", "update_one", "bulk_write")
+
+
+class SlowCollection:
+    """Delays every write of a fake collection by a fixed latency"""
+
+    def __init__(self, collection, latency: float):
+        self._collection = collection
+        self._latency = latency
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._collection, name)
+        if name not in DELAYED_METHODS:
+            return attribute
+
+        async def delayed(*args, **kwargs):
+            await asyncio.sleep(self._latency)
+            return await attribute(*args, **kwargs)
+        return delayed
+
+
+class SlowDatabase:
+    def __init__(self, database: FakeDatabase, latency: float):
+        self._database = database
+        self._latency = latency
+
+    def __getitem__(self, name: str) -> SlowCollection:
+        return SlowCollection(self._database[name], self._latency)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+async def burst(main, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    users = list(synthetic.iter_users(200, seed=seed))
+    for user in users:
+        await main.db.users.insert_one(user)
+    client = ASGIClient(main.app)
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued, errors
+        while issued < requests:
+            issued += 1
+            user = rng.choice(users)
+            started = time.perf_counter()
+            if rng.random() < 0.5:
+                response = await client.post("/skill-assessment", json_body={
+                    "user_id": user["_id"], "skill_name": rng.choice(synthetic.SKILLS), "score": rng.randint(0, 10),
+                    "assessment_type": "quiz", "timestamp": "2026-01-01T00:00:00"})
+            else:
+                response = await client.post("/mock-interview", params={
+                    "user_id": user["_id"], "career_path_id": rng.choice(synthetic.CAREER_PATH_IDS)})
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {"rps": requests / elapsed, "p50_ms": percentile(latencies, 0.5),
+            "p99_ms": percentile(latencies, 0.99), "errors": errors}
+
+
+async def run(args: argparse.Namespace) -> None:
+    os.environ.setdefault("ANALYTICS_REFRESH_SECONDS", "0")
+    import main
+
+    for label in ("direct", "write-behind"):
+        database = SlowDatabase(FakeDatabase(), args.db_latency_ms / 1000)
+        install_fakes(main, database, FakeGroqClient(median_ms=0))
+        with tempfile.TemporaryDirectory() as directory:
+            buffer = None
+            if label == "write-behind":
+                buffer = write_behind.WriteBehindBuffer(database, directory, fsync=not args.no_fsync,
+                                                        after_flush=main.refresh_flushed_skill_vectors)
+                buffer.open()
+                buffer.start()
+            main.write_buffer = buffer
+            result = await burst(main, args.requests, args.concurrency, args.seed)
+            print(f"{label:<13} {result['rps']:>9,.0f} req/s  p50 {result['p50_ms']:8.2f} ms  "
+                  f"p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}")
+            if buffer is not None:
+                await buffer.stop()
+                stats = buffer.stats()
+                print(f"{'':<13} {stats['flushes']} flushes of {stats['flushed_writes']} writes, "
+                      f"max flush {stats['max_flush_ms']} ms, {stats['wal_syncs']} WAL syncs")
+    main.write_buffer = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    parser.add_argument("--no-fsync", action="store_true", help="skip fsync, to separate disk cost from batching")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
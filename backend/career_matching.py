@@ -0,0 +1,113 @@
+"""Vectorized career matching and the precomputed matches stored on users.
+
+``CareerMatrix`` lays the career catalog out as a careers x skills matrix of
+required levels, so a whole batch of users is scored with a few numpy
+operations instead of one ``calculate_career_match`` call per user and path.
+Reports have exactly the shape of ``main.skill_gap_report``.
+
+``jobs.recompute_career_matches`` stores each user's top reports under
+``career_matches`` together with a key derived from their skills and the
+catalog. ``stored_reports`` only returns them while that key still matches, so
+a profile edited after the nightly run falls back to computing live.
+"""
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import skills
+from catalog import CAREER_PATHS
+
+DEFAULT_TOP_K = 5
+
+
+def _digest(value: Any) -> str:
+    return hashlib.blake2b(json.dumps(value, sort_keys=True).encode(), digest_size=12).hexdigest()
+
+
+class CareerMatrix:
+    def __init__(self, career_paths: Dict[str, Dict[str, Any]]):
+        self.career_ids = list(career_paths)
+        self.names = [career_paths[path_id]["name"] for path_id in self.career_ids]
+        self.required = [career_paths[path_id]["required_skills"] for path_id in self.career_ids]
+        self.skills = sorted({skill for required in self.required for skill in required})
+        self.skill_index = {skill: position for position, skill in enumerate(self.skills)}
+        self.levels = np.zeros((len(self.career_ids), len(self.skills)), dtype=np.float64)
+        for row, required in enumerate(self.required):
+            for skill, level in required.items():
+                self.levels[row, self.skill_index[skill]] = level
+        self.totals = self.levels.sum(axis=1)
+        self.catalog_key = _digest({path_id: required for path_id, required in zip(self.career_ids, self.required)})
+
+    def use_levels(self, levels: np.ndarray, catalog_key: str) -> bool:
+        """Score with a shared copy of ``levels`` built from the same catalog; False if it was not"""
+        if catalog_key != self.catalog_key or levels.shape != self.levels.shape:
+            return False
+        self.levels = levels
+        return True
+
+    def key(self, user_skills: Dict[str, int]) -> str:
+        """Identifies the inputs of a user's stored matches: their skills and this catalog"""
+        return _digest([self.catalog_key, user_skills])
+
+    def user_levels(self, skill_levels: List[Dict[str, int]]) -> np.ndarray:
+        matrix = np.zeros((len(skill_levels), len(self.skills)), dtype=np.float64)
+        for row, user_skills in enumerate(skill_levels):
+            for skill, level in user_skills.items():
+                column = self.skill_index.get(skill)
+                if column is not None:
+                    matrix[row, column] = level
+        return matrix
+
+    def top_reports(self, skill_levels: List[Dict[str, int]], top_k: int = DEFAULT_TOP_K) -> List[List[Dict[str, Any]]]:
+        """Best ``top_k`` skill gap reports per user, best match first"""
+        users = self.user_levels(skill_levels)
+        # users x careers x skills; small, since the catalog only has a handful of careers and skills
+        gaps = np.maximum(self.levels[None, :, :] - users[:, None, :], 0)
+        covered = (self.levels[None, :, :] - gaps).sum(axis=2)
+        matches = np.divide(covered, self.totals, out=np.zeros_like(covered), where=self.totals > 0)
+        # Stable, so ties keep catalog order like the sort in main.career_match_reports
+        order = np.argsort(-np.round(matches * 100, 2), axis=1, kind="stable")[:, :top_k]
+
+        results = []
+        for row, user_skills in enumerate(skill_levels):
+            reports = []
+            for career in order[row].tolist():
+                required = self.required[career]
+                skill_gaps = {skill: max(0, level - user_skills.get(skill, 0)) for skill, level in required.items()}
+                reports.append({
+                    "career_path_id": self.career_ids[career],
+                    "name": self.names[career],
+                    "skill_gaps": skill_gaps,
+                    "career_match_percentage": round(float(matches[row, career]) * 100, 2),
+                    "missing_skills": [skill for skill, gap in skill_gaps.items() if gap > 0],
+                    "strong_skills": [skill for skill, level in user_skills.items() if level >= required.get(skill, 0)],
+                })
+            results.append(reports)
+        return results
+
+
+matrix = CareerMatrix(CAREER_PATHS)
+
+
+def stored_reports(user: Dict[str, Any], user_skills: Dict[str, int]) -> Optional[List[Dict[str, Any]]]:
+    """Precomputed reports of a user, or None if missing or computed from other skills or another catalog"""
+    stored = user.get("career_matches")
+    if not isinstance(stored, Mapping) or stored.get("key") != matrix.key(user_skills):
+        return None
+    return list(stored.get("top") or []) or None
+
+
+def compute_chunk(raw_skills: List[Dict[str, Any]], top_k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """``career_matches`` documents for a chunk of users' stored ``current_skills``
+
+    Runs in worker processes of the recompute job, so it only takes and
+    returns plain data.
+    """
+    skill_levels = [skills.normalize_skill_levels(user_skills or {}) for user_skills in raw_skills]
+    return [
+        {"key": matrix.key(user_skills), "top": reports}
+        for user_skills, reports in zip(skill_levels, matrix.top_reports(skill_levels, top_k))
+    ]
@@ -0,0 +1,105 @@
+"""Career paths and learning projects offered by the platform.
+
+Kept apart from the app so offline jobs can read the catalog without
+importing FastAPI or opening a database client.
+"""
+# Mock data for demonstration
+CAREER_PATHS = {
+    "data_analyst": {
+        "name": "Data Analyst",
+        "description": "Transform raw data into actionable insights",
+        "required_skills": {
+            "python": 7,
+            "sql": 8,
+            "excel": 6,
+            "statistics": 7,
+            "data_visualization": 6
+        },
+        "market_demand": 0.85,
+        "salary_range": {"min": 400000, "max": 1200000},
+        "learning_path": [
+            {"skill": "python", "resources": ["Python for Data Science", "Pandas Tutorial"], "time_estimate": 40},
+            {"skill": "sql", "resources": ["SQL Fundamentals", "Advanced SQL"], "time_estimate": 30},
+            {"skill": "statistics", "resources": ["Statistics 101", "Practical Statistics"], "time_estimate": 35}
+        ]
+    },
+    "fullstack_developer": {
+        "name": "Full Stack Developer",
+        "description": "Build complete web applications from frontend to backend",
+        "required_skills": {
+            "javascript": 8,
+            "react": 7,
+            "nodejs": 7,
+            "python": 6,
+            "database": 6,
+            "git": 5
+        },
+        "market_demand": 0.92,
+        "salary_range": {"min": 600000, "max": 2000000},
+        "learning_path": [
+            {"skill": "javascript", "resources": ["JavaScript ES6+", "Modern JS Patterns"], "time_estimate": 50},
+            {"skill": "react", "resources": ["React Fundamentals", "Advanced React"], "time_estimate": 45},
+            {"skill": "nodejs", "resources": ["Node.js Basics", "Express.js"], "time_estimate": 40}
+        ]
+    },
+    "ml_engineer": {
+        "name": "Machine Learning Engineer",
+        "description": "Build and deploy machine learning systems",
+        "required_skills": {
+            "python": 9,
+            "machine_learning": 8,
+            "deep_learning": 7,
+            "mathematics": 8,
+            "mlops": 6,
+            "cloud": 6
+        },
+        "market_demand": 0.78,
+        "salary_range": {"min": 800000, "max": 2500000},
+        "learning_path": [
+            {"skill": "python", "resources": ["Advanced Python", "Scientific Python"], "time_estimate": 60},
+            {"skill": "machine_learning", "resources": ["ML Fundamentals", "Scikit-learn"], "time_estimate": 70},
+            {"skill": "mathematics", "resources": ["Linear Algebra", "Calculus for ML"], "time_estimate": 80}
+        ]
+    }
+}
+
+# Immutable view of CAREER_PATHS used by the simulator
+
+LEARNING_PROJECTS = {
+    "data_analyst": [
+        {
+            "title": "Sales Data Analysis",
+            "description": "Analyze company sales data to identify trends and insights",
+            "difficulty": "beginner",
+            "skills_required": ["python", "pandas", "data_visualization"],
+            "estimated_time": 8,
+            "project_type": "data_analysis"
+        },
+        {
+            "title": "Customer Segmentation",
+            "description": "Use clustering algorithms to segment customers",
+            "difficulty": "intermediate",
+            "skills_required": ["python", "scikit-learn", "statistics"],
+            "estimated_time": 12,
+            "project_type": "machine_learning"
+        }
+    ],
+    "fullstack_developer": [
+        {
+            "title": "Todo App",
+            "description": "Build a full-stack todo application with React and Node.js",
+            "difficulty": "beginner",
+            "skills_required": ["javascript", "react", "nodejs"],
+            "estimated_time": 15,
+            "project_type": "web_development"
+        },
+        {
+            "title": "E-commerce Platform",
+            "description": "Create a complete e-commerce solution with payment integration",
+            "difficulty": "advanced",
+            "skills_required": ["javascript", "react", "nodejs", "database", "payment"],
+            "estimated_time": 40,
+            "project_type": "web_development"
+        }
+    ]
+}
@@ -0,0 +1,605 @@
+"""In-memory full-text search over learning projects and resources.
+
+Every catalog entry becomes an item whose title, description, skills and
+resource names are tokenized into an inverted index. Fields are weighted
+(title over skills over description) and ranked with BM25. Skills are also
+indexed under their canonical name, so "node.js" finds a project tagged
+"nodejs".
+
+The index is updated in place: ``sync`` compares each item's content
+fingerprint with what is indexed and only adds, re-indexes or removes the
+items that changed.
+
+Each term's BM25 contribution to each of its items (its impact) is computed
+once and cached, along with the term's best few hundred items. Searching sums
+cached impacts. Typeahead treats the last word as a prefix, takes the
+commonest words under it from the sorted vocabulary (a bisect range) and
+merges their short best-item lists, so it costs the same however large the
+catalog grows. Updates patch the caches of the terms they touch; impacts
+drift slightly as the catalog changes and are recomputed once more than
+``RESCORE_FRACTION`` of the items have changed since they were cached.
+
+``freeze`` lays a fully scored index out as flat arrays, and
+``FrozenCatalogIndex`` answers the same queries from them without building
+any per-item Python objects, so processes sharing one mapped copy of the
+arrays (see ``shared_snapshot``) only decode the items they return.
+"""
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import skills
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+FIELD_WEIGHTS = {"title": 3.0, "skills": 2.0, "description": 1.0}
+SKILL_PREFIX = "skill:"
+# Best items kept per term for typeahead, and completions tried per prefix
+TYPEAHEAD_DEPTH = 200
+PREFIX_EXPANSIONS = 16
+MAX_CACHED_PREFIXES = 4096
+RESCORE_FRACTION = 0.1
+
+# Item fields filtered on by exact value; frozen indexes store them as codes into a per-field table
+FILTER_FIELDS = ("kind", "difficulty", "project_type", "career_path_id")
+
+STOP_WORDS = frozenset("a an and as at by for from in into of on or the to with your".split())
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def _slug(text: str) -> str:
+    return skills.fold(text) or "item"
+
+
+def items_from_catalog(career_paths: Dict[str, Dict[str, Any]],
+                       learning_projects: Dict[str, List[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Searchable items for every learning project and every resource in the career paths"""
+    for career_path_id, projects in learning_projects.items():
+        for project in projects:
+            yield {
+                "id": f"project:{career_path_id}:{_slug(project['title'])}",
+                "kind": "project",
+                "career_path_id": career_path_id,
+                "title": project["title"],
+                "description": project.get("description", ""),
+                "skills": list(project.get("skills_required", [])),
+                "difficulty": project.get("difficulty"),
+                "project_type": project.get("project_type"),
+                "estimated_time": project.get("estimated_time"),
+            }
+    for career_path_id, path in career_paths.items():
+        for phase in path.get("learning_path", []):
+            for resource in phase.get("resources", []):
+                yield {
+                    "id": f"resource:{career_path_id}:{phase['skill']}:{_slug(resource)}",
+                    "kind": "resource",
+                    "career_path_id": career_path_id,
+                    "title": resource,
+                    "description": f"{path['name']}: {phase['skill'].replace('_', ' ')}",
+                    "skills": [phase["skill"]],
+                    "difficulty": None,
+                    "project_type": None,
+                    "estimated_time": phase.get("time_estimate"),
+                }
+
+
+def item_from_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Searchable item for an entry added to the ``catalog_items`` collection"""
+    return {
+        "id": f"custom:{document['_id']}",
+        "kind": document.get("kind", "resource"),
+        "career_path_id": document.get("career_path_id"),
+        "title": document.get("title", ""),
+        "description": document.get("description", ""),
+        "skills": list(document.get("skills") or document.get("skills_required") or []),
+        "difficulty": document.get("difficulty"),
+        "project_type": document.get("project_type"),
+        "estimated_time": document.get("estimated_time"),
+    }
+
+
+def fingerprint(item: Dict[str, Any]) -> str:
+    return hashlib.blake2b(json.dumps(item, sort_keys=True, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def weighted_terms(item: Dict[str, Any]) -> Dict[str, float]:
+    weights: Counter = Counter()
+    for term in tokenize(item.get("title") or ""):
+        weights[term] += FIELD_WEIGHTS["title"]
+    for term in tokenize(item.get("description") or ""):
+        weights[term] += FIELD_WEIGHTS["description"]
+    for name in item.get("skills") or []:
+        for term in tokenize(name):
+            weights[term] += FIELD_WEIGHTS["skills"]
+        canonical = skills.normalize_skill(name)
+        if canonical:
+            weights[SKILL_PREFIX + canonical] += FIELD_WEIGHTS["skills"]
+    return dict(weights)
+
+
+class _TermCache:
+    __slots__ = ("impacts", "top")
+
+    def __init__(self, impacts: Dict[str, float]):
+        self.impacts = impacts
+        # (-impact, item id), best first; None until typeahead needs it
+        self.top: Optional[List[Tuple[float, str]]] = None
+
+
+class CatalogIndex:
+    def __init__(self, k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        self.k1 = k1
+        self.b = b
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._item_terms: Dict[str, Dict[str, float]] = {}
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._terms: Dict[str, _TermCache] = {}
+        self._completions: Dict[str, List[str]] = {}
+        self._changes_since_scoring = 0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # Maintenance
+
+    def add(self, item: Dict[str, Any], item_fingerprint: Optional[str] = None) -> None:
+        item_id = item["id"]
+        if item_id in self.items:
+            self.remove(item_id)
+        terms = weighted_terms(item)
+        self.items[item_id] = item
+        self._fingerprints[item_id] = item_fingerprint or fingerprint(item)
+        self._item_terms[item_id] = terms
+        length = sum(terms.values())
+        self._lengths[item_id] = length
+        self._total_length += length
+        for term, weight in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+                self._forget_prefixes(term)
+            postings[item_id] = weight
+            cache = self._terms.get(term)
+            if cache is not None:
+                impact = self._score(weight, item_id, self._idf(term), self._average_length())
+                cache.impacts[item_id] = impact
+                if cache.top is not None:
+                    bisect.insort(cache.top, (-impact, item_id))
+                    del cache.top[TYPEAHEAD_DEPTH:]
+        self._changed()
+
+    def remove(self, item_id: str) -> bool:
+        if item_id not in self.items:
+            return False
+        del self.items[item_id]
+        del self._fingerprints[item_id]
+        self._total_length -= self._lengths.pop(item_id)
+        for term in self._item_terms.pop(item_id):
+            postings = self.postings[term]
+            del postings[item_id]
+            if not postings:
+                del self.postings[term]
+                self._terms.pop(term, None)
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+                self._forget_prefixes(term)
+                continue
+            cache = self._terms.get(term)
+            if cache is not None:
+                impact = cache.impacts.pop(item_id, None)
+                if cache.top is not None and impact is not None and (-impact, item_id) in cache.top:
+                    cache.top.remove((-impact, item_id))
+                    if len(cache.top) < TYPEAHEAD_DEPTH // 2 < len(postings):
+                        cache.top = None
+        self._changed()
+        return True
+
+    def sync(self, items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Make the index hold exactly ``items``, touching only those that changed"""
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+        for item in items:
+            item_id = item["id"]
+            seen.add(item_id)
+            known = self._fingerprints.get(item_id)
+            current = fingerprint(item)
+            if known == current:
+                counts["unchanged"] += 1
+                continue
+            counts["added" if known is None else "updated"] += 1
+            self.add(item, current)
+        for item_id in [item_id for item_id in self.items if item_id not in seen]:
+            self.remove(item_id)
+            counts["removed"] += 1
+        return counts
+
+    def _changed(self) -> None:
+        self.version += 1
+        if not self._terms:
+            return
+        self._changes_since_scoring += 1
+        if self._changes_since_scoring > RESCORE_FRACTION * len(self.items):
+            self._terms.clear()
+
+    def _forget_prefixes(self, term: str) -> None:
+        # A new or vanished term changes the completions of each of its prefixes
+        for end in range(1, len(term) + 1):
+            self._completions.pop(term[:end], None)
+
+    def terms(self) -> List[str]:
+        return list(self._vocabulary)
+
+    def warm_terms(self, terms: Iterable[str]) -> None:
+        """Compute the caches of ``terms`` ahead of the first query that needs them"""
+        for term in terms:
+            if term in self.postings:
+                self._top(term)
+
+    # Queries
+
+    def _average_length(self) -> float:
+        return self._total_length / len(self.items) if self.items else 1.0
+
+    def _score(self, weight: float, item_id: str, idf: float, average_length: float) -> float:
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[item_id] / average_length)
+        return idf * weight * (self.k1 + 1) / (weight + norm)
+
+    def _idf(self, term: str) -> float:
+        frequency = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.items) - frequency + 0.5) / (frequency + 0.5))
+
+    def _impacts(self, term: str) -> Dict[str, float]:
+        cache = self._terms.get(term)
+        if cache is None:
+            if not self._terms:
+                self._changes_since_scoring = 0
+            idf, average_length = self._idf(term), self._average_length()
+            cache = self._terms[term] = _TermCache({
+                item_id: self._score(weight, item_id, idf, average_length)
+                for item_id, weight in self.postings[term].items()
+            })
+        return cache.impacts
+
+    def _top(self, term: str) -> List[Tuple[float, str]]:
+        impacts = self._impacts(term)
+        cache = self._terms[term]
+        if cache.top is None:
+            cache.top = sorted((-impact, item_id) for impact, item_id in
+                               heapq.nlargest(TYPEAHEAD_DEPTH, zip(impacts.values(), impacts.keys())))
+        return cache.top
+
+    def _matches_filters(self, item: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        for field in FILTER_FIELDS:
+            wanted = filters.get(field)
+            if wanted is not None and item.get(field) != wanted:
+                return False
+        estimated_time = item.get("estimated_time")
+        if filters.get("min_time") is not None and (estimated_time is None or estimated_time < filters["min_time"]):
+            return False
+        if filters.get("max_time") is not None and (estimated_time is None or estimated_time > filters["max_time"]):
+            return False
+        return True
+
+    def completions(self, prefix: str) -> List[str]:
+        """Most common indexed words starting with ``prefix``"""
+        cached = self._completions.get(prefix)
+        if cached is not None:
+            return cached
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff", start)
+        candidates = (term for term in self._vocabulary[start:end] if not term.startswith(SKILL_PREFIX))
+        found = heapq.nlargest(PREFIX_EXPANSIONS, candidates, key=lambda term: len(self.postings[term]))
+        if len(self._completions) >= MAX_CACHED_PREFIXES:
+            self._completions.clear()
+        self._completions[prefix] = found
+        return found
+
+    def search(self, query: str, limit: int = 20, **filters: Any) -> Dict[str, Any]:
+        """BM25-ranked items for a query; items matching more query words rank first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        terms += [SKILL_PREFIX + skill for skill in sorted(skills.extract_skills(query))
+                  if SKILL_PREFIX + skill not in terms]
+        lists = [self._impacts(term) for term in terms if term in self.postings]
+        if not lists:
+            return {"total": 0, "results": []}
+        if len(lists) == 1:
+            hits = [(1, impact, item_id) for item_id, impact in lists[0].items()]
+        else:
+            scores: Dict[str, float] = {}
+            matched: Counter = Counter()
+            for impacts in lists:
+                matched.update(impacts.keys())
+                for item_id, impact in impacts.items():
+                    scores[item_id] = scores.get(item_id, 0.0) + impact
+            hits = [(matched[item_id], score, item_id) for item_id, score in scores.items()]
+        if any(value is not None for value in filters.values()):
+            items = self.items
+            hits = [hit for hit in hits if self._matches_filters(items[hit[2]], filters)]
+        top = heapq.nlargest(limit, hits)
+        return {
+            "total": len(hits),
+            "results": [dict(self.items[item_id], score=round(score, 4)) for _, score, item_id in top],
+        }
+
+    def typeahead(self, query: str, limit: int = 8, **filters: Any) -> Dict[str, Any]:
+        """Suggestions while typing: earlier words must match, the last one is a prefix"""
+        words = tokenize(query)
+        if not words or not self.items:
+            return {"completions": [], "results": []}
+        complete = words if query[-1:].isspace() else words[:-1]
+        prefix = None if query[-1:].isspace() else words[-1]
+        for word in complete:
+            if word not in self.postings:
+                return {"completions": [], "results": []}
+
+        expansions = self.completions(prefix) if prefix else []
+        # Walk short candidate lists: the prefix completions', or else the rarest complete word's
+        if prefix:
+            lists = [self._top(term) for term in expansions]
+        else:
+            lists = [self._top(min(complete, key=lambda word: len(self.postings[word])))]
+        best: Dict[str, float] = {}
+        for entries in lists:
+            for negated, item_id in entries:
+                if negated < best.get(item_id, 0.0):
+                    best[item_id] = negated
+        filtered = any(value is not None for value in filters.values())
+        results = []
+        for item_id, _ in sorted(best.items(), key=lambda entry: entry[1]):
+            terms = self._item_terms[item_id]
+            item = self.items[item_id]
+            if all(word in terms for word in complete) and (not filtered or self._matches_filters(item, filters)):
+                results.append({key: item.get(key) for key in ("id", "kind", "title", "career_path_id")})
+                if len(results) == limit:
+                    break
+        return {"completions": expansions[:limit], "results": results}
+
+
+def _offsets(lengths: List[int]) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.uint64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def freeze(index: CatalogIndex) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Arrays and metadata of a ``FrozenCatalogIndex`` answering exactly like ``index``
+
+    Items are numbered in id order, so ranking ties broken by item id become
+    ties broken by item number.
+    """
+    index.warm_terms(index.terms())
+    item_ids = sorted(index.items)
+    numbers = {item_id: number for number, item_id in enumerate(item_ids)}
+    encoded_items = [json.dumps(index.items[item_id], separators=(",", ":")).encode("utf-8") for item_id in item_ids]
+
+    tables: Dict[str, List[Optional[str]]] = {field: [None] for field in FILTER_FIELDS}
+    codes = {field: np.zeros(len(item_ids), dtype=np.uint32) for field in FILTER_FIELDS}
+    estimated_times = np.full(len(item_ids), np.nan)
+    for number, item_id in enumerate(item_ids):
+        item = index.items[item_id]
+        for field in FILTER_FIELDS:
+            value = item.get(field)
+            if value is not None:
+                table = tables[field]
+                if value not in table:
+                    table.append(value)
+                codes[field][number] = table.index(value)
+        if item.get("estimated_time") is not None:
+            estimated_times[number] = item["estimated_time"]
+
+    vocabulary = index.terms()
+    encoded_terms = [term.encode("utf-8") for term in vocabulary]
+    posting_items: List[int] = []
+    posting_impacts: List[float] = []
+    posting_lengths: List[int] = []
+    top_items: List[int] = []
+    top_impacts: List[float] = []
+    top_lengths: List[int] = []
+    for term in vocabulary:
+        impacts = index._impacts(term)
+        for number, item_id in sorted((numbers[item_id], item_id) for item_id in impacts):
+            posting_items.append(number)
+            posting_impacts.append(impacts[item_id])
+        posting_lengths.append(len(impacts))
+        top = index._top(term)
+        top_items.extend(numbers[item_id] for _, item_id in top)
+        top_impacts.extend(-negated for negated, _ in top)
+        top_lengths.append(len(top))
+
+    arrays = {
+        "items": np.frombuffer(b"".join(encoded_items), dtype=np.uint8),
+        "item_offsets": _offsets([len(encoded) for encoded in encoded_items]),
+        "estimated_times": estimated_times,
+        "terms": np.frombuffer(b"".join(encoded_terms), dtype=np.uint8),
+        "term_offsets": _offsets([len(encoded) for encoded in encoded_terms]),
+        "posting_offsets": _offsets(posting_lengths),
+        "posting_items": np.array(posting_items, dtype=np.uint32),
+        "posting_impacts": np.array(posting_impacts, dtype=np.float64),
+        "top_offsets": _offsets(top_lengths),
+        "top_items": np.array(top_items, dtype=np.uint32),
+        "top_impacts": np.array(top_impacts, dtype=np.float64),
+    }
+    for field in FILTER_FIELDS:
+        arrays[f"{field}_codes"] = codes[field]
+    meta = {"items": len(item_ids), "version": index.version, "tables": tables}
+    return arrays, meta
+
+
+class FrozenCatalogIndex:
+    """Read-only ``CatalogIndex`` over the arrays made by ``freeze``"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self._arrays = arrays
+        self._items = arrays["items"]
+        self._item_offsets = arrays["item_offsets"]
+        self._terms = arrays["terms"]
+        self._term_offsets = arrays["term_offsets"]
+        self._posting_offsets = arrays["posting_offsets"]
+        self._posting_items = arrays["posting_items"]
+        self._posting_impacts = arrays["posting_impacts"]
+        self._top_offsets = arrays["top_offsets"]
+        self._top_items = arrays["top_items"]
+        self._top_impacts = arrays["top_impacts"]
+        self._size = meta["items"]
+        self._tables = {field: {value: code for code, value in enumerate(table) if value is not None}
+                        for field, table in meta["tables"].items()}
+        self._term_count = len(self._term_offsets) - 1
+        # "skill:" terms are one contiguous run of the sorted vocabulary; completions skip it
+        self._skill_terms = (self._bisect(SKILL_PREFIX.encode()), self._bisect((SKILL_PREFIX + "\uffff").encode()))
+        self._completions: Dict[str, List[str]] = {}
+        self.version = meta["version"]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _term(self, position: int) -> bytes:
+        return self._terms[int(self._term_offsets[position]):int(self._term_offsets[position + 1])].tobytes()
+
+    def _bisect(self, key: bytes, low: int = 0) -> int:
+        # UTF-8 byte order is code point order, so this agrees with bisect on the str vocabulary
+        high = self._term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, term: str) -> int:
+        key = term.encode("utf-8")
+        position = self._bisect(key)
+        return position if position < self._term_count and self._term(position) == key else -1
+
+    def _frequency(self, position: int) -> int:
+        return int(self._posting_offsets[position + 1] - self._posting_offsets[position])
+
+    def _postings(self, position: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = int(self._posting_offsets[position]), int(self._posting_offsets[position + 1])
+        return self._posting_items[start:end], self._posting_impacts[start:end]
+
+    def _top(self, position: int) -> List[Tuple[float, int]]:
+        start, end = int(self._top_offsets[position]), int(self._top_offsets[position + 1])
+        return list(zip((-self._top_impacts[start:end]).tolist(), self._top_items[start:end].tolist()))
+
+    def _contains(self, position: int, number: int) -> bool:
+        items, _ = self._postings(position)
+        found = int(np.searchsorted(items, number))
+        return found < len(items) and int(items[found]) == number
+
+    def item(self, number: int) -> Dict[str, Any]:
+        start, end = int(self._item_offsets[number]), int(self._item_offsets[number + 1])
+        return json.loads(self._items[start:end].tobytes())
+
+    def terms(self) -> List[str]:
+        return [self._term(position).decode("utf-8") for position in range(self._term_count)]
+
+    def warm_terms(self, terms: Iterable[str]) -> None:
+        """Nothing to do; every term was scored when the index was frozen"""
+
+    def _filter_mask(self, numbers: np.ndarray, filters: Dict[str, Any]) -> np.ndarray:
+        mask = np.ones(len(numbers), dtype=bool)
+        for field in FILTER_FIELDS:
+            wanted = filters.get(field)
+            if wanted is not None:
+                code = self._tables[field].get(wanted)
+                if code is None:
+                    return np.zeros(len(numbers), dtype=bool)
+                mask &= self._arrays[f"{field}_codes"][numbers] == code
+        times = self._arrays["estimated_times"][numbers]
+        if filters.get("min_time") is not None:
+            mask &= ~np.isnan(times) & (times >= filters["min_time"])
+        if filters.get("max_time") is not None:
+            mask &= ~np.isnan(times) & (times <= filters["max_time"])
+        return mask
+
+    def completions(self, prefix: str) -> List[str]:
+        cached = self._completions.get(prefix)
+        if cached is not None:
+            return cached
+        start = self._bisect(prefix.encode("utf-8"))
+        end = self._bisect((prefix + "\uffff").encode("utf-8"), start)
+        skill_start, skill_end = self._skill_terms
+        positions = np.array([position for position in range(start, end)
+                              if not skill_start <= position < skill_end], dtype=np.int64)
+        frequencies = (self._posting_offsets[positions + 1] - self._posting_offsets[positions]).astype(np.int64)
+        best = positions[np.argsort(-frequencies, kind="stable")[:PREFIX_EXPANSIONS]]
+        found = [self._term(int(position)).decode("utf-8") for position in best]
+        if len(self._completions) >= MAX_CACHED_PREFIXES:
+            self._completions.clear()
+        self._completions[prefix] = found
+        return found
+
+    def search(self, query: str, limit: int = 20, **filters: Any) -> Dict[str, Any]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        terms += [SKILL_PREFIX + skill for skill in sorted(skills.extract_skills(query))
+                  if SKILL_PREFIX + skill not in terms]
+        positions = [position for position in (self._find(term) for term in terms) if position >= 0]
+        if not positions:
+            return {"total": 0, "results": []}
+        scores = np.zeros(self._size)
+        matched = np.zeros(self._size, dtype=np.int64)
+        for position in positions:
+            # Added term by term, in query order, so the sums match CatalogIndex to the last bit
+            items, impacts = self._postings(position)
+            scores[items] += impacts
+            matched[items] += 1
+        hits = np.flatnonzero(matched)
+        if any(value is not None for value in filters.values()):
+            hits = hits[self._filter_mask(hits, filters)]
+        order = np.lexsort((hits, scores[hits], matched[hits]))[::-1][:limit]
+        return {
+            "total": len(hits),
+            "results": [dict(self.item(int(number)), score=round(float(scores[number]), 4))
+                        for number in hits[order]],
+        }
+
+    def typeahead(self, query: str, limit: int = 8, **filters: Any) -> Dict[str, Any]:
+        words = tokenize(query)
+        if not words or not self._size:
+            return {"completions": [], "results": []}
+        complete = words if query[-1:].isspace() else words[:-1]
+        prefix = None if query[-1:].isspace() else words[-1]
+        complete_positions = [self._find(word) for word in complete]
+        if any(position < 0 for position in complete_positions):
+            return {"completions": [], "results": []}
+
+        expansions = self.completions(prefix) if prefix else []
+        if prefix:
+            lists = [self._top(self._find(term)) for term in expansions]
+        else:
+            lists = [self._top(min(complete_positions, key=self._frequency))]
+        best: Dict[int, float] = {}
+        for entries in lists:
+            for negated, number in entries:
+                if negated < best.get(number, 0.0):
+                    best[number] = negated
+        filtered = any(value is not None for value in filters.values())
+        results = []
+        for number, _ in sorted(best.items(), key=lambda entry: entry[1]):
+            if not all(self._contains(position, number) for position in complete_positions):
+                continue
+            if filtered and not self._filter_mask(np.array([number]), filters)[0]:
+                continue
+            item = self.item(number)
+            results.append({key: item.get(key) for key in ("id", "kind", "title", "career_path_id")})
+            if len(results) == limit:
+                break
+        return {"completions": expansions[:limit], "results": results}
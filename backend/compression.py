@@ -0,0 +1,117 @@
+"""Negotiated response compression.
+
+JSON and text responses above ``minimum_size`` are compressed with brotli when
+the client accepts it and the ``brotli`` package is installed, otherwise with
+gzip. Responses with a Content-Length are collected even if they arrive in
+several chunks (the ``http`` middlewares re-stream every body); responses
+without one, such as exports, are real streams and pass through untouched.
+"""
+import gzip
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+MAX_BUFFERED_BYTES = 8 * 1024 * 1024
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def negotiate(header: str) -> Optional[str]:
+    """Best supported content coding for an Accept-Encoding header"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, coding: str) -> bytes:
+        if coding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_headers = dict(scope.get("headers") or [])
+        coding = negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if coding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        chunks: List[bytes] = []
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                return await send(message)
+
+            headers = list(start_message.get("headers", []))
+            content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+            content_length = int(_header(headers, b"content-length") or -1)
+            compressible = (
+                _header(headers, b"content-encoding") is None
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+                # Only responses of known, bounded size are buffered; real streams pass through
+                and 0 <= content_length <= MAX_BUFFERED_BYTES
+            )
+            if not compressible:
+                start, start_message = start_message, None
+                await send(start)
+                return await send(message)
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            start, start_message = start_message, None
+            body = b"".join(chunks)
+            headers.append((b"vary", b"Accept-Encoding"))
+            if len(body) >= self.minimum_size:
+                body = self.compress(body, coding)
+                headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+                headers += [(b"content-encoding", coding.encode()), (b"content-length", str(len(body)).encode())]
+            await send(dict(start, headers=headers))
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,53 @@
+"""Concurrent section loading for the composite dashboard endpoint.
+
+Each dashboard section is an awaitable run as its own task. All sections are
+gathered together, every one is timed, and a section that fails or misses its
+deadline comes back with a status instead of failing the whole response.
+Late sections are not cancelled: they keep running in the background so a
+slow AI call still lands in the response cache for the next request.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Optional, Set, Tuple
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# Sections that outlived their deadline, kept referenced until they finish
+_background: Set[asyncio.Task] = set()
+
+
+async def run_section(awaitable: Awaitable, deadline: Optional[float]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    task = asyncio.ensure_future(awaitable)
+    try:
+        data = await asyncio.wait_for(asyncio.shield(task), timeout=deadline)
+        result = {"status": OK, "data": data}
+    except asyncio.TimeoutError:
+        _background.add(task)
+        task.add_done_callback(_finish_background)
+        result = {"status": TIMEOUT, "data": None}
+    except Exception as e:
+        result = {"status": ERROR, "data": None, "error": str(e) or type(e).__name__}
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def _finish_background(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled():
+        # Retrieve the exception so it is not reported as never retrieved
+        task.exception()
+
+
+async def gather_sections(sections: Dict[str, Tuple[Awaitable, Optional[float]]]) -> Dict[str, Dict[str, Any]]:
+    """Run (awaitable, deadline seconds) sections concurrently, keyed by section name"""
+    names = list(sections)
+    results = await asyncio.gather(*(run_section(*sections[name]) for name in names))
+    return dict(zip(names, results))
+
+
+def timed(value: Any, started: float) -> Dict[str, Any]:
+    """Section result for work that was done inline"""
+    return {"status": OK, "data": value, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
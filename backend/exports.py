@@ -0,0 +1,258 @@
+"""Streaming exports of the users, assessments and interviews collections.
+
+Documents are pulled from a Motor cursor in fixed-size batches and each batch is
+encoded and handed to the HTTP response before the next one is read, so memory
+stays bounded by the batch size no matter how large the collection is. Encoding
+runs on a worker thread so a large batch does not stall other requests.
+
+The response status is sent before the first batch, so nothing may fail midway:
+a field that cannot be converted to its column's type is exported as null.
+"""
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+DEFAULT_BATCH_SIZE = 5000
+MAX_BATCH_SIZE = 50000
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# Fields that must never leave the database, whatever the export format; derived
+# data (packed skill vectors, precomputed matches) is left out as well
+EXCLUDED_FIELDS = {"users": ["password", "skill_vector", "skill_vector_version", "career_matches"]}
+
+# (field, kind) per exported collection; kind drives CSV and Parquet encoding
+EXPORT_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "users": [
+        ("_id", "string"),
+        ("username", "string"),
+        ("email", "string"),
+        ("interests", "json"),
+        ("current_skills", "json"),
+        ("career_goals", "json"),
+        ("learning_preferences", "json"),
+        ("experience_level", "string"),
+        ("preferred_location", "string"),
+        ("time_available", "int"),
+        ("budget_constraints", "string"),
+        ("level", "int"),
+        ("experience_points", "int"),
+        ("badges", "json"),
+        ("completed_projects", "json"),
+        ("created_at", "datetime"),
+        ("updated_at", "datetime"),
+    ],
+    "skill_assessments": [
+        ("_id", "string"),
+        ("user_id", "string"),
+        ("skill_name", "string"),
+        ("score", "int"),
+        ("assessment_type", "string"),
+        ("timestamp", "datetime"),
+    ],
+    "mock_interviews": [
+        ("_id", "string"),
+        ("user_id", "string"),
+        ("career_path", "string"),
+        ("questions", "json"),
+        ("answers", "json"),
+        ("score", "float"),
+        ("feedback", "string"),
+        ("started_at", "datetime"),
+        ("completed_at", "datetime"),
+    ],
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _cell(value: Any, kind: str) -> Any:
+    """Flatten one field into a scalar suitable for a CSV cell or Parquet column"""
+    if value is None:
+        return None
+    if kind == "json":
+        return json.dumps(value, default=_json_default)
+    if kind == "int":
+        try:
+            number = int(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return number if INT64_MIN <= number <= INT64_MAX else None
+    if kind == "float":
+        try:
+            return float(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+    if kind == "datetime":
+        return _to_datetime(value)
+    return str(value)
+
+
+def export_projection(collection: str) -> Dict[str, int]:
+    """Projection that strips sensitive fields at the database"""
+    return {field: 0 for field in EXCLUDED_FIELDS.get(collection, [])}
+
+
+def open_export_cursor(db, collection: str, batch_size: int):
+    """Open a cursor over a collection that never returns excluded fields"""
+    projection = export_projection(collection) or None
+    return db[collection].find({}, projection, batch_size=batch_size)
+
+
+async def iter_batches(cursor, batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Group documents from an async cursor into lists of at most batch_size"""
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_csv_batch(batch: List[Dict[str, Any]], columns: List[Tuple[str, str]], include_header: bool) -> bytes:
+    """Encode a batch of documents as CSV rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow([name for name, _ in columns])
+    for document in batch:
+        row = []
+        for name, kind in columns:
+            value = _cell(document.get(name), kind)
+            row.append(value.isoformat() if isinstance(value, datetime) else value)
+        writer.writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson_batch(batch: List[Dict[str, Any]], excluded: List[str]) -> bytes:
+    """Encode a batch of documents as newline-delimited JSON"""
+    lines = []
+    for document in batch:
+        for field in excluded:
+            document.pop(field, None)
+        lines.append(json.dumps(document, default=_json_default))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _DrainableSink:
+    """Write-only file object whose buffered bytes can be drained between row groups"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetBatchEncoder:
+    """Write each batch as one Parquet row group and emit the bytes produced so far"""
+
+    _ARROW_TYPES = {
+        "string": "string",
+        "json": "string",
+        "int": "int64",
+        "float": "float64",
+        "datetime": "timestamp[us]",
+    }
+
+    def __init__(self, columns: List[Tuple[str, str]]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow to be installed")
+
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([
+            (name, pa.type_for_alias(self._ARROW_TYPES[kind])) for name, kind in columns
+        ])
+        self._sink = _DrainableSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="snappy")
+
+    def encode(self, batch: List[Dict[str, Any]]) -> bytes:
+        arrays = {
+            name: [_cell(document.get(name), kind) for document in batch]
+            for name, kind in self._columns
+        }
+        self._writer.write_table(self._pa.Table.from_pydict(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+async def stream_export(cursor, collection: str, fmt: str, batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """Yield an export of the cursor's documents one encoded batch at a time"""
+    columns = EXPORT_COLUMNS[collection]
+    excluded = EXCLUDED_FIELDS.get(collection, [])
+
+    if fmt == "parquet":
+        encoder = ParquetBatchEncoder(columns)
+        async for batch in iter_batches(cursor, batch_size):
+            chunk = await asyncio.to_thread(encoder.encode, batch)
+            if chunk:
+                yield chunk
+        yield await asyncio.to_thread(encoder.close)
+        return
+
+    include_header = True
+    async for batch in iter_batches(cursor, batch_size):
+        if fmt == "csv":
+            yield await asyncio.to_thread(encode_csv_batch, batch, columns, include_header)
+            include_header = False
+        else:
+            yield await asyncio.to_thread(encode_ndjson_batch, batch, excluded)
+
+    if fmt == "csv" and include_header:
+        # Empty collection: still emit the header row
+        yield encode_csv_batch([], columns, True)
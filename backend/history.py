@@ -0,0 +1,100 @@
+"""Keyset-paginated listing of a user's interviews and assessments.
+
+Pages are ordered newest first by ``(timestamp field, _id)`` and walked with
+an opaque cursor holding the last item's key, so fetching page 500 reads the
+same few index entries as page 1 instead of skipping over everything before
+it. Each collection needs a compound index on ``(user_id, field, _id)``, which
+``ensure_indexes`` creates. List pages use summary projections; the full
+``questions``/``answers`` arrays are only returned by the per-item detail
+endpoints.
+"""
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import bson
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class HistoryFeed:
+    def __init__(self, collection: str, sort_field: str, projection: Dict[str, int]):
+        self.collection = collection
+        self.sort_field = sort_field
+        self.projection = projection
+
+    @property
+    def index_keys(self) -> List[tuple]:
+        return [("user_id", 1), (self.sort_field, -1), ("_id", -1)]
+
+
+INTERVIEWS = HistoryFeed("mock_interviews", "started_at", {
+    "user_id": 1, "career_path": 1, "score": 1, "started_at": 1, "completed_at": 1, "live": 1,
+})
+ASSESSMENTS = HistoryFeed("skill_assessments", "timestamp", {
+    "user_id": 1, "skill_name": 1, "score": 1, "assessment_type": 1, "timestamp": 1,
+})
+FEEDS = (INTERVIEWS, ASSESSMENTS)
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not issued by this API"""
+
+
+def encode_cursor(document: Dict[str, Any], sort_field: str) -> str:
+    # BSON keeps datetimes and ids exactly as stored, so the next query compares like with like
+    data = bson.encode({"k": document.get(sort_field), "i": document["_id"]})
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        decoded = bson.decode(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+    if set(decoded) != {"k", "i"}:
+        raise InvalidCursor("Invalid cursor")
+    # The values land in equality and range positions of the query, where a
+    # decoded document would be read as an operator expression
+    if not isinstance(decoded["k"], (datetime, type(None))) or not isinstance(decoded["i"], str):
+        raise InvalidCursor("Invalid cursor")
+    return decoded
+
+
+def page_query(feed: HistoryFeed, user_id: str, cursor: Optional[str]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"user_id": user_id}
+    if cursor is None:
+        return query
+    position = decode_cursor(cursor)
+    key, last_id = position["k"], position["i"]
+    if key is None:
+        # Items without a timestamp sort after all dated ones
+        query.update({feed.sort_field: None, "_id": {"$lt": last_id}})
+    else:
+        query["$or"] = [
+            {feed.sort_field: {"$lt": key}},
+            {feed.sort_field: key, "_id": {"$lt": last_id}},
+            {feed.sort_field: None},
+        ]
+    return query
+
+
+async def fetch_page(db, feed: HistoryFeed, user_id: str, cursor: Optional[str] = None,
+                     limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """One page of summaries, newest first, and the cursor of the next page (None on the last)"""
+    documents = await (
+        db[feed.collection]
+        .find(page_query(feed, user_id, cursor), feed.projection)
+        .sort([(feed.sort_field, -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    items = documents[:limit]
+    next_cursor = encode_cursor(items[-1], feed.sort_field) if len(documents) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def ensure_indexes(db) -> None:
+    for feed in FEEDS:
+        await db[feed.collection].create_index(feed.index_keys, name=f"user_history_{feed.sort_field}")
@@ -0,0 +1,78 @@
+"""Interview scoring shared by the HTTP and live interview flows.
+
+Answers are scored by the expected keywords they mention. Questions that also
+carry an ``expected_answer`` (the AI-generated ones) are additionally graded by
+text similarity, and the better of the two scores counts.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import answer_scoring
+
+POINTS_PER_QUESTION = 10
+POINTS_PER_KEYWORD = 2
+FEEDBACK_THRESHOLD = 5
+
+
+def score_answer(question: Dict, answer: Dict, similarity_score: Optional[int] = None) -> int:
+    """Score one answer out of 10 by the expected keywords it mentions"""
+    answer_text = answer.get("answer", "").lower()
+    expected_keywords = question.get("expected_keywords", [])
+    keyword_matches = sum(1 for keyword in expected_keywords if keyword.lower() in answer_text)
+    score = min(POINTS_PER_QUESTION, keyword_matches * POINTS_PER_KEYWORD)
+    return max(score, similarity_score or 0)
+
+
+def similarity_scores(questions: List[Dict], answers: List[Dict]) -> List[Optional[int]]:
+    """Similarity score per answer for questions with an expected answer, graded as one batch"""
+    scores: List[Optional[int]] = [None] * min(len(questions), len(answers))
+    indexes = [i for i in range(len(scores)) if questions[i].get("expected_answer")]
+    if not indexes or not answer_scoring.available():
+        return scores
+    graded = answer_scoring.score_answers(
+        [answer_scoring.reference_text(questions[i]) for i in indexes],
+        [answers[i].get("answer", "") for i in indexes],
+    )
+    for i, score in zip(indexes, graded):
+        scores[i] = score
+    return scores
+
+
+def answer_feedback(index: int, question: Dict, score: int) -> Optional[str]:
+    """Feedback line for a weak answer, or None if the answer was good enough"""
+    if score >= FEEDBACK_THRESHOLD:
+        return None
+    expected_keywords = question.get("expected_keywords", [])
+    return f"Question {index + 1}: Consider including more technical details about {', '.join(expected_keywords)}"
+
+
+def percentage(total_score: int, question_count: int) -> float:
+    if question_count == 0:
+        return 0.0
+    return (total_score / (question_count * POINTS_PER_QUESTION)) * 100
+
+
+def overall_feedback(final_score: float) -> str:
+    if final_score >= 80:
+        return "Excellent! You demonstrate strong knowledge in this area."
+    if final_score >= 60:
+        return "Good performance! Focus on the areas mentioned in feedback to improve."
+    return "Keep practicing! Review the fundamental concepts and try again."
+
+
+def evaluate_interview_answers(questions: List[Dict], answers: List[Dict], career_path: str) -> Tuple[float, str]:
+    """Evaluate interview answers and provide feedback"""
+    total_score = 0
+    feedback_points = []
+
+    semantic = similarity_scores(questions, answers)
+    for i, (question, answer) in enumerate(zip(questions, answers)):
+        score = score_answer(question, answer, semantic[i])
+        total_score += score
+        point = answer_feedback(i, question, score)
+        if point:
+            feedback_points.append(point)
+
+    final_score = percentage(total_score, len(questions))
+    feedback = overall_feedback(final_score) + "\n\n" + "\n".join(feedback_points)
+
+    return round(final_score, 2), feedback
@@ -0,0 +1,302 @@
+"""Live mock-interview sessions over Socket.IO.
+
+Session state lives in process memory and expires after a period of
+inactivity. Each answer is scored the moment it arrives, and the running result
+is pushed back to the session's room. MongoDB is updated by a write-behind
+flusher that batches dirty session snapshots into a single ``bulk_write``, so
+a burst of answers costs one round-trip instead of one per event.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import socketio
+from pymongo import UpdateOne
+
+import interview_scoring
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "/interview"
+DEFAULT_TTL_SECONDS = 1800
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_BATCH_SIZE = 500
+
+
+class SessionError(Exception):
+    """Raised for requests against unknown, expired or finished sessions"""
+
+
+class InterviewSession:
+    __slots__ = (
+        "session_id", "user_id", "career_path", "questions", "answers", "scores",
+        "total_score", "started_at", "completed_at", "last_active", "persisted",
+    )
+
+    def __init__(self, session_id: str, user_id: str, career_path: str, questions: List[Dict[str, Any]]):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.career_path = career_path
+        self.questions = questions
+        self.answers: List[Optional[Dict[str, Any]]] = [None] * len(questions)
+        self.scores: List[Optional[int]] = [None] * len(questions)
+        self.total_score = 0
+        self.started_at = datetime.utcnow()
+        self.completed_at: Optional[datetime] = None
+        self.last_active = time.monotonic()
+        self.persisted = False
+
+    @property
+    def answered(self) -> int:
+        return sum(1 for score in self.scores if score is not None)
+
+    @property
+    def running_score(self) -> float:
+        return round(interview_scoring.percentage(self.total_score, len(self.questions)), 2)
+
+    def feedback(self) -> str:
+        points = []
+        for index, (question, score) in enumerate(zip(self.questions, self.scores)):
+            point = interview_scoring.answer_feedback(index, question, score or 0)
+            if point:
+                points.append(point)
+        return interview_scoring.overall_feedback(self.running_score) + "\n\n" + "\n".join(points)
+
+    def snapshot_update(self) -> Dict[str, Any]:
+        """Update document persisting this session; static fields are written once"""
+        fields = {
+            "answers": [answer or {} for answer in self.answers],
+            "score": self.running_score,
+            "updated_at": datetime.utcnow(),
+        }
+        if self.completed_at:
+            fields["feedback"] = self.feedback()
+            fields["completed_at"] = self.completed_at
+        update = {"$set": fields}
+        if not self.persisted:
+            update["$setOnInsert"] = {
+                "user_id": self.user_id,
+                "career_path": self.career_path,
+                "questions": self.questions,
+                "started_at": self.started_at,
+                "live": True,
+            }
+        return update
+
+
+class InterviewSessionManager:
+    """In-memory session store with TTL expiry and write-behind persistence"""
+
+    def __init__(self, db, question_factory: Callable[[str], List[Dict[str, Any]]],
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 flush_batch_size: int = DEFAULT_FLUSH_BATCH_SIZE):
+        self.db = db
+        self.question_factory = question_factory
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.sessions: Dict[str, InterviewSession] = {}
+        self._dirty: Set[str] = set()
+        self._flush_wanted = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.flushes = 0
+        self.flushed_documents = 0
+        self.last_flush_ms = 0.0
+        self.expired = 0
+
+    def _touch(self, session: InterviewSession) -> None:
+        session.last_active = time.monotonic()
+        self._dirty.add(session.session_id)
+        if len(self._dirty) >= self.flush_batch_size:
+            self._flush_wanted.set()
+
+    def get_session(self, session_id: str) -> InterviewSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise SessionError("Session not found or expired")
+        return session
+
+    def start_session(self, user_id: str, career_path: str) -> InterviewSession:
+        questions = self.question_factory(career_path)
+        if not questions:
+            raise SessionError("Career path not found")
+        session = InterviewSession(str(uuid.uuid4()), user_id, career_path, questions)
+        self.sessions[session.session_id] = session
+        self._touch(session)
+        return session
+
+    def submit_answer(self, session_id: str, question_index: int, answer: Dict[str, Any]) -> Dict[str, Any]:
+        session = self.get_session(session_id)
+        if session.completed_at:
+            raise SessionError("Session already completed")
+        if not 0 <= question_index < len(session.questions):
+            raise SessionError("Question index out of range")
+
+        score = interview_scoring.score_answer(session.questions[question_index], answer)
+        previous = session.scores[question_index]
+        session.total_score += score - (previous or 0)
+        session.scores[question_index] = score
+        session.answers[question_index] = answer
+        self._touch(session)
+
+        return {
+            "session_id": session_id,
+            "question_index": question_index,
+            "score": score,
+            "running_score": session.running_score,
+            "answered": session.answered,
+            "total_questions": len(session.questions),
+        }
+
+    def finish_session(self, session_id: str) -> Dict[str, Any]:
+        session = self.get_session(session_id)
+        if not session.completed_at:
+            session.completed_at = datetime.utcnow()
+            self._touch(session)
+        return {
+            "session_id": session_id,
+            "score": session.running_score,
+            "feedback": session.feedback(),
+            "questions": session.questions,
+        }
+
+    async def flush(self) -> int:
+        """Persist every dirty session in one unordered bulk write"""
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = self._dirty, set()
+        sessions = [self.sessions[session_id] for session_id in dirty if session_id in self.sessions]
+        operations = [
+            UpdateOne({"_id": session.session_id}, session.snapshot_update(), upsert=True)
+            for session in sessions
+        ]
+        if not operations:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            await self.db.mock_interviews.bulk_write(operations, ordered=False)
+        except Exception:
+            # Keep the snapshots so the next flush retries them
+            self._dirty |= dirty
+            raise
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        for session in sessions:
+            session.persisted = True
+        self.flushes += 1
+        self.flushed_documents += len(operations)
+        return len(operations)
+
+    def sweep(self) -> int:
+        """Drop sessions idle past the TTL once their last state is persisted"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        stale = [
+            session_id for session_id, session in self.sessions.items()
+            if session.last_active < cutoff and session_id not in self._dirty
+        ]
+        for session_id in stale:
+            del self.sessions[session_id]
+        self.expired += len(stale)
+        return len(stale)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wanted.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wanted.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Interview session flush failed", extra={"error": str(e)})
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(min(60.0, self.ttl_seconds / 2))
+            self.sweep()
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._flush_loop()), asyncio.create_task(self._sweep_loop())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": len(self.sessions),
+            "dirty_sessions": len(self._dirty),
+            "flushes": self.flushes,
+            "flushed_documents": self.flushed_documents,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "expired_sessions": self.expired,
+        }
+
+
+class InterviewNamespace(socketio.AsyncNamespace):
+    """Socket.IO events for live interviews; each session gets its own room"""
+
+    def __init__(self, manager: InterviewSessionManager, namespace: str = NAMESPACE):
+        super().__init__(namespace)
+        self.manager = manager
+
+    async def _fail(self, sid: str, error: Exception) -> None:
+        await self.emit("error", {"message": str(error)}, to=sid)
+
+    async def on_start(self, sid, data):
+        try:
+            session = self.manager.start_session(data["user_id"], data["career_path_id"])
+        except (KeyError, TypeError):
+            return await self._fail(sid, SessionError("user_id and career_path_id are required"))
+        except SessionError as e:
+            return await self._fail(sid, e)
+        await self.enter_room(sid, session.session_id)
+        await self.emit("session_started", {
+            "session_id": session.session_id,
+            "career_path": session.career_path,
+            "questions": session.questions,
+        }, to=sid)
+
+    async def on_join(self, sid, data):
+        try:
+            session = self.manager.get_session(data["session_id"])
+        except (KeyError, TypeError, SessionError) as e:
+            return await self._fail(sid, e if isinstance(e, SessionError) else SessionError("session_id is required"))
+        await self.enter_room(sid, session.session_id)
+        await self.emit("session_state", {
+            "session_id": session.session_id,
+            "questions": session.questions,
+            "answered": session.answered,
+            "running_score": session.running_score,
+        }, to=sid)
+
+    async def on_answer(self, sid, data):
+        try:
+            result = self.manager.submit_answer(data["session_id"], int(data["question_index"]), {"answer": str(data["answer"])})
+        except (KeyError, TypeError, ValueError):
+            return await self._fail(sid, SessionError("session_id, question_index and answer are required"))
+        except SessionError as e:
+            return await self._fail(sid, e)
+        await self.emit("answer_scored", result, room=data["session_id"])
+
+    async def on_finish(self, sid, data):
+        try:
+            result = self.manager.finish_session(data["session_id"])
+        except (KeyError, TypeError):
+            return await self._fail(sid, SessionError("session_id is required"))
+        except SessionError as e:
+            return await self._fail(sid, e)
+        await self.emit("session_completed", result, room=data["session_id"])
+
+
+def create_socket_app(manager: InterviewSessionManager, cors_allowed_origins: List[str]):
+    """Socket.IO server with the interview namespace, wrapped as an ASGI app"""
+    server = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins=cors_allowed_origins)
+    server.register_namespace(InterviewNamespace(manager))
+    return socketio.ASGIApp(server, socketio_path="socket.io")
@@ -0,0 +1,202 @@
+"""Search index and market statistics built from job-posting dumps.
+
+``jobs.ingest_postings`` writes the index as a directory of flat files; the
+API maps them read-only, so opening an index is cheap and postings lists are
+only paged in as queries touch them:
+
+``meta.json``
+    document count, average length, BM25 parameters and the market trends
+    computed at build time
+``terms.json``
+    term -> [offset, document frequency] into the postings arrays
+``doc_ids.u32`` / ``impacts.f32``
+    postings lists of every term, concatenated in term order; each list is
+    sorted by document id. The impact is the term's whole BM25 contribution
+    to that document, computed at build time, so scoring a query is only
+    slicing and summing
+``doc_careers.u8``
+    per-document career path (``NO_CAREER`` if none)
+``docs.jsonl`` / ``doc_offsets.u64``
+    stored postings returned with search results, addressed by byte offset
+
+Besides plain words, each document is indexed under ``skill:<canonical>`` for
+the skills it mentions and ``loc:<word>`` for its location, so a search for
+"node.js" also finds postings that only say "Express".
+"""
+import json
+import mmap
+import os
+import re
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+import skills
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = os.path.join("data", "postings_index")
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+MAX_TERM_FREQUENCY = 65535
+MAX_TERM_LENGTH = 64
+NO_CAREER = 255
+# Queries whose postings cover at least 1/DENSE_QUERY_RATIO of the documents are scored densely
+DENSE_QUERY_RATIO = 8
+
+SKILL_PREFIX = "skill:"
+LOCATION_PREFIX = "loc:"
+
+STOP_WORDS = frozenset("""
+a an and are as at be been but by for from has have in is it its of on or our that the their this to was we
+were will with you your who what which job role work team teams experience years year looking join using
+""".split())
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+# Single-letter names that are languages, not noise
+_SHORT_TERMS = frozenset({"c", "r"})
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower())
+            if word not in STOP_WORDS and (1 < len(word) <= MAX_TERM_LENGTH or word in _SHORT_TERMS)]
+
+
+def location_terms(location: str) -> List[str]:
+    return [LOCATION_PREFIX + word for word in dict.fromkeys(_WORD.findall(location.lower()))]
+
+
+def skill_terms(found: Set[str]) -> List[str]:
+    return [SKILL_PREFIX + skill for skill in sorted(found)]
+
+
+def _contains(haystack: np.ndarray, needles: np.ndarray) -> np.ndarray:
+    """Which of ``needles`` occur in the sorted array ``haystack``"""
+    if len(haystack) == 0:
+        return np.zeros(len(needles), dtype=bool)
+    positions = np.minimum(np.searchsorted(haystack, needles), len(haystack) - 1)
+    return haystack[positions] == needles
+
+
+def index_exists(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, "meta.json"))
+
+
+class PostingsIndex:
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported postings index version {self.meta.get('version')}")
+        with open(os.path.join(path, "terms.json"), encoding="utf-8") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+        self.documents = self.meta["documents"]
+        self.careers: List[str] = self.meta["careers"]
+        self.doc_ids = self._map("doc_ids.u32", np.uint32)
+        self.impacts = self._map("impacts.f32", np.float32)
+        self.doc_careers = self._map("doc_careers.u8", np.uint8)
+        self.doc_offsets = self._map("doc_offsets.u64", np.uint64)
+        with open(os.path.join(path, "docs.jsonl"), "rb") as f:
+            self._docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.documents else b""
+
+    @classmethod
+    def open(cls, path: str) -> "PostingsIndex":
+        return cls(path)
+
+    def _map(self, name: str, dtype) -> np.ndarray:
+        file_path = os.path.join(self.path, name)
+        if os.path.getsize(file_path) == 0:
+            # numpy cannot map an empty file
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(file_path, dtype=dtype, mode="r")
+
+    def close(self) -> None:
+        if isinstance(self._docs, mmap.mmap):
+            self._docs.close()
+
+    @property
+    def market_trends(self) -> Dict[str, Any]:
+        return self.meta["market_trends"]
+
+    def document(self, doc_id: int) -> Dict[str, Any]:
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        return json.loads(self._docs[start:end])
+
+    def _postings(self, term: str):
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        start, count = entry
+        return self.doc_ids[start:start + count], self.impacts[start:start + count]
+
+    def _matching(self, terms: List[str]) -> np.ndarray:
+        """Sorted ids of the documents containing every one of ``terms`` (at least one term required)"""
+        lists = []
+        for term in terms:
+            postings = self._postings(term)
+            if postings is None:
+                return np.zeros(0, dtype=np.uint32)
+            lists.append(postings[0])
+        lists.sort(key=len)
+        matched = np.asarray(lists[0])
+        for ids in lists[1:]:
+            matched = matched[_contains(ids, matched)]
+        return matched
+
+    def search(self, query: str, career_path_id: Optional[str] = None, location: Optional[str] = None,
+               limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """BM25-ranked postings for a query, optionally filtered by career path and location"""
+        terms = list(dict.fromkeys(tokenize(query) + skill_terms(skills.extract_skills(query))))
+        ids_parts: List[np.ndarray] = []
+        score_parts: List[np.ndarray] = []
+        for term in terms:
+            postings = self._postings(term)
+            if postings is None:
+                continue
+            ids_parts.append(postings[0])
+            score_parts.append(postings[1])
+        if not ids_parts:
+            return {"total": 0, "results": []}
+
+        if len(ids_parts) == 1:
+            ids, scores = np.asarray(ids_parts[0]), np.asarray(score_parts[0])
+        else:
+            ids = np.concatenate(ids_parts)
+            scores = np.concatenate(score_parts)
+            # Sum the per-term scores of each document: dense queries into a per-document array,
+            # sparse ones by sorting only the hits
+            if len(ids) * DENSE_QUERY_RATIO >= self.documents:
+                totals = np.bincount(ids, weights=scores, minlength=self.documents)
+                ids = np.flatnonzero(totals).astype(np.uint32)
+                scores = totals[ids]
+            else:
+                order = np.argsort(ids, kind="stable")
+                ids, scores = ids[order], scores[order]
+                ids, starts = np.unique(ids, return_index=True)
+                scores = np.add.reduceat(scores, starts)
+
+        wanted_locations = location_terms(location) if location else []
+        if career_path_id is not None or wanted_locations:
+            keep = np.ones(len(ids), dtype=bool)
+            if career_path_id is not None:
+                if career_path_id in self.careers:
+                    keep &= self.doc_careers[ids] == self.careers.index(career_path_id)
+                else:
+                    keep[:] = False
+            if wanted_locations:
+                located = np.zeros(self.documents, dtype=bool)
+                located[self._matching(wanted_locations)] = True
+                keep &= located[ids]
+            ids, scores = ids[keep], scores[keep]
+
+        wanted = min(len(ids), offset + limit)
+        if wanted == 0:
+            return {"total": int(len(ids)), "results": []}
+        top = np.argpartition(-scores, wanted - 1)[:wanted] if wanted < len(ids) else np.arange(len(ids))
+        top = top[np.lexsort((ids[top], -scores[top]))][offset:]
+        results = []
+        for position in top:
+            document = self.document(int(ids[position]))
+            document["score"] = round(float(scores[position]), 4)
+            results.append(document)
+        return {"total": int(len(ids)), "results": results}
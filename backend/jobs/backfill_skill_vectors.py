@@ -0,0 +1,74 @@
+"""Encode the packed ``skill_vector`` of users that lack a current one.
+
+Run from the backend directory:
+
+    python -m jobs.backfill_skill_vectors
+    python -m jobs.backfill_skill_vectors --all --batch-size 2000   # re-encode everyone
+
+The API keeps vectors up to date on every skill change, so this is only
+needed once for users created before vectors existed, or after the vocabulary
+version changes. Users are walked in ``_id`` order in batches; each update is
+conditional on ``current_skills`` still being what was read, so a concurrent
+profile edit (which writes its own vector) wins.
+"""
+import argparse
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from pymongo import UpdateOne
+
+import skill_vectors
+import skills
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+async def backfill(db, batch_size: int, everyone: bool, start_after: Optional[str] = None) -> Dict[str, int]:
+    counts = {"scanned": 0, "written": 0}
+    vocabulary = await skill_vectors.load_vocabulary(db)
+    stale: Dict[str, Any] = {} if everyone else {skill_vectors.VERSION_FIELD: {"$ne": vocabulary.version}}
+    last_id = start_after
+    while True:
+        query = dict(stale)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.users.find(query, {"current_skills": 1}).sort("_id", 1).limit(batch_size).to_list(length=None)
+        if not batch:
+            return counts
+
+        current = [user.get("current_skills") or {} for user in batch]
+        names = [skills.normalize_skill(name) for levels in current for name in levels]
+        vocabulary = await skill_vectors.vocabulary_for(db, filter(None, names))
+        operations = [
+            UpdateOne({"_id": user["_id"], "current_skills": levels},
+                      {"$set": vocabulary.fields(skills.normalize_skill_levels(levels))})
+            for user, levels in zip(batch, current)
+        ]
+        result = await db.users.bulk_write(operations, ordered=False)
+        counts["scanned"] += len(batch)
+        counts["written"] += result.modified_count
+        last_id = batch[-1]["_id"]
+        print(f"users: scanned {counts['scanned']}, written {counts['written']}, last _id {last_id}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    db = AsyncIOMotorClient(args.mongo_url)[args.database]
+
+    counts = await backfill(db, args.batch_size, args.all, args.start_after)
+    print(f"users: {counts['scanned']} scanned, {counts['written']} vectors written")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--database", default="educursus")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--start-after", help="resume after this user _id")
+    parser.add_argument("--all", action="store_true", help="re-encode users whose vector is already current")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
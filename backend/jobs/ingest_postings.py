@@ -0,0 +1,451 @@
+"""Build the job-postings search index and market statistics from posting dumps.
+
+Run from the backend directory:
+
+    python -m jobs.ingest_postings dumps/naukri.csv dumps/linkedin.jsonl.gz
+    python -m jobs.ingest_postings dumps/*.csv --output data/postings_index --chunk-size 20000
+
+CSV, JSON Lines (``.jsonl``/``.ndjson``) and JSON array files are accepted,
+optionally gzipped. Columns are matched by common names (``title`` or
+``job_title``, ``salary`` or ``ctc``, ...). CSV and JSON Lines are read
+record by record; a JSON array file is parsed whole, so convert very large
+dumps to JSON Lines first.
+
+Postings are processed in chunks: each chunk's inverted index is written to a
+sorted run file, and the runs are merged term by term at the end, so memory
+stays bounded by the chunk size rather than the dump size. The index is built
+next to ``--output`` and swapped in when complete; restart the API or call
+``POST /admin/postings-index/reload`` to serve it.
+"""
+import argparse
+import csv
+import gzip
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+import shutil
+import struct
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import job_postings
+import skills
+from catalog import CAREER_PATHS
+
+DEFAULT_OUTPUT = os.getenv("POSTINGS_INDEX_PATH", job_postings.DEFAULT_INDEX_PATH)
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_WINDOW_DAYS = 90
+TITLE_WEIGHT = 2
+# Minimum share of a career's required skill levels a posting must mention to be counted for it
+MIN_CAREER_OVERLAP = 0.4
+TOP_LOCATIONS = 4
+# skills_in_demand keeps the length of the static market data it replaces; hot_skills goes deeper
+TOP_SKILLS_IN_DEMAND = 4
+TOP_SKILLS = 10
+
+FIELD_ALIASES = {
+    "title": ("title", "job_title", "position", "designation", "role"),
+    "description": ("description", "job_description", "summary", "details"),
+    "company": ("company", "company_name", "employer", "organization"),
+    "location": ("location", "job_location", "city", "locations"),
+    "skills": ("skills", "key_skills", "tags", "skills_required"),
+    "salary": ("salary", "salary_range", "ctc", "compensation", "pay"),
+    "salary_min": ("salary_min", "min_salary", "minimum_salary"),
+    "salary_max": ("salary_max", "max_salary", "maximum_salary"),
+    "posted_at": ("posted_at", "date_posted", "posted_date", "posting_date", "created_at", "date"),
+    "url": ("url", "link", "job_url", "apply_url"),
+}
+
+# Title phrases checked before skill overlap, most specific first
+CAREER_TITLE_KEYWORDS = {
+    "ml_engineer": ("machine learning", "ml engineer", "ai engineer", "deep learning", "data scientist", "mlops"),
+    "data_analyst": ("data analyst", "business analyst", "bi analyst", "analytics", "reporting analyst"),
+    "fullstack_developer": ("full stack", "fullstack", "mern", "mean stack", "web developer"),
+}
+
+SALARY_MULTIPLIERS = {
+    "k": 1e3, "l": 1e5, "lpa": 1e5, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+}
+
+_SALARY = re.compile(r"(\d+(?:[.,]\d+)*)\s*(lpa|lakhs?|lacs?|crores?|cr|k|l)?(?![a-z])")
+_SKILL_SEPARATORS = re.compile(r"[,;|\n]")
+_RUN_HEADER = struct.Struct("<HI")
+
+
+def open_text(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    name = path[:-3] if path.endswith(".gz") else path
+    with open_text(path) as f:
+        if name.endswith(".csv"):
+            csv.field_size_limit(16 * 1024 * 1024)
+            yield from csv.DictReader(f)
+        elif name.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif name.endswith(".json"):
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = next((data[key] for key in ("jobs", "postings", "data", "results") if key in data), [])
+            yield from data
+        else:
+            raise ValueError(f"Unsupported posting file type: {path}")
+
+
+def normalize_record(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Posting fields under their canonical names, whatever the dump called them"""
+    keyed = {skills.fold(key): value for key, value in raw.items() if isinstance(key, str)}
+    record = {}
+    for field, aliases in FIELD_ALIASES.items():
+        record[field] = next((keyed[alias] for alias in aliases if keyed.get(alias) not in (None, "")), None)
+    return record
+
+
+def parse_salary(value: Any) -> Optional[Tuple[float, float]]:
+    """(min, max) annual salary from a number or text such as "6-12 LPA" or "₹5,00,000 - ₹8,00,000" """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return (float(value), float(value)) if value > 0 else None
+    text = str(value).lower()
+    matches = [(float(number.replace(",", "")), unit) for number, unit in _SALARY.findall(text)]
+    if not matches:
+        return None
+    # A unit written once ("6-12 LPA") applies to every amount without one
+    default_unit = next((unit for _, unit in reversed(matches) if unit), "")
+    amounts = [amount * SALARY_MULTIPLIERS.get(unit or default_unit, 1.0) for amount, unit in matches]
+    amounts = [amount for amount in amounts if amount > 0]
+    if not amounts:
+        return None
+    return min(amounts[:2]), max(amounts[:2])
+
+
+def parse_date(value: Any) -> Optional[date]:
+    if not value:
+        return None
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+    for fmt in ("%d-%m-%Y", "%d/%m/%Y", "%d %b %Y", "%b %d, %Y"):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_skill_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    names = value if isinstance(value, list) else _SKILL_SEPARATORS.split(str(value))
+    return [str(name).strip() for name in names if str(name).strip()]
+
+
+def classify_career(title: str, found_skills: Iterable[str]) -> Optional[str]:
+    padded = f" {skills.fold(title).replace('_', ' ')} "
+    for career_id, keywords in CAREER_TITLE_KEYWORDS.items():
+        if career_id in CAREER_PATHS and any(f" {keyword} " in padded for keyword in keywords):
+            return career_id
+    found = set(found_skills)
+    best, best_overlap = None, MIN_CAREER_OVERLAP
+    for career_id, path in CAREER_PATHS.items():
+        required = path["required_skills"]
+        overlap = sum(level for skill, level in required.items() if skill in found) / sum(required.values())
+        if overlap >= best_overlap:
+            best, best_overlap = career_id, overlap
+    return best
+
+
+def tokenize_weighted(title: str, description: str, listed_skills: List[str]) -> List[str]:
+    # Repeating the title is a cheap stand-in for a field weight
+    return job_postings.tokenize(title) * TITLE_WEIGHT + job_postings.tokenize(description) \
+        + job_postings.tokenize(" ".join(listed_skills))
+
+
+def _percent_change(recent: float, previous: float) -> Optional[str]:
+    if not previous:
+        return None
+    return f"{(recent / previous - 1) * 100:+.0f}%"
+
+
+class CareerStats:
+    def __init__(self):
+        self.postings = 0
+        self.days = array("q")
+        self.salaries = array("d")
+        self.salary_days = array("q")
+        self.skills: Counter = Counter()
+        self.locations: Counter = Counter()
+
+    def add(self, day: int, salary: Optional[float], found_skills: Iterable[str], location: str) -> None:
+        self.postings += 1
+        self.days.append(day)
+        if salary is not None:
+            self.salaries.append(salary)
+            self.salary_days.append(day)
+        self.skills.update(found_skills)
+        if location:
+            self.locations[location] += 1
+
+    def trends(self, newest: int, window: int) -> Dict[str, Any]:
+        days = np.frombuffer(self.days, dtype=np.int64) if self.days else np.zeros(0, dtype=np.int64)
+        salaries = np.frombuffer(self.salaries, dtype=np.float64) if self.salaries else np.zeros(0)
+        salary_days = np.frombuffer(self.salary_days, dtype=np.int64) if self.salary_days else np.zeros(0, dtype=np.int64)
+        # Day 0 means the posting had no usable date
+        recent = (days > newest - window) & (days > 0)
+        previous = (days > newest - 2 * window) & (days <= newest - window) & (days > 0)
+        recent_pay = salaries[(salary_days > newest - window) & (salary_days > 0)]
+        previous_pay = salaries[(salary_days > newest - 2 * window) & (salary_days <= newest - window) & (salary_days > 0)]
+        percentiles = None
+        if len(salaries):
+            p25, p50, p75, p90 = np.percentile(salaries, [25, 50, 75, 90])
+            percentiles = {"p25": round(p25), "p50": round(p50), "p75": round(p75), "p90": round(p90)}
+        return {
+            "postings": self.postings,
+            "demand_change": _percent_change(int(recent.sum()), int(previous.sum())),
+            "salary_trend": _percent_change(float(np.median(recent_pay)) if len(recent_pay) else 0.0,
+                                            float(np.median(previous_pay)) if len(previous_pay) else 0.0),
+            "salary_percentiles": percentiles,
+            "postings_with_salary": len(salaries),
+            "hot_locations": [location for location, _ in self.locations.most_common(TOP_LOCATIONS)],
+            "skills_in_demand": [skill for skill, _ in self.skills.most_common(TOP_SKILLS_IN_DEMAND)],
+            "hot_skills": [
+                {"skill": skill, "postings": count, "share": round(count / self.postings, 4)}
+                for skill, count in self.skills.most_common(TOP_SKILLS)
+            ],
+        }
+
+
+def _read_run(path: str, run: int) -> Iterator[Tuple[str, int, bytes, bytes]]:
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(_RUN_HEADER.size)
+            if not header:
+                return
+            term_length, count = _RUN_HEADER.unpack(header)
+            term = f.read(term_length).decode("utf-8")
+            yield term, run, f.read(4 * count), f.read(2 * count)
+
+
+class IndexBuilder:
+    def __init__(self, output: str, chunk_size: int = DEFAULT_CHUNK_SIZE, k1: float = job_postings.DEFAULT_K1,
+                 b: float = job_postings.DEFAULT_B, window_days: int = DEFAULT_WINDOW_DAYS):
+        self.output = output
+        self.work = output.rstrip("/\\") + ".building"
+        shutil.rmtree(self.work, ignore_errors=True)
+        os.makedirs(os.path.join(self.work, "runs"))
+        self.chunk_size = chunk_size
+        self.k1 = k1
+        self.b = b
+        self.window_days = window_days
+        self.careers = list(CAREER_PATHS)
+        self.stats = {career_id: CareerStats() for career_id in self.careers}
+        self.newest_day = 0
+        self.docs = open(os.path.join(self.work, "docs.jsonl"), "wb")
+        self.offsets = array("Q", [0])
+        self.lengths = array("I")
+        self.doc_careers = array("B")
+        self.chunk: Dict[str, Tuple[array, array]] = {}
+        self.chunk_documents = 0
+        self.runs: List[str] = []
+
+    @property
+    def documents(self) -> int:
+        return len(self.lengths)
+
+    def add(self, raw: Dict[str, Any]) -> None:
+        record = normalize_record(raw)
+        title = str(record["title"] or "")
+        description = str(record["description"] or "")
+        listed = parse_skill_list(record["skills"])
+        found = {skills.normalize_skill(name) for name in listed} | skills.extract_skills(f"{title}\n{description}")
+        found.discard("")
+        location = str(record["location"] or "").strip()
+        city = location.split(",")[0].strip()
+
+        salary = None
+        if record["salary_min"] is not None or record["salary_max"] is not None:
+            low = parse_salary(record["salary_min"])
+            high = parse_salary(record["salary_max"])
+            bounds = [bound for bound in (low and low[0], high and high[1]) if bound]
+            salary = (min(bounds), max(bounds)) if bounds else None
+        if salary is None:
+            salary = parse_salary(record["salary"])
+        posted = parse_date(record["posted_at"])
+        day = posted.toordinal() if posted else 0
+        self.newest_day = max(self.newest_day, day)
+
+        career_id = classify_career(title, found)
+        if career_id is not None:
+            self.stats[career_id].add(day, (salary[0] + salary[1]) / 2 if salary else None, found, city)
+
+        doc_id = self.documents
+        words = tokenize_weighted(title, description, listed)
+        counts = Counter(words)
+        counts.update(job_postings.skill_terms(found))
+        counts.update(job_postings.location_terms(location))
+        for term, count in counts.items():
+            entry = self.chunk.get(term)
+            if entry is None:
+                entry = self.chunk[term] = (array("I"), array("H"))
+            entry[0].append(doc_id)
+            entry[1].append(min(count, job_postings.MAX_TERM_FREQUENCY))
+
+        stored = {
+            "id": doc_id,
+            "title": title,
+            "company": record["company"],
+            "location": location or None,
+            "salary_min": salary[0] if salary else None,
+            "salary_max": salary[1] if salary else None,
+            "posted_at": posted.isoformat() if posted else None,
+            "url": record["url"],
+            "skills": sorted(found),
+            "career_path_id": career_id,
+        }
+        self.docs.write(json.dumps(stored, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        self.offsets.append(self.docs.tell())
+        self.lengths.append(len(words))
+        self.doc_careers.append(self.careers.index(career_id) if career_id else job_postings.NO_CAREER)
+
+        self.chunk_documents += 1
+        if self.chunk_documents >= self.chunk_size:
+            self._spill()
+
+    def _spill(self) -> None:
+        if not self.chunk:
+            return
+        path = os.path.join(self.work, "runs", f"{len(self.runs):05d}.run")
+        with open(path, "wb") as f:
+            for term in sorted(self.chunk):
+                ids, freqs = self.chunk[term]
+                encoded = term.encode("utf-8")
+                f.write(_RUN_HEADER.pack(len(encoded), len(ids)))
+                f.write(encoded)
+                f.write(ids.tobytes())
+                f.write(freqs.tobytes())
+        self.runs.append(path)
+        self.chunk = {}
+        self.chunk_documents = 0
+
+    def _merge(self) -> Dict[str, List[int]]:
+        """Concatenate each term's lists across runs and store BM25 impacts instead of raw counts.
+
+        Runs hold increasing document ids, so concatenated lists stay sorted.
+        """
+        lengths = np.frombuffer(self.lengths, dtype=np.uint32).astype(np.float32)
+        average_length = float(lengths.mean()) if len(lengths) else 1.0
+        # Length normalization of every document, shared by all terms
+        norms = self.k1 * (1 - self.b + self.b * lengths / max(average_length, 1e-9))
+        terms: Dict[str, List[int]] = {}
+        position = 0
+        with open(os.path.join(self.work, "doc_ids.u32"), "wb") as ids_file, \
+                open(os.path.join(self.work, "impacts.f32"), "wb") as impacts_file:
+            runs = [_read_run(path, index) for index, path in enumerate(self.runs)]
+            for term, group in itertools.groupby(heapq.merge(*runs), key=lambda item: item[0]):
+                parts = list(group)
+                ids = np.frombuffer(b"".join(part[2] for part in parts), dtype=np.uint32)
+                freqs = np.frombuffer(b"".join(part[3] for part in parts), dtype=np.uint16).astype(np.float32)
+                idf = math.log(1 + (self.documents - len(ids) + 0.5) / (len(ids) + 0.5))
+                impacts = (idf * freqs * (self.k1 + 1) / (freqs + norms[ids])).astype(np.float32)
+                ids_file.write(ids.tobytes())
+                impacts_file.write(impacts.tobytes())
+                terms[term] = [position, len(ids)]
+                position += len(ids)
+        return terms
+
+    def finish(self, sources: List[str]) -> Dict[str, Any]:
+        self._spill()
+        self.docs.close()
+        terms = self._merge()
+        shutil.rmtree(os.path.join(self.work, "runs"))
+        for name, values in (("doc_careers.u8", self.doc_careers), ("doc_offsets.u64", self.offsets)):
+            with open(os.path.join(self.work, name), "wb") as f:
+                values.tofile(f)
+        with open(os.path.join(self.work, "terms.json"), "w", encoding="utf-8") as f:
+            json.dump(terms, f, ensure_ascii=False, separators=(",", ":"))
+
+        meta = {
+            "version": job_postings.INDEX_VERSION,
+            "built_at": datetime.utcnow().isoformat(),
+            "sources": [os.path.basename(source) for source in sources],
+            "documents": self.documents,
+            "terms": len(terms),
+            "average_length": (sum(self.lengths) / self.documents) if self.documents else 0.0,
+            "k1": self.k1,
+            "b": self.b,
+            "careers": self.careers,
+            "newest_posting": date.fromordinal(self.newest_day).isoformat() if self.newest_day else None,
+            "window_days": self.window_days,
+            "market_trends": {
+                career_id: stats.trends(self.newest_day, self.window_days) for career_id, stats in self.stats.items()
+            },
+        }
+        with open(os.path.join(self.work, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        self._swap()
+        return meta
+
+    def _swap(self) -> None:
+        """Replace the served index only once the new one is complete"""
+        previous = self.output.rstrip("/\\") + ".previous"
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.exists(self.output):
+            os.replace(self.output, previous)
+        os.replace(self.work, self.output)
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def build(paths: List[str], output: str, chunk_size: int, window_days: int) -> Dict[str, Any]:
+    builder = IndexBuilder(output, chunk_size=chunk_size, window_days=window_days)
+    started = time.perf_counter()
+    skipped = 0
+    for path in paths:
+        for raw in read_records(path):
+            if not isinstance(raw, dict):
+                skipped += 1
+                continue
+            builder.add(raw)
+            if builder.documents % 100000 == 0:
+                print(f"{builder.documents} postings indexed ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+    meta = builder.finish(paths)
+    meta["skipped"] = skipped
+    meta["seconds"] = round(time.perf_counter() - started, 2)
+    return meta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="posting dump files (.csv, .jsonl, .ndjson, .json, optionally .gz)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="index directory")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="postings per sorted run")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS,
+                        help="period compared against the one before it for demand and salary trends")
+    args = parser.parse_args()
+    meta = build(args.paths, args.output, args.chunk_size, args.window_days)
+    print(f"indexed {meta['documents']} postings ({meta['skipped']} skipped), {meta['terms']} terms "
+          f"in {meta['seconds']}s -> {args.output}")
+    for career_id, trends in meta["market_trends"].items():
+        print(f"  {career_id}: {trends['postings']} postings, demand {trends['demand_change']}, "
+              f"median salary {(trends['salary_percentiles'] or {}).get('p50')}")
+
+
+if __name__ == "__main__":
+    main()
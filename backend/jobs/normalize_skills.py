@@ -0,0 +1,103 @@
+"""Rewrite stored skill names to their canonical form.
+
+Run from the backend directory:
+
+    python -m jobs.normalize_skills --dry-run
+    python -m jobs.normalize_skills --batch-size 1000
+    python -m jobs.normalize_skills --start-after <last _id printed>   # resume
+
+Users are walked in ``_id`` order in batches, and only documents whose
+``current_skills`` actually change are written. Each update is conditional on
+the skills still being what was read, so a profile edited while the job runs is
+left alone and simply picked up by the next run. Rewritten users get their
+packed ``skill_vector`` re-encoded in the same update. Skill assessment records
+get their ``skill_name`` rewritten the same way. Running the job twice is
+harmless.
+"""
+import argparse
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from pymongo import UpdateOne
+
+import skill_vectors
+import skills
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+async def normalize_users(db, batch_size: int, dry_run: bool, start_after: Optional[str] = None) -> Dict[str, int]:
+    counts = {"scanned": 0, "changed": 0, "written": 0}
+    last_id = start_after
+    while True:
+        query: Dict[str, Any] = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = await db.users.find(query, {"current_skills": 1}).sort("_id", 1).limit(batch_size).to_list(length=None)
+        if not batch:
+            return counts
+
+        operations = []
+        for user in batch:
+            current = user.get("current_skills") or {}
+            normalized = skills.normalize_skill_levels(current)
+            if normalized != current:
+                vector = await skill_vectors.vector_fields(db, normalized)
+                operations.append(UpdateOne({"_id": user["_id"], "current_skills": current},
+                                            {"$set": {"current_skills": normalized, **vector}}))
+        counts["scanned"] += len(batch)
+        counts["changed"] += len(operations)
+        if operations and not dry_run:
+            result = await db.users.bulk_write(operations, ordered=False)
+            counts["written"] += result.modified_count
+        last_id = batch[-1]["_id"]
+        print(f"users: scanned {counts['scanned']}, changed {counts['changed']}, last _id {last_id}")
+
+
+async def normalize_assessments(db, batch_size: int, dry_run: bool) -> Dict[str, int]:
+    counts = {"scanned": 0, "changed": 0, "written": 0}
+    last_id = None
+    while True:
+        query: Dict[str, Any] = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = await db.skill_assessments.find(query, {"skill_name": 1}).sort("_id", 1).limit(batch_size).to_list(length=None)
+        if not batch:
+            return counts
+
+        operations = []
+        for assessment in batch:
+            name = assessment.get("skill_name")
+            canonical = skills.normalize_skill(name) if isinstance(name, str) else None
+            if canonical and canonical != name:
+                operations.append(UpdateOne({"_id": assessment["_id"], "skill_name": name},
+                                            {"$set": {"skill_name": canonical}}))
+        counts["scanned"] += len(batch)
+        counts["changed"] += len(operations)
+        if operations and not dry_run:
+            result = await db.skill_assessments.bulk_write(operations, ordered=False)
+            counts["written"] += result.modified_count
+        last_id = batch[-1]["_id"]
+
+
+async def run(args: argparse.Namespace) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    db = AsyncIOMotorClient(args.mongo_url)[args.database]
+
+    users = await normalize_users(db, args.batch_size, args.dry_run, args.start_after)
+    assessments = await normalize_assessments(db, args.batch_size, args.dry_run)
+    mode = "would change" if args.dry_run else "changed"
+    print(f"users: {users['scanned']} scanned, {users['changed']} {mode}, {users['written']} written")
+    print(f"skill assessments: {assessments['scanned']} scanned, {assessments['changed']} {mode}, "
+          f"{assessments['written']} written")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--database", default="educursus")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--start-after", help="resume after this user _id")
+    parser.add_argument("--dry-run", action="store_true", help="count changes without writing")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
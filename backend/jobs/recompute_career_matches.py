@@ -0,0 +1,135 @@
+"""Precompute every user's top career matches and skill gaps.
+
+Run from the backend directory, typically nightly:
+
+    python -m jobs.recompute_career_matches
+    python -m jobs.recompute_career_matches --workers 8 --batch-size 2000 --top-k 3
+    python -m jobs.recompute_career_matches --restart   # ignore an interrupted run
+
+Users are streamed in ``_id`` order in batches. Each batch is scored and
+BSON-encoded by ``score_batch`` on a process pool while the next batches are
+read, and the results are written back with one unordered ``bulk_write`` per
+batch. Batches are written in the order they were read, and after each write
+the last ``_id`` is saved in ``job_checkpoints``; a run that is interrupted
+resumes after that ``_id`` the next time the job starts, unless ``--restart``
+is given. Throughput is printed as the job goes.
+
+Stored matches carry a key of the skills and catalog they were computed from,
+so users who edit their skills mid-run are simply served live results until the
+next run.
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import bson
+from bson.raw_bson import RawBSONDocument
+from pymongo import UpdateOne
+
+import career_matching
+
+JOB_NAME = "recompute_career_matches"
+DEFAULT_BATCH_SIZE = 1000
+# Batches queued per worker, so workers never wait on the next read or on a write
+BATCHES_PER_WORKER = 2
+
+
+def score_batch(raw_skills: List[Optional[Dict[str, Any]]], top_k: int) -> List[bytes]:
+    """BSON-encoded ``career_matches`` documents for a batch, computed in a worker process
+
+    Encoding here keeps the parent's share of the work per user to unpickling a
+    bytes object, so it does not become the bottleneck as workers are added.
+    """
+    computed_at = datetime.utcnow()
+    return [bson.encode({**match, "computed_at": computed_at})
+            for match in career_matching.compute_chunk(raw_skills, top_k)]
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+async def load_checkpoint(db, restart: bool) -> Dict[str, Any]:
+    checkpoint = await db.job_checkpoints.find_one({"_id": JOB_NAME})
+    if checkpoint and not checkpoint.get("completed") and not restart:
+        print(f"resuming after _id {checkpoint['last_id']} ({checkpoint['processed']} users already done)")
+        return checkpoint
+    checkpoint = {"_id": JOB_NAME, "started_at": datetime.utcnow(), "last_id": None,
+                  "processed": 0, "completed": False}
+    await db.job_checkpoints.replace_one({"_id": JOB_NAME}, checkpoint, upsert=True)
+    return checkpoint
+
+
+async def recompute(db, workers: int, batch_size: int, top_k: int, restart: bool = False) -> Dict[str, Any]:
+    checkpoint = await load_checkpoint(db, restart)
+    last_read: Optional[str] = checkpoint["last_id"]
+    processed = 0
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    pending: Deque[Tuple[Any, "asyncio.Future"]] = deque()
+    exhausted = False
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while not exhausted and len(pending) < workers * BATCHES_PER_WORKER:
+                query: Dict[str, Any] = {"_id": {"$gt": last_read}} if last_read is not None else {}
+                batch = await db.users.find(query, {"current_skills": 1}).sort("_id", 1).limit(batch_size).to_list(length=None)
+                if not batch:
+                    exhausted = True
+                    break
+                last_read = batch[-1]["_id"]
+                user_ids = [user["_id"] for user in batch]
+                future = loop.run_in_executor(pool, score_batch,
+                                              [user.get("current_skills") for user in batch], top_k)
+                pending.append((user_ids, future))
+            if not pending:
+                break
+
+            user_ids, future = pending.popleft()
+            matches = await future
+            operations = [UpdateOne({"_id": user_id}, {"$set": {"career_matches": RawBSONDocument(match)}})
+                          for user_id, match in zip(user_ids, matches)]
+            await db.users.bulk_write(operations, ordered=False)
+            processed += len(user_ids)
+            await db.job_checkpoints.update_one(
+                {"_id": JOB_NAME},
+                {"$set": {"last_id": user_ids[-1], "updated_at": datetime.utcnow()},
+                 "$inc": {"processed": len(user_ids)}},
+            )
+            elapsed = time.perf_counter() - started
+            print(f"processed {processed} users, {processed / elapsed:.0f} users/sec, last _id {user_ids[-1]}")
+
+    elapsed = time.perf_counter() - started
+    await db.job_checkpoints.update_one({"_id": JOB_NAME},
+                                        {"$set": {"completed": True, "completed_at": datetime.utcnow()}})
+    return {"processed": processed, "seconds": round(elapsed, 3),
+            "users_per_second": round(processed / elapsed, 1) if elapsed else 0.0}
+
+
+async def run(args: argparse.Namespace) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    db = AsyncIOMotorClient(args.mongo_url)[args.database]
+
+    summary = await recompute(db, args.workers, args.batch_size, args.top_k, args.restart)
+    print(f"recomputed {summary['processed']} users in {summary['seconds']}s "
+          f"({summary['users_per_second']} users/sec, {args.workers} workers)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--database", default="educursus")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="worker processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--top-k", type=int, default=career_matching.DEFAULT_TOP_K, help="matches stored per user")
+    parser.add_argument("--restart", action="store_true", help="start over instead of resuming an interrupted run")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
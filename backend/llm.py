@@ -0,0 +1,193 @@
+"""Gateway for every Groq call the API makes.
+
+Each endpoint gets its own model and deadline. Interactive
+endpoints also get request hedging: if the first attempt has not answered by
+the model's observed p95 latency, a second identical request is sent and
+whichever finishes first wins while the other is cancelled. That trims the long
+tail that otherwise goes straight to users.
+"""
+import asyncio
+import inspect
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FAST_MODEL = "llama3-8b-8192"
+LARGE_MODEL = "llama3-70b-8192"
+
+# endpoint -> (model, deadline seconds, hedged)
+ENDPOINT_ROUTES: Dict[str, tuple] = {
+    "assessment-questions": (FAST_MODEL, 8.0, True),
+    "interview-questions": (FAST_MODEL, 10.0, True),
+    "skill-evaluation": (FAST_MODEL, 6.0, True),
+    "personalized-questions": (FAST_MODEL, 12.0, True),
+    "market-insights": (FAST_MODEL, 10.0, False),
+    "career-recommendation": (LARGE_MODEL, 15.0, False),
+    "learning-path": (LARGE_MODEL, 25.0, False),
+}
+DEFAULT_ROUTE = (FAST_MODEL, 10.0, False)
+
+LATENCY_WINDOW = 200
+MIN_SAMPLES_FOR_HEDGING = 20
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_DELAY = 0.05
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies for one model"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _env_route(endpoint: str, route: tuple) -> tuple:
+    """Apply LLM_MODEL_<ENDPOINT> / LLM_DEADLINE_<ENDPOINT> overrides"""
+    suffix = endpoint.upper().replace("-", "_")
+    model = os.getenv(f"LLM_MODEL_{suffix}", route[0])
+    deadline = float(os.getenv(f"LLM_DEADLINE_{suffix}", route[1]))
+    return model, deadline, route[2]
+
+
+class LLMGateway:
+    def __init__(self, client: Any = None, hedging: bool = True, api_key: Optional[str] = None):
+        self.client = client
+        self.hedging = hedging
+        self.api_key = api_key
+        self.routes = {endpoint: _env_route(endpoint, route) for endpoint, route in ENDPOINT_ROUTES.items()}
+        self.latency: Dict[str, LatencyTracker] = {}
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        """Gateway for GROQ_API_KEY; the SDK itself is only imported by connect()"""
+        api_key = os.getenv("GROQ_API_KEY")
+        hedging = os.getenv("LLM_HEDGING", "1") != "0"
+        if not api_key:
+            logger.warning("GROQ_API_KEY not found. Using fallback mock functions.")
+        return cls(None, hedging, api_key)
+
+    def connect(self) -> Any:
+        """Import the Groq SDK and build the client, once"""
+        if self.client is None and self.api_key:
+            try:
+                import groq
+                self.client = groq.AsyncGroq(api_key=self.api_key)
+            except Exception as e:
+                logger.error("Failed to initialize Groq client", extra={"error": str(e)})
+                self.api_key = None
+        return self.client
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None or bool(self.api_key)
+
+    def route(self, endpoint: str) -> tuple:
+        return self.routes.get(endpoint) or _env_route(endpoint, DEFAULT_ROUTE)
+
+    def hedge_delay(self, model: str) -> float:
+        tracker = self.latency.get(model)
+        if not tracker or len(tracker.samples) < MIN_SAMPLES_FOR_HEDGING:
+            return DEFAULT_HEDGE_DELAY
+        return max(MIN_HEDGE_DELAY, tracker.percentile(0.95))
+
+    async def _attempt(self, model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        create = self.connect().chat.completions.create
+        kwargs = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        started = time.monotonic()
+        if inspect.iscoroutinefunction(create):
+            response = await create(**kwargs)
+        else:
+            # Synchronous clients must not block the event loop
+            response = await asyncio.to_thread(create, **kwargs)
+        self.latency.setdefault(model, LatencyTracker()).record(time.monotonic() - started)
+        return response.choices[0].message.content
+
+    async def _hedged(self, model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        primary = asyncio.create_task(self._attempt(model, prompt, temperature, max_tokens))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(model))
+            if not done:
+                self.hedges += 1
+                tasks.add(asyncio.create_task(self._attempt(model, prompt, temperature, max_tokens)))
+
+            # First successful attempt wins; an error only counts once both have failed
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if not primary.done():
+                primary.cancel()
+
+    async def complete(self, endpoint: str, prompt: str, temperature: float = 0.7, max_tokens: int = 1000) -> str:
+        """Completion text for a prompt, routed and time-boxed for the calling endpoint"""
+        if not self.connect():
+            raise RuntimeError("LLM client not configured")
+
+        model, deadline, hedged = self.route(endpoint)
+        self.calls += 1
+        try:
+            if hedged and self.hedging:
+                call = self._hedged(model, prompt, temperature, max_tokens)
+            else:
+                call = self._attempt(model, prompt, temperature, max_tokens)
+            content = await asyncio.wait_for(call, timeout=deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        return content
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "routes": {endpoint: {"model": model, "deadline": deadline, "hedged": hedged}
+                       for endpoint, (model, deadline, hedged) in self.routes.items()},
+            "latency": {
+                model: {
+                    "samples": len(tracker.samples),
+                    "p50_ms": round((tracker.percentile(0.5) or 0) * 1000, 1),
+                    "p95_ms": round((tracker.percentile(0.95) or 0) * 1000, 1),
+                    "p99_ms": round((tracker.percentile(0.99) or 0) * 1000, 1),
+                }
+                for model, tracker in self.latency.items()
+            },
+        }
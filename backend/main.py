@@ -1,28 +1,133 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from pymongo import ReturnDocument, UpdateOne
 from typing import List, Optional, Dict, Any
 import os
 from dotenv import load_dotenv
 import json
 import asyncio
+import time
 from datetime import datetime, timedelta
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import logging
 import uuid
-import groq
-from groq import Groq
+
+import admission
+import ai_cache
+import analytics
+import answer_scoring
+import career_matching
+from catalog import CAREER_PATHS, LEARNING_PROJECTS
+import catalog_search
+import compression
+import dashboard
+import exports
+import history
+import interview_sessions
+import job_postings
+import llm
+import profile_patch
+from interview_scoring import evaluate_interview_answers
+import scheduler
+import seen_questions
+from serialization import fast_json
+import shared_snapshot
+import simulation
+import skill_vectors
+import skills
+import structured_logging
+import warmup
+import write_behind
+from simulation import apply_constraints_to_path, calculate_completion_time
 
 load_dotenv()
 
+structured_logging.configure(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    queue_size=int(os.getenv("LOG_QUEUE_SIZE", str(structured_logging.DEFAULT_QUEUE_SIZE))),
+    repeat_burst=int(os.getenv("LOG_REPEAT_BURST", str(structured_logging.DEFAULT_REPEAT_BURST))),
+    repeat_window=float(os.getenv("LOG_REPEAT_WINDOW_SECONDS", str(structured_logging.DEFAULT_REPEAT_WINDOW_SECONDS))),
+)
+logger = logging.getLogger("educursus")
+
 app = FastAPI(
     title="Educursus Career Guidance API",
     description="AI-powered interactive career guidance platform with gamification",
     version="1.0.0"
 )
 
+# Admission control for the LLM-backed endpoints
+admission_controller = admission.AdmissionController(
+    max_concurrent=int(os.getenv("AI_MAX_CONCURRENT", "16")),
+    max_queue=int(os.getenv("AI_MAX_QUEUE", "64")),
+    queue_timeout=float(os.getenv("AI_QUEUE_TIMEOUT_SECONDS", "5")),
+    rate_multiplier=float(os.getenv("AI_RATE_MULTIPLIER", "1")),
+)
+
+# There is no authentication yet, so the only verified identity is X-User-Id sent by
+# an internal caller (e.g. a gateway that has authenticated the user). Everyone else
+# is rate-limited by client address, read from X-Forwarded-For only when the request
+# came through one of the trusted proxies (a load balancer or reverse proxy)
+AI_TRUSTED_CALLERS = frozenset(
+    host.strip() for host in os.getenv("AI_TRUSTED_CALLERS", "").split(",") if host.strip()
+)
+AI_TRUSTED_PROXIES = frozenset(
+    host.strip() for host in os.getenv("AI_TRUSTED_PROXIES", "").split(",") if host.strip()
+)
+
+def ai_rate_key(request: Request) -> str:
+    """Token bucket key for an /ai/* call; never a value the caller can rotate freely"""
+    peer = request.client.host if request.client else "anonymous"
+    if peer in AI_TRUSTED_CALLERS and request.headers.get("x-user-id"):
+        return f"user:{request.headers['x-user-id']}"
+    return admission.client_address(peer, request.headers.get("x-forwarded-for"), AI_TRUSTED_PROXIES)
+
+def ai_response_cached(request: Request) -> bool:
+    """Whether an /ai/* call will be answered from the response cache without calling Groq"""
+    parts = request.scope["path"].strip("/").split("/")
+    if request.method != "GET" or len(parts) != 3:
+        return False
+    endpoint, argument, params = parts[1], parts[2], request.query_params
+    if endpoint == "assessment-questions":
+        skill_name = skills.normalize_skill(argument) or argument
+        difficulty = params.get("difficulty", "intermediate")
+        # With user_id any of the question set variants may be needed
+        variants = range(max(1, QUESTION_SET_VARIANTS)) if params.get("user_id") else [0]
+        keys = [ai_cache.make_key(endpoint, skill_name, difficulty, *([variant] if variant else []))
+                for variant in variants]
+    elif endpoint == "interview-questions":
+        keys = [ai_cache.make_key(endpoint, argument, params.get("user_level", "intermediate"))]
+    elif endpoint == "market-insights":
+        keys = [ai_cache.make_key(endpoint, argument, params.get("location", "India"))]
+    else:
+        return False
+    return all(response_cache.servable(key) for key in keys)
+
+@app.middleware("http")
+async def admit_ai_requests(request: Request, call_next):
+    """Rate-limit, queue and shed /ai/* calls before they reach Groq"""
+    if not request.url.path.startswith("/ai/") or ai_response_cached(request):
+        # Cached responses never reach Groq, so they cost no tokens and need no slot
+        return await call_next(request)
+    
+    user_key = ai_rate_key(request)
+    try:
+        await admission_controller.acquire(user_key, admission.endpoint_name(request.url.path))
+    except admission.AdmissionRejected as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.reason},
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    try:
+        return await call_next(request)
+    finally:
+        admission_controller.release()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -32,24 +137,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses for clients that accept br or gzip
+app.add_middleware(
+    compression.CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+)
+
+# Request ids and access lines; outermost, so the latency covers every layer above
+app.add_middleware(
+    structured_logging.AccessLogMiddleware,
+    sample_rate=float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1")),
+)
+
 # MongoDB connection
 client = AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017"))
 db = client.educursus
 
-# Groq AI client for real-time features
-groq_api_key = os.getenv("GROQ_API_KEY")
-if groq_api_key:
-    try:
-        groq_client = Groq(api_key=groq_api_key)
-        GROQ_AVAILABLE = True
-    except Exception as e:
-        print(f"Failed to initialize Groq client: {e}")
-        GROQ_AVAILABLE = False
-        groq_client = None
-else:
-    print("GROQ_API_KEY not found. Using fallback mock functions.")
-    GROQ_AVAILABLE = False
-    groq_client = None
+# Groq AI client for real-time features, behind the LLM gateway
+llm_gateway = llm.LLMGateway.from_env()
+
+# Shared cache for the non-personalized AI responses
+response_cache = ai_cache.ResponseCache(
+    ttl=float(os.getenv("AI_CACHE_TTL_SECONDS", str(ai_cache.DEFAULT_TTL_SECONDS))),
+    max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", str(ai_cache.DEFAULT_MAX_ENTRIES))),
+)
 
 # Security
 security = HTTPBearer()
@@ -111,105 +222,41 @@ class MockInterview(BaseModel):
     score: float
     feedback: str
 
-# Mock data for demonstration
-CAREER_PATHS = {
-    "data_analyst": {
-        "name": "Data Analyst",
-        "description": "Transform raw data into actionable insights",
-        "required_skills": {
-            "python": 7,
-            "sql": 8,
-            "excel": 6,
-            "statistics": 7,
-            "data_visualization": 6
-        },
-        "market_demand": 0.85,
-        "salary_range": {"min": 400000, "max": 1200000},
-        "learning_path": [
-            {"skill": "python", "resources": ["Python for Data Science", "Pandas Tutorial"], "time_estimate": 40},
-            {"skill": "sql", "resources": ["SQL Fundamentals", "Advanced SQL"], "time_estimate": 30},
-            {"skill": "statistics", "resources": ["Statistics 101", "Practical Statistics"], "time_estimate": 35}
-        ]
-    },
+class ScenarioGrid(BaseModel):
+    part_time: List[bool] = [False, True]
+    budget_limited: List[bool] = [False, True]
+    remote_only: List[bool] = [False, True]
+    hours_per_week: List[float] = []
+
+class ScheduleBatchRequest(BaseModel):
+    career_path_id: str
+    user_ids: List[str]
+    include_weeks: bool = False
+
+CAREER_PATH_TEMPLATES = simulation.compile_templates(CAREER_PATHS)
+
+# Mock market data - in real app, this would come from job APIs
+MARKET_TRENDS = {
     "fullstack_developer": {
-        "name": "Full Stack Developer",
-        "description": "Build complete web applications from frontend to backend",
-        "required_skills": {
-            "javascript": 8,
-            "react": 7,
-            "nodejs": 7,
-            "python": 6,
-            "database": 6,
-            "git": 5
-        },
-        "market_demand": 0.92,
-        "salary_range": {"min": 600000, "max": 2000000},
-        "learning_path": [
-            {"skill": "javascript", "resources": ["JavaScript ES6+", "Modern JS Patterns"], "time_estimate": 50},
-            {"skill": "react", "resources": ["React Fundamentals", "Advanced React"], "time_estimate": 45},
-            {"skill": "nodejs", "resources": ["Node.js Basics", "Express.js"], "time_estimate": 40}
-        ]
+        "demand_change": "+14%",
+        "salary_trend": "+8%",
+        "hot_locations": ["Bangalore", "Mumbai", "Pune", "Hyderabad"],
+        "skills_in_demand": ["React", "Node.js", "Python", "Cloud"]
+    },
+    "data_analyst": {
+        "demand_change": "+12%",
+        "salary_trend": "+6%",
+        "hot_locations": ["Delhi", "Bangalore", "Chennai", "Mumbai"],
+        "skills_in_demand": ["Python", "SQL", "Tableau", "Power BI"]
     },
     "ml_engineer": {
-        "name": "Machine Learning Engineer",
-        "description": "Build and deploy machine learning systems",
-        "required_skills": {
-            "python": 9,
-            "machine_learning": 8,
-            "deep_learning": 7,
-            "mathematics": 8,
-            "mlops": 6,
-            "cloud": 6
-        },
-        "market_demand": 0.78,
-        "salary_range": {"min": 800000, "max": 2500000},
-        "learning_path": [
-            {"skill": "python", "resources": ["Advanced Python", "Scientific Python"], "time_estimate": 60},
-            {"skill": "machine_learning", "resources": ["ML Fundamentals", "Scikit-learn"], "time_estimate": 70},
-            {"skill": "mathematics", "resources": ["Linear Algebra", "Calculus for ML"], "time_estimate": 80}
-        ]
+        "demand_change": "+18%",
+        "salary_trend": "+12%",
+        "hot_locations": ["Bangalore", "Hyderabad", "Pune", "Mumbai"],
+        "skills_in_demand": ["Python", "TensorFlow", "PyTorch", "MLOps"]
     }
 }
 
-LEARNING_PROJECTS = {
-    "data_analyst": [
-        {
-            "title": "Sales Data Analysis",
-            "description": "Analyze company sales data to identify trends and insights",
-            "difficulty": "beginner",
-            "skills_required": ["python", "pandas", "data_visualization"],
-            "estimated_time": 8,
-            "project_type": "data_analysis"
-        },
-        {
-            "title": "Customer Segmentation",
-            "description": "Use clustering algorithms to segment customers",
-            "difficulty": "intermediate",
-            "skills_required": ["python", "scikit-learn", "statistics"],
-            "estimated_time": 12,
-            "project_type": "machine_learning"
-        }
-    ],
-    "fullstack_developer": [
-        {
-            "title": "Todo App",
-            "description": "Build a full-stack todo application with React and Node.js",
-            "difficulty": "beginner",
-            "skills_required": ["javascript", "react", "nodejs"],
-            "estimated_time": 15,
-            "project_type": "web_development"
-        },
-        {
-            "title": "E-commerce Platform",
-            "description": "Create a complete e-commerce solution with payment integration",
-            "difficulty": "advanced",
-            "skills_required": ["javascript", "react", "nodejs", "database", "payment"],
-            "estimated_time": 40,
-            "project_type": "web_development"
-        }
-    ]
-}
-
 # Utility functions
 def calculate_skill_gap(user_skills: Dict[str, int], required_skills: Dict[str, int]) -> Dict[str, int]:
     """Calculate the gap between user skills and required skills for a career path"""
@@ -234,16 +281,56 @@ def calculate_career_match(user_skills: Dict[str, int], career_path: Dict[str, A
     
     return user_score / total_required
 
+def skill_gap_report(user_skills: Dict[str, int], career_path: Dict[str, Any]) -> Dict[str, Any]:
+    """Gaps, match percentage and missing/strong skills of a user for one career path"""
+    skill_gaps = calculate_skill_gap(user_skills, career_path["required_skills"])
+    career_match = calculate_career_match(user_skills, career_path)
+    
+    return {
+        "skill_gaps": skill_gaps,
+        "career_match_percentage": round(career_match * 100, 2),
+        "missing_skills": [skill for skill, gap in skill_gaps.items() if gap > 0],
+        "strong_skills": [skill for skill, level in user_skills.items() if level >= career_path["required_skills"].get(skill, 0)]
+    }
+
+def user_profile_view(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Public profile fields of a user document, without the password"""
+    return {
+        "user_id": user["_id"],
+        "username": user["username"],
+        "email": user["email"],
+        "interests": user.get("interests", []),
+        "current_skills": user.get("current_skills", {}),
+        "career_goals": user.get("career_goals", []),
+        "level": user.get("level", 1),
+        "experience_points": user.get("experience_points", 0),
+        "badges": user.get("badges", []),
+        "completed_projects": user.get("completed_projects", [])
+    }
+
 # Real-time AI functions using Groq
-async def generate_ai_assessment_questions(skill_name: str, difficulty: str = "intermediate") -> List[Dict[str, Any]]:
-    """Generate real-time assessment questions using Groq AI"""
-    if not GROQ_AVAILABLE or not groq_client:
+async def complete_json(endpoint: str, prompt: str, field: Optional[str] = None, **options) -> Any:
+    """Completion parsed as a JSON object (or its ``field`` list); raises ValueError so a malformed one is never cached"""
+    data = json.loads(await llm_gateway.complete(endpoint, prompt, **options))
+    if not isinstance(data, dict):
+        raise ValueError(f"{endpoint} completion is not a JSON object")
+    if field is None:
+        return data
+    if not isinstance(data.get(field), list):
+        raise ValueError(f"{endpoint} completion has no {field} list")
+    return data[field]
+
+async def generate_ai_assessment_questions(skill_name: str, difficulty: str = "intermediate", variant: int = 0) -> List[Dict[str, Any]]:
+    """Generate real-time assessment questions using Groq AI; each variant is a separately cached set"""
+    if not llm_gateway.available:
         return generate_mock_questions(skill_name, difficulty)
     
+    variant = int(variant)
+    variant_note = f"This is question set {variant + 1}; cover different topics than a typical first set." if variant else ""
     try:
         prompt = f"""
         Generate 5 interactive assessment questions for {skill_name} at {difficulty} level.
-        Each question should be practical and test real-world understanding.
+        Each question should be practical and test real-world understanding. {variant_note}
         Return as JSON with format:
         {{
             "questions": [
@@ -259,30 +346,19 @@ async def generate_ai_assessment_questions(skill_name: str, difficulty: str = "i
         }}
         """
         
-        response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=1000
+        # Parsed inside the producer, so only valid questions are cached
+        return await response_cache.fetch(
+            ai_cache.make_key("assessment-questions", skill_name, difficulty, *([variant] if variant else [])),
+            lambda: complete_json("assessment-questions", prompt, "questions", temperature=0.7, max_tokens=1000),
         )
-        
-        # Parse the response and return questions
-        content = response.choices[0].message.content
-        try:
-            import json
-            data = json.loads(content)
-            return data.get("questions", [])
-        except:
-            # Fallback to mock questions if parsing fails
-            return generate_mock_questions(skill_name, difficulty)
             
     except Exception as e:
-        print(f"Groq API error: {e}")
+        logger.warning("Groq API error", extra={"error": str(e)})
         return generate_mock_questions(skill_name, difficulty)
 
 async def generate_ai_interview_questions(career_path: str, user_level: str = "intermediate") -> List[Dict[str, Any]]:
     """Generate real-time interview questions using Groq AI"""
-    if not GROQ_AVAILABLE or not groq_client:
+    if not llm_gateway.available:
         return generate_mock_interview_questions(career_path, user_level)
     
     try:
@@ -304,28 +380,18 @@ async def generate_ai_interview_questions(career_path: str, user_level: str = "i
         }}
         """
         
-        response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=1500
+        return await response_cache.fetch(
+            ai_cache.make_key("interview-questions", career_path, user_level),
+            lambda: complete_json("interview-questions", prompt, "questions", temperature=0.7, max_tokens=1500),
         )
-        
-        content = response.choices[0].message.content
-        try:
-            import json
-            data = json.loads(content)
-            return data.get("questions", [])
-        except:
-            return generate_mock_interview_questions(career_path, user_level)
             
     except Exception as e:
-        print(f"Groq API error: {e}")
+        logger.warning("Groq API error", extra={"error": str(e)})
         return generate_mock_interview_questions(career_path, user_level)
 
 async def generate_ai_learning_path(user_skills: Dict[str, int], career_goal: str, constraints: Dict[str, Any]) -> Dict[str, Any]:
     """Generate personalized learning path using Groq AI"""
-    if not GROQ_AVAILABLE or not groq_client:
+    if not llm_gateway.available:
         return generate_mock_learning_path(career_goal)
     
     try:
@@ -356,14 +422,7 @@ async def generate_ai_learning_path(user_skills: Dict[str, int], career_goal: st
         }}
         """
         
-        response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.8,
-            max_tokens=2000
-        )
-        
-        content = response.choices[0].message.content
+        content = await llm_gateway.complete("learning-path", prompt, temperature=0.8, max_tokens=2000)
         try:
             import json
             data = json.loads(content)
@@ -372,12 +431,12 @@ async def generate_ai_learning_path(user_skills: Dict[str, int], career_goal: st
             return generate_mock_learning_path(career_goal)
             
     except Exception as e:
-        print(f"Groq API error: {e}")
+        logger.warning("Groq API error", extra={"error": str(e)})
         return generate_mock_learning_path(career_goal)
 
 async def get_real_time_market_insights(career_path: str, location: str = "India") -> Dict[str, Any]:
     """Get real-time market insights using Groq AI"""
-    if not GROQ_AVAILABLE or not groq_client:
+    if not llm_gateway.available:
         return generate_mock_market_insights(career_path)
     
     try:
@@ -396,23 +455,13 @@ async def get_real_time_market_insights(career_path: str, location: str = "India
         }}
         """
         
-        response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.6,
-            max_tokens=1000
+        return await response_cache.fetch(
+            ai_cache.make_key("market-insights", career_path, location),
+            lambda: complete_json("market-insights", prompt, temperature=0.6, max_tokens=1000),
         )
-        
-        content = response.choices[0].message.content
-        try:
-            import json
-            data = json.loads(content)
-            return data
-        except:
-            return generate_mock_market_insights(career_path)
             
     except Exception as e:
-        print(f"Groq API error: {e}")
+        logger.warning("Groq API error", extra={"error": str(e)})
         return generate_mock_market_insights(career_path)
 
 # Fallback mock functions
@@ -491,6 +540,8 @@ async def register_user(user: User):
         # Create user document
         user_dict = user.dict()
         user_dict["_id"] = str(uuid.uuid4())
+        user_dict["current_skills"] = skills.normalize_skill_levels(user.current_skills)
+        user_dict.update(await skill_vectors.vector_fields(db, user_dict["current_skills"]))
         user_dict["created_at"] = datetime.now().isoformat()
         user_dict["level"] = 1
         user_dict["experience_points"] = 0
@@ -550,48 +601,85 @@ async def get_user_profile(user_id: str):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Return user profile without password
-        user_profile = {
-            "user_id": user["_id"],
-            "username": user["username"],
-            "email": user["email"],
-            "interests": user.get("interests", []),
-            "current_skills": user.get("current_skills", {}),
-            "career_goals": user.get("career_goals", []),
-            "level": user.get("level", 1),
-            "experience_points": user.get("experience_points", 0),
-            "badges": user.get("badges", []),
-            "completed_projects": user.get("completed_projects", [])
-        }
-        
-        return user_profile
+        return user_profile_view(user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get profile: {str(e)}")
 
+# Profile fields clients may edit; email changes go through their own flow
+PROFILE_FIELDS = [name for name in UserProfile.model_fields if name != "email"]
+PROFILE_PROJECTION = {name: 1 for name in PROFILE_FIELDS + ["email"]}
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+
+async def save_profile(user: Dict[str, Any], profile: UserProfile) -> Dict[str, Any]:
+    """Write only the profile values that differ from the stored user, skipping the write if none do"""
+    updated = profile.dict()
+    del updated["email"]
+    updated["current_skills"] = skills.normalize_skill_levels(profile.current_skills)
+    stored = {name: user[name] for name in PROFILE_FIELDS if name in user}
+    sets, unsets = profile_patch.diff(stored, updated)
+    extra_sets = {"updated_at": datetime.now().isoformat()}
+    if any(path.split(".", 1)[0] == "current_skills" for path in [*sets, *unsets]):
+        extra_sets.update(await skill_vectors.vector_fields(db, updated["current_skills"]))
+    update = profile_patch.update_document(sets, unsets, extra_sets)
+    if update is None:
+        return {"message": "Profile unchanged", "changed_fields": []}
+    
+    result = await db.users.update_one({"_id": user["_id"]}, update)
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "Profile updated successfully", "changed_fields": sorted([*sets, *unsets])}
+
 @app.put("/auth/profile/{user_id}")
 async def update_user_profile(user_id: str, profile: UserProfile):
     """Update user profile"""
     try:
-        # Update user profile
-        update_data = profile.dict()
-        update_data["updated_at"] = datetime.now().isoformat()
-        
-        # Remove email from update if it's being changed
-        if "email" in update_data:
-            del update_data["email"]
-        
-        result = await db.users.update_one(
-            {"_id": user_id},
-            {"$set": update_data}
-        )
-        
-        if result.modified_count == 0:
+        user = await db.users.find_one({"_id": user_id}, PROFILE_PROJECTION)
+        if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        return {"message": "Profile updated successfully"}
+        return await save_profile(user, profile)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update profile: {str(e)}")
 
+@app.patch("/auth/profile/{user_id}")
+async def patch_user_profile(user_id: str, request: Request):
+    """Partially update a profile with a JSON Merge Patch or, for a list body, a JSON Patch"""
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be JSON")
+    
+    user = await db.users.find_one({"_id": user_id}, PROFILE_PROJECTION)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    current = {name: user[name] for name in PROFILE_PROJECTION if name in user}
+    try:
+        if isinstance(body, list) or request.headers.get("content-type", "").startswith(JSON_PATCH_MEDIA_TYPE):
+            patched = profile_patch.apply_json_patch(current, body)
+        elif isinstance(body, dict):
+            patched = profile_patch.apply_merge_patch(current, body)
+        else:
+            raise profile_patch.PatchError("Body must be a partial profile or a list of JSON Patch operations")
+    except profile_patch.PatchConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except profile_patch.PatchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    unknown = sorted(set(patched) - set(PROFILE_PROJECTION))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown profile fields: {', '.join(unknown)}")
+    if patched.get("email") != user.get("email"):
+        raise HTTPException(status_code=400, detail="Email cannot be changed through the profile API")
+    try:
+        profile = UserProfile(**patched)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    
+    return await save_profile(user, profile)
+
 @app.get("/career-paths")
 async def get_career_paths():
     """Get all available career paths"""
@@ -604,19 +692,101 @@ async def get_career_path(career_id: str):
         raise HTTPException(status_code=404, detail="Career path not found")
     return CAREER_PATHS[career_id]
 
+async def store_skill_vectors(users: List[Dict[str, Any]]) -> None:
+    """Re-encode the packed skills of users as read (``_id`` and ``current_skills``)"""
+    if not users:
+        return
+    vocabulary = await skill_vectors.vocabulary_for(db, (name for user in users for name in user.get("current_skills") or {}))
+    # Only where the skills are still what was read; a concurrent writer stores its own vector
+    await db.users.bulk_write([
+        UpdateOne({"_id": user["_id"], "current_skills": user.get("current_skills")},
+                  {"$set": vocabulary.fields(user.get("current_skills") or {})})
+        for user in users
+    ], ordered=False)
+
+async def refresh_flushed_skill_vectors(records: List[Dict[str, Any]]) -> None:
+    """Re-encode, in one bulk, the users whose buffered skill updates a flush just applied"""
+    user_ids = list(dict.fromkeys(record["query"]["_id"] for record in records
+                                  if record["collection"] == "users" and record["kind"] == "update"))
+    if user_ids:
+        await store_skill_vectors(await db.users.find({"_id": {"$in": user_ids}}, {"current_skills": 1}).to_list(length=None))
+
+# Write-behind buffering for burst inserts and updates; off unless WRITE_BEHIND_DIR is set
+WRITE_BEHIND_DIR = os.getenv("WRITE_BEHIND_DIR", "")
+write_buffer = write_behind.WriteBehindBuffer(
+    db,
+    WRITE_BEHIND_DIR,
+    after_flush=refresh_flushed_skill_vectors,
+    flush_interval=float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_SECONDS", str(write_behind.DEFAULT_FLUSH_INTERVAL))),
+    flush_batch_size=int(os.getenv("WRITE_BEHIND_FLUSH_BATCH_SIZE", str(write_behind.DEFAULT_FLUSH_BATCH_SIZE))),
+    max_depth=int(os.getenv("WRITE_BEHIND_MAX_DEPTH", str(write_behind.DEFAULT_MAX_DEPTH))),
+) if WRITE_BEHIND_DIR else None
+
+async def store_insert(collection: str, document: Dict[str, Any]) -> None:
+    """Insert now, or acknowledge once durably queued when write-behind is on"""
+    if write_buffer is None:
+        await db[collection].insert_one(document)
+        return
+    try:
+        await write_buffer.insert(collection, document)
+    except write_behind.WriteBufferFull:
+        raise HTTPException(status_code=503, detail="Too many writes waiting; retry shortly")
+
+async def store_update(collection: str, query: Dict[str, Any], update: Dict[str, Any]) -> None:
+    if write_buffer is None:
+        await db[collection].update_one(query, update)
+        return
+    try:
+        await write_buffer.update(collection, query, update)
+    except write_behind.WriteBufferFull:
+        raise HTTPException(status_code=503, detail="Too many writes waiting; retry shortly")
+
+@app.on_event("startup")
+async def start_write_buffer():
+    """Replay writes left in the log by a crash, then start flushing"""
+    if write_buffer is not None:
+        replayed = write_buffer.open()
+        if replayed:
+            logger.info("Replaying buffered writes", extra={"writes": replayed})
+        write_buffer.start()
+
+@app.on_event("shutdown")
+async def stop_write_buffer():
+    if write_buffer is not None:
+        await write_buffer.stop()
+
+@app.get("/metrics/write-behind")
+async def get_write_behind_metrics():
+    """Buffer depth, WAL sync and flush latency of the write-behind buffer"""
+    if write_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_buffer.stats()}
+
 @app.post("/skill-assessment")
 async def submit_skill_assessment(assessment: SkillAssessment):
     """Submit a skill assessment result"""
+    skill_name = skills.normalize_skill(assessment.skill_name)
+    if not skill_name:
+        raise HTTPException(status_code=400, detail="Invalid skill name")
+    
     # Store assessment in database
     assessment_dict = assessment.dict()
     assessment_dict["_id"] = str(uuid.uuid4())
-    await db.skill_assessments.insert_one(assessment_dict)
+    assessment_dict["skill_name"] = skill_name
+    await store_insert("skill_assessments", assessment_dict)
     
-    # Update user's current skills
-    await db.users.update_one(
-        {"_id": assessment.user_id},
-        {"$set": {f"current_skills.{assessment.skill_name}": assessment.score}}
-    )
+    # Update user's current skills and re-encode the packed vector from the result;
+    # buffered updates are re-encoded together once the flush has applied them
+    skill_update = {"$set": {f"current_skills.{skill_name}": assessment.score}}
+    if write_buffer is None:
+        updated = await db.users.find_one_and_update(
+            {"_id": assessment.user_id}, skill_update,
+            projection={"current_skills": 1}, return_document=ReturnDocument.AFTER,
+        )
+        if updated:
+            await store_skill_vectors([updated])
+    else:
+        await store_update("users", {"_id": assessment.user_id}, skill_update)
     
     return {"message": "Assessment submitted successfully", "assessment_id": assessment_dict["_id"]}
 
@@ -632,18 +802,10 @@ async def analyze_skill_gaps(user_id: str, career_path_id: str):
         raise HTTPException(status_code=404, detail="Career path not found")
     
     career_path = CAREER_PATHS[career_path_id]
-    user_skills = user.get("current_skills", {})
+    # Profiles written before skill normalization may still use free-form names
+    user_skills = skills.normalize_skill_levels(user.get("current_skills", {}))
     
-    # Calculate gaps
-    skill_gaps = calculate_skill_gap(user_skills, career_path["required_skills"])
-    career_match = calculate_career_match(user_skills, career_path)
-    
-    return {
-        "skill_gaps": skill_gaps,
-        "career_match_percentage": round(career_match * 100, 2),
-        "missing_skills": [skill for skill, gap in skill_gaps.items() if gap > 0],
-        "strong_skills": [skill for skill, level in user_skills.items() if level >= career_path["required_skills"].get(skill, 0)]
-    }
+    return skill_gap_report(user_skills, career_path)
 
 @app.get("/learning-projects/{career_path_id}")
 async def get_learning_projects(career_path_id: str):
@@ -653,6 +815,59 @@ async def get_learning_projects(career_path_id: str):
     
     return {"projects": LEARNING_PROJECTS[career_path_id]}
 
+# Search over learning projects, career path resources and entries added to the catalog_items collection
+catalog_index = catalog_search.CatalogIndex()
+catalog_index.sync(catalog_search.items_from_catalog(CAREER_PATHS, LEARNING_PROJECTS))
+MAX_CATALOG_RESULTS = 100
+
+async def load_catalog_items() -> List[Dict[str, Any]]:
+    items = list(catalog_search.items_from_catalog(CAREER_PATHS, LEARNING_PROJECTS))
+    async for document in db.catalog_items.find({}):
+        items.append(catalog_search.item_from_document(document))
+    return items
+
+async def reindex_catalog() -> Dict[str, int]:
+    return catalog_index.sync(await load_catalog_items())
+
+def catalog_filters(kind: Optional[str], difficulty: Optional[str], project_type: Optional[str],
+                    career_path_id: Optional[str], min_time: Optional[int], max_time: Optional[int]) -> Dict[str, Any]:
+    return {"kind": kind, "difficulty": difficulty, "project_type": project_type,
+            "career_path_id": career_path_id, "min_time": min_time, "max_time": max_time}
+
+@app.get("/catalog/search")
+async def search_catalog(q: str, kind: Optional[str] = None, difficulty: Optional[str] = None,
+                         project_type: Optional[str] = None, career_path_id: Optional[str] = None,
+                         min_time: Optional[int] = None, max_time: Optional[int] = None, limit: int = 20):
+    """Ranked search over learning projects and resources"""
+    if not 1 <= limit <= MAX_CATALOG_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_CATALOG_RESULTS}")
+    return catalog_index.search(q, limit=limit, **catalog_filters(kind, difficulty, project_type, career_path_id, min_time, max_time))
+
+@app.get("/catalog/typeahead")
+async def catalog_typeahead(q: str, kind: Optional[str] = None, difficulty: Optional[str] = None,
+                            project_type: Optional[str] = None, career_path_id: Optional[str] = None,
+                            min_time: Optional[int] = None, max_time: Optional[int] = None, limit: int = 8):
+    """Word completions and matching titles for a partially typed query"""
+    if not 1 <= limit <= MAX_CATALOG_RESULTS:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_CATALOG_RESULTS}")
+    return catalog_index.typeahead(q, limit=limit, **catalog_filters(kind, difficulty, project_type, career_path_id, min_time, max_time))
+
+@app.post("/admin/catalog/reindex")
+async def reindex_catalog_endpoint():
+    """Re-read the catalog and re-index only the entries that changed
+
+    Workers sharing a snapshot cannot change it in place; they publish a new
+    version instead, which the other workers pick up within a second.
+    """
+    try:
+        if attached_snapshot is not None:
+            version = await publish_shared_snapshot(warm_ai=False)
+            return {"message": "Catalog snapshot published", "items": len(catalog_index), "snapshot_version": version}
+        changes = await reindex_catalog()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reindex catalog: {str(e)}")
+    return {"message": "Catalog reindexed", "items": len(catalog_index), **changes}
+
 @app.post("/mock-interview")
 async def start_mock_interview(user_id: str, career_path_id: str):
     """Start a mock interview for a specific career path"""
@@ -675,7 +890,7 @@ async def start_mock_interview(user_id: str, career_path_id: str):
     interview_dict = interview.dict()
     interview_dict["_id"] = str(uuid.uuid4())
     interview_dict["started_at"] = datetime.utcnow()
-    await db.mock_interviews.insert_one(interview_dict)
+    await store_insert("mock_interviews", interview_dict)
     
     return {
         "interview_id": interview_dict["_id"],
@@ -683,11 +898,19 @@ async def start_mock_interview(user_id: str, career_path_id: str):
         "career_path": CAREER_PATHS[career_path_id]["name"]
     }
 
+async def find_stored(collection: str, document_id: str) -> Optional[Dict[str, Any]]:
+    """A document by id, flushing the write-behind buffer first if its insert is still queued"""
+    document = await db[collection].find_one({"_id": document_id})
+    if not document and write_buffer is not None and write_buffer.is_pending(collection, document_id):
+        await write_buffer.flush()
+        document = await db[collection].find_one({"_id": document_id})
+    return document
+
 @app.post("/mock-interview/{interview_id}/submit")
 async def submit_interview_answers(interview_id: str, answers: List[Dict[str, Any]]):
     """Submit answers for a mock interview and get feedback"""
     # Get interview
-    interview = await db.mock_interviews.find_one({"_id": interview_id})
+    interview = await find_stored("mock_interviews", interview_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
@@ -713,32 +936,99 @@ async def submit_interview_answers(interview_id: str, answers: List[Dict[str, An
         "questions": interview["questions"]
     }
 
+# Interview and assessment history, keyset-paginated newest first
+async def history_page(feed: history.HistoryFeed, user_id: str, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    if not 1 <= limit <= history.MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {history.MAX_PAGE_SIZE}")
+    try:
+        return await history.fetch_page(db, feed, user_id, cursor, limit)
+    except history.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/users/{user_id}/mock-interviews")
+async def list_mock_interviews(user_id: str, cursor: Optional[str] = None, limit: int = history.DEFAULT_PAGE_SIZE):
+    """A user's mock interviews, newest first, without questions and answers; pass next_cursor for the next page"""
+    return await history_page(history.INTERVIEWS, user_id, cursor, limit)
+
+@app.get("/users/{user_id}/skill-assessments")
+async def list_skill_assessments(user_id: str, cursor: Optional[str] = None, limit: int = history.DEFAULT_PAGE_SIZE):
+    """A user's skill assessments, newest first; pass next_cursor for the next page"""
+    return await history_page(history.ASSESSMENTS, user_id, cursor, limit)
+
+@app.get("/mock-interview/{interview_id}")
+async def get_mock_interview(interview_id: str):
+    """One mock interview with its questions, answers and feedback"""
+    interview = await find_stored("mock_interviews", interview_id)
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return interview
+
+@app.get("/skill-assessment/{assessment_id}")
+async def get_skill_assessment(assessment_id: str):
+    """One skill assessment result"""
+    assessment = await find_stored("skill_assessments", assessment_id)
+    if not assessment:
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    return assessment
+
+# Job-postings index built offline by jobs.ingest_postings
+POSTINGS_INDEX_PATH = os.getenv("POSTINGS_INDEX_PATH", job_postings.DEFAULT_INDEX_PATH)
+MAX_JOB_SEARCH_RESULTS = 100
+postings_index: Optional[job_postings.PostingsIndex] = None
+
+def load_postings_index(reload: bool = False) -> Optional[job_postings.PostingsIndex]:
+    """The mapped postings index, opened on first use; None until one has been built"""
+    global postings_index
+    if (postings_index is None or reload) and job_postings.index_exists(POSTINGS_INDEX_PATH):
+        previous, postings_index = postings_index, job_postings.PostingsIndex.open(POSTINGS_INDEX_PATH)
+        if previous is not None:
+            previous.close()
+    return postings_index
+
+def current_market_trends() -> Dict[str, Any]:
+    """Trends from the ingested job postings, or the sample data until an index is built"""
+    index = load_postings_index()
+    if index is None:
+        return {"market_trends": MARKET_TRENDS, "source": "sample"}
+    return {
+        "market_trends": index.market_trends,
+        "source": "job_postings",
+        "postings": index.documents,
+        "newest_posting": index.meta["newest_posting"],
+        "built_at": index.meta["built_at"],
+    }
+
 @app.get("/market-trends")
 async def get_market_trends():
     """Get current market trends and job demand"""
-    # Mock market data - in real app, this would come from job APIs
-    trends = {
-        "fullstack_developer": {
-            "demand_change": "+14%",
-            "salary_trend": "+8%",
-            "hot_locations": ["Bangalore", "Mumbai", "Pune", "Hyderabad"],
-            "skills_in_demand": ["React", "Node.js", "Python", "Cloud"]
-        },
-        "data_analyst": {
-            "demand_change": "+12%",
-            "salary_trend": "+6%",
-            "hot_locations": ["Delhi", "Bangalore", "Chennai", "Mumbai"],
-            "skills_in_demand": ["Python", "SQL", "Tableau", "Power BI"]
-        },
-        "ml_engineer": {
-            "demand_change": "+18%",
-            "salary_trend": "+12%",
-            "hot_locations": ["Bangalore", "Hyderabad", "Pune", "Mumbai"],
-            "skills_in_demand": ["Python", "TensorFlow", "PyTorch", "MLOps"]
-        }
-    }
+    return current_market_trends()
+
+@app.get("/jobs/search")
+async def search_jobs(q: str, career_path_id: Optional[str] = None, location: Optional[str] = None, limit: int = 20, offset: int = 0):
+    """Search ingested job postings, ranked by BM25"""
+    index = load_postings_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Job postings index has not been built")
+    if not 1 <= limit <= MAX_JOB_SEARCH_RESULTS or offset < 0:
+        raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_JOB_SEARCH_RESULTS} and offset non-negative")
+    if career_path_id is not None and career_path_id not in CAREER_PATHS:
+        raise HTTPException(status_code=404, detail="Career path not found")
     
-    return {"market_trends": trends}
+    started = time.perf_counter()
+    results = index.search(q, career_path_id=career_path_id, location=location, limit=limit, offset=offset)
+    results["took_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return results
+
+@app.post("/admin/postings-index/reload")
+async def reload_postings_index():
+    """Serve the index most recently built by jobs.ingest_postings"""
+    try:
+        index = load_postings_index(reload=True)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load postings index: {str(e)}")
+    if index is None:
+        raise HTTPException(status_code=404, detail="No postings index found")
+    return {"message": "Postings index loaded", "postings": index.documents, "built_at": index.meta["built_at"]}
 
 @app.post("/career-simulation")
 async def simulate_career_path(
@@ -752,14 +1042,140 @@ async def simulate_career_path(
     
     career_path = CAREER_PATHS[career_path_id]
     
-    # Apply constraints to generate modified learning path
-    modified_path = apply_constraints_to_path(career_path, constraints)
+    # Render the constrained path from the immutable template; the catalog is never modified
+    modified_path = simulation.render_path(CAREER_PATH_TEMPLATES[career_path_id], simulation.build_overlay(constraints))
     
+    try:
+        estimated_completion_time = calculate_completion_time(modified_path, constraints)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
         "original_path": career_path,
         "modified_path": modified_path,
         "constraints_applied": constraints,
-        "estimated_completion_time": calculate_completion_time(modified_path, constraints)
+        "estimated_completion_time": estimated_completion_time
+    }
+
+@app.post("/career-simulation/batch")
+async def simulate_career_scenarios(career_path_id: str, grid: ScenarioGrid):
+    """Compare every combination of constraints for one career path"""
+    if career_path_id not in CAREER_PATH_TEMPLATES:
+        raise HTTPException(status_code=404, detail="Career path not found")
+    
+    # Checked before expanding, so an oversized grid is never built
+    if simulation.scenario_count(grid.part_time, grid.budget_limited, grid.remote_only, grid.hours_per_week) > simulation.MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"Too many scenarios (max {simulation.MAX_SCENARIOS})")
+    scenarios = simulation.scenario_grid(grid.part_time, grid.budget_limited, grid.remote_only, grid.hours_per_week)
+    
+    return {
+        "career_path": CAREER_PATHS[career_path_id]["name"],
+        "scenario_count": len(scenarios),
+        "scenarios": simulation.simulate_scenarios(CAREER_PATH_TEMPLATES[career_path_id], scenarios)
+    }
+
+MAX_SCHEDULE_BATCH = 1000
+
+@app.get("/learning-schedule/{user_id}")
+async def get_learning_schedule(user_id: str, career_path_id: str, include_weeks: bool = True):
+    """Week-by-week plan for a career path using the user's hour budget and current skills"""
+    if career_path_id not in CAREER_PATH_TEMPLATES:
+        raise HTTPException(status_code=404, detail="Career path not found")
+    
+    user = await db.users.find_one({"_id": user_id}, {"password": 0})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    template = CAREER_PATH_TEMPLATES[career_path_id]
+    skill_gaps = calculate_skill_gap(skills.normalize_skill_levels(user.get("current_skills", {})), template.required_skills)
+    return scheduler.schedule_for_user(template, user, skill_gaps, include_weeks)
+
+@app.post("/learning-schedule/batch")
+async def get_learning_schedules(request: ScheduleBatchRequest):
+    """Plans for many users on one career path in a single call"""
+    if request.career_path_id not in CAREER_PATH_TEMPLATES:
+        raise HTTPException(status_code=404, detail="Career path not found")
+    if len(request.user_ids) > MAX_SCHEDULE_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many users (max {MAX_SCHEDULE_BATCH})")
+    
+    template = CAREER_PATH_TEMPLATES[request.career_path_id]
+    projection = {"current_skills": 1, "time_available": 1, "budget_constraints": 1, "experience_level": 1}
+    users = await db.users.find({"_id": {"$in": request.user_ids}}, projection).to_list(length=None)
+    
+    schedules = {}
+    for user in users:
+        skill_gaps = calculate_skill_gap(skills.normalize_skill_levels(user.get("current_skills", {})), template.required_skills)
+        schedules[user["_id"]] = scheduler.schedule_for_user(template, user, skill_gaps, request.include_weeks)
+    
+    return {
+        "career_path": request.career_path_id,
+        "schedules": schedules,
+        "missing_users": [user_id for user_id in request.user_ids if user_id not in schedules]
+    }
+
+DASHBOARD_SECTION_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_SECTION_TIMEOUT_SECONDS", "2"))
+DASHBOARD_AI_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_AI_TIMEOUT_SECONDS", "1.5"))
+DASHBOARD_RECENT_LIMIT = 5
+
+def career_match_reports(user_skills: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Skill gap report for every career path, best match first"""
+    reports = [
+        {"career_path_id": path_id, "name": path["name"], **skill_gap_report(user_skills, path)}
+        for path_id, path in CAREER_PATHS.items()
+    ]
+    reports.sort(key=lambda report: report["career_match_percentage"], reverse=True)
+    return reports
+
+async def recent_documents(collection: str, user_id: str, sort_field: str, projection: Dict[str, int]) -> List[Dict[str, Any]]:
+    cursor = db[collection].find({"user_id": user_id}, projection).sort(sort_field, -1).limit(DASHBOARD_RECENT_LIMIT)
+    return await cursor.to_list(length=DASHBOARD_RECENT_LIMIT)
+
+@app.get("/dashboard/{user_id}")
+async def get_dashboard(user_id: str, career_path_id: Optional[str] = None, include_ai_insights: bool = True, location: str = "India"):
+    """Profile, career matches, trends, projects, recent activity and AI insights in one response"""
+    started = time.perf_counter()
+    user = await db.users.find_one({"_id": user_id}, {"password": 0})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if career_path_id is not None and career_path_id not in CAREER_PATHS:
+        raise HTTPException(status_code=404, detail="Career path not found")
+    sections = {"profile": dashboard.timed(user_profile_view(user), started)}
+
+    section_started = time.perf_counter()
+    user_skills = skills.normalize_skill_levels(user.get("current_skills", {}))
+    # Precomputed by jobs.recompute_career_matches unless the skills changed since
+    matches = career_matching.stored_reports(user, user_skills) or career_match_reports(user_skills)
+    sections["career_matches"] = dashboard.timed(matches, section_started)
+
+    # Focus on the requested path, else the user's first known goal, else the best match
+    goals = [goal for goal in user.get("career_goals", []) if goal in CAREER_PATHS]
+    focus = career_path_id or (goals[0] if goals else matches[0]["career_path_id"])
+    section_started = time.perf_counter()
+    sections["market_trends"] = dashboard.timed(current_market_trends()["market_trends"], section_started)
+    sections["learning_projects"] = dashboard.timed(LEARNING_PROJECTS.get(focus, []), time.perf_counter())
+
+    pending = {
+        "recent_assessments": (
+            recent_documents("skill_assessments", user_id, "timestamp", {"_id": 0, "skill_name": 1, "score": 1, "assessment_type": 1, "timestamp": 1}),
+            DASHBOARD_SECTION_TIMEOUT_SECONDS,
+        ),
+        "recent_interviews": (
+            recent_documents("mock_interviews", user_id, "started_at", {"career_path": 1, "score": 1, "started_at": 1, "completed_at": 1}),
+            DASHBOARD_SECTION_TIMEOUT_SECONDS,
+        ),
+    }
+    if include_ai_insights:
+        # A late answer still finishes in the background and lands in the AI response cache
+        pending["market_insights"] = (get_real_time_market_insights(focus, location), DASHBOARD_AI_TIMEOUT_SECONDS)
+    sections.update(await dashboard.gather_sections(pending))
+
+    return {
+        "user_id": user_id,
+        "focus_career_path": focus,
+        **{name: section["data"] for name, section in sections.items()},
+        "sections": {name: {key: value for key, value in section.items() if key != "data"} for name, section in sections.items()},
+        "partial": any(section["status"] != dashboard.OK for section in sections.values()),
+        "total_ms": round((time.perf_counter() - started) * 1000, 3),
     }
 
 # Helper functions
@@ -806,95 +1222,55 @@ def generate_interview_questions(career_path_id: str) -> List[Dict[str, Any]]:
     
     return questions.get(career_path_id, [])
 
-def evaluate_interview_answers(questions: List[Dict], answers: List[Dict], career_path: str) -> tuple:
-    """Evaluate interview answers and provide feedback"""
-    total_score = 0
-    feedback_points = []
-    
-    for i, (question, answer) in enumerate(zip(questions, answers)):
-        score = 0
-        answer_text = answer.get("answer", "").lower()
-        
-        # Check for expected keywords
-        expected_keywords = question.get("expected_keywords", [])
-        keyword_matches = sum(1 for keyword in expected_keywords if keyword.lower() in answer_text)
-        
-        if keyword_matches > 0:
-            score = min(10, keyword_matches * 2)  # Max 10 points per question
-        
-        total_score += score
-        
-        if score < 5:
-            feedback_points.append(f"Question {i+1}: Consider including more technical details about {', '.join(expected_keywords)}")
-    
-    final_score = (total_score / (len(questions) * 10)) * 100
-    
-    if final_score >= 80:
-        overall_feedback = "Excellent! You demonstrate strong knowledge in this area."
-    elif final_score >= 60:
-        overall_feedback = "Good performance! Focus on the areas mentioned in feedback to improve."
-    else:
-        overall_feedback = "Keep practicing! Review the fundamental concepts and try again."
-    
-    feedback = overall_feedback + "\n\n" + "\n".join(feedback_points)
-    
-    return round(final_score, 2), feedback
+# Seen-question de-duplication
+ASSESSMENT_QUESTION_COUNT = 5
+QUESTION_SET_VARIANTS = int(os.getenv("QUESTION_SET_VARIANTS", "3"))
 
-def apply_constraints_to_path(career_path: Dict, constraints: Dict) -> Dict:
-    """Apply constraints to modify the learning path"""
-    modified_path = career_path.copy()
-    
-    if constraints.get("part_time"):
-        # Increase time estimates for part-time learning
-        for learning_item in modified_path["learning_path"]:
-            learning_item["time_estimate"] = int(learning_item["time_estimate"] * 1.5)
-    
-    if constraints.get("budget_limited"):
-        # Focus on free resources
-        for learning_item in modified_path["learning_path"]:
-            learning_item["resources"] = [f"Free: {resource}" for resource in learning_item["resources"]]
-    
-    if constraints.get("remote_only"):
-        # Add remote work skills
-        modified_path["required_skills"]["remote_collaboration"] = 6
-        modified_path["learning_path"].append({
-            "skill": "remote_collaboration",
-            "resources": ["Remote Work Best Practices", "Digital Collaboration Tools"],
-            "time_estimate": 15
-        })
-    
-    return modified_path
+async def take_unseen_questions(user_id: str, candidates: List[Dict[str, Any]], count: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Prefer questions the user has not been shown yet and remember the ones returned"""
+    count = count or len(candidates)
+    try:
+        seen = await seen_questions.load_seen_questions(db, user_id)
+        questions = seen_questions.pick_unseen(candidates, seen, count)
+        seen.mark(questions)
+        await seen_questions.save_seen_questions(db, user_id, seen)
+        return questions
+    except Exception as e:
+        logger.warning("Seen-question lookup failed", extra={"user_id": user_id, "error": str(e)})
+        return candidates[:count]
 
-def calculate_completion_time(modified_path: Dict, constraints: Dict) -> Dict[str, Any]:
-    """Calculate estimated completion time based on constraints"""
-    total_hours = sum(item["time_estimate"] for item in modified_path["learning_path"])
+async def unseen_assessment_questions(user_id: str, skill_name: str, difficulty: str) -> List[Dict[str, Any]]:
+    """Walk the cached question sets for a skill until enough are new to this user"""
+    try:
+        seen = await seen_questions.load_seen_questions(db, user_id)
+    except Exception as e:
+        logger.warning("Seen-question lookup failed", extra={"user_id": user_id, "error": str(e)})
+        return await generate_ai_assessment_questions(skill_name, difficulty)
     
-    if constraints.get("part_time"):
-        # Assuming 10 hours per week for part-time
-        weeks = total_hours / 10
-        months = weeks / 4.33
-        return {
-            "total_hours": total_hours,
-            "estimated_weeks": round(weeks, 1),
-            "estimated_months": round(months, 1),
-            "learning_pace": "part_time"
-        }
-    else:
-        # Assuming 25 hours per week for full-time
-        weeks = total_hours / 25
-        months = weeks / 4.33
-        return {
-            "total_hours": total_hours,
-            "estimated_weeks": round(weeks, 1),
-            "estimated_months": round(months, 1),
-            "learning_pace": "full_time"
-        }
+    candidates: List[Dict[str, Any]] = []
+    for variant in range(max(1, QUESTION_SET_VARIANTS)):
+        candidates += await generate_ai_assessment_questions(skill_name, difficulty, variant)
+        if sum(1 for question in candidates if not seen.seen(question)) >= ASSESSMENT_QUESTION_COUNT:
+            break
+    
+    questions = seen_questions.pick_unseen(candidates, seen, ASSESSMENT_QUESTION_COUNT)
+    seen.mark(questions)
+    try:
+        await seen_questions.save_seen_questions(db, user_id, seen)
+    except Exception as e:
+        logger.warning("Could not save seen questions", extra={"user_id": user_id, "error": str(e)})
+    return questions
 
 # New Real-time AI Endpoints
 @app.get("/ai/assessment-questions/{skill_name}")
-async def get_ai_assessment_questions(skill_name: str, difficulty: str = "intermediate"):
-    """Get AI-generated assessment questions in real-time"""
-    questions = await generate_ai_assessment_questions(skill_name, difficulty)
+@fast_json("skill_name", "difficulty")
+async def get_ai_assessment_questions(skill_name: str, difficulty: str = "intermediate", user_id: Optional[str] = None):
+    """Get AI-generated assessment questions in real-time, skipping ones user_id has already seen"""
+    skill_name = skills.normalize_skill(skill_name) or skill_name
+    if user_id:
+        questions = await unseen_assessment_questions(user_id, skill_name, difficulty)
+    else:
+        questions = await generate_ai_assessment_questions(skill_name, difficulty)
     return {
         "skill_name": skill_name,
         "difficulty": difficulty,
@@ -903,6 +1279,7 @@ async def get_ai_assessment_questions(skill_name: str, difficulty: str = "interm
     }
 
 @app.get("/ai/interview-questions/{career_path}")
+@fast_json("career_path", "user_level")
 async def get_ai_interview_questions(career_path: str, user_level: str = "intermediate"):
     """Get AI-generated interview questions in real-time"""
     questions = await generate_ai_interview_questions(career_path, user_level)
@@ -914,6 +1291,7 @@ async def get_ai_interview_questions(career_path: str, user_level: str = "interm
     }
 
 @app.post("/ai/learning-path")
+@fast_json("career_goal", "user_skills", "constraints")
 async def generate_ai_learning_path_endpoint(
     user_skills: Dict[str, int],
     career_goal: str,
@@ -930,6 +1308,7 @@ async def generate_ai_learning_path_endpoint(
     }
 
 @app.get("/ai/market-insights/{career_path}")
+@fast_json("career_path", "location")
 async def get_ai_market_insights(career_path: str, location: str = "India"):
     """Get real-time AI market insights"""
     insights = await get_real_time_market_insights(career_path, location)
@@ -941,13 +1320,14 @@ async def get_ai_market_insights(career_path: str, location: str = "India"):
     }
 
 @app.post("/ai/career-recommendation")
+@fast_json("user_skills", "interests", "experience_level")
 async def get_ai_career_recommendation(
     user_skills: Dict[str, int],
     interests: List[str],
     experience_level: str = "beginner"
 ):
     """Get AI-powered career recommendations based on skills and interests"""
-    if not GROQ_AVAILABLE or not groq_client:
+    if not llm_gateway.available:
         return {
             "user_skills": user_skills,
             "interests": interests,
@@ -989,14 +1369,7 @@ async def get_ai_career_recommendation(
         }}
         """
         
-        response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=1500
-        )
-        
-        content = response.choices[0].message.content
+        content = await llm_gateway.complete("career-recommendation", prompt, temperature=0.7, max_tokens=1500)
         try:
             import json
             data = json.loads(content)
@@ -1025,7 +1398,7 @@ async def get_ai_career_recommendation(
             }
             
     except Exception as e:
-        print(f"Groq API error: {e}")
+        logger.warning("Groq API error", extra={"error": str(e)})
         return {
             "user_skills": user_skills,
             "interests": interests,
@@ -1042,28 +1415,45 @@ async def get_ai_career_recommendation(
             "generated_at": datetime.now().isoformat()
         }
 
+def fallback_skill_evaluation(user_answer: str, expected_answer: Optional[str] = None) -> Dict[str, Any]:
+    """Grade locally by similarity to the expected answer when the LLM cannot be used.
+
+    The question text is never the reference: an answer echoing it would score
+    full marks. Without an expected answer the neutral placeholder is returned.
+    """
+    if expected_answer and answer_scoring.available():
+        return answer_scoring.evaluate_answer(expected_answer, user_answer)
+    return {
+        "score": "7/10",
+        "feedback": "Good understanding shown",
+        "strengths": ["Clear explanation"],
+        "areas_for_improvement": ["Could add more examples"],
+        "suggestions": ["Practice with real scenarios"]
+    }
+
 @app.post("/ai/skill-evaluation")
+@fast_json("skill_name", "question_context", "user_answer")
 async def evaluate_skill_with_ai(
     skill_name: str,
     user_answer: str,
-    question_context: str
+    question_context: str,
+    grader: str = "ai",
+    expected_answer: Optional[str] = None
 ):
-    """Evaluate user's skill answer using AI"""
-    if not GROQ_AVAILABLE or not groq_client:
-        return {
+    """Evaluate user's skill answer using AI, or locally against expected_answer with grader=local"""
+    if grader == "local" and not expected_answer:
+        raise HTTPException(status_code=400, detail="Local grading requires expected_answer")
+    if grader == "local" or not llm_gateway.available:
+        result = {
             "skill_name": skill_name,
             "question_context": question_context,
             "user_answer": user_answer,
-            "evaluation": {
-                "score": "7/10",
-                "feedback": "Good understanding shown",
-                "strengths": ["Clear explanation"],
-                "areas_for_improvement": ["Could add more examples"],
-                "suggestions": ["Practice with real scenarios"]
-            },
-            "evaluated_at": datetime.now().isoformat(),
-            "note": "Using fallback data - Groq not available"
+            "evaluation": fallback_skill_evaluation(user_answer, expected_answer),
+            "evaluated_at": datetime.now().isoformat()
         }
+        if grader != "local":
+            result["note"] = "Using fallback data - Groq not available"
+        return result
     
     try:
         prompt = f"""
@@ -1081,14 +1471,7 @@ async def evaluate_skill_with_ai(
         }}
         """
         
-        response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.6,
-            max_tokens=1000
-        )
-        
-        content = response.choices[0].message.content
+        content = await llm_gateway.complete("skill-evaluation", prompt, temperature=0.6, max_tokens=1000)
         try:
             import json
             data = json.loads(content)
@@ -1104,33 +1487,44 @@ async def evaluate_skill_with_ai(
                 "skill_name": skill_name,
                 "question_context": question_context,
                 "user_answer": user_answer,
-                "evaluation": {
-                    "score": "7/10",
-                    "feedback": "Good understanding shown",
-                    "strengths": ["Clear explanation"],
-                    "areas_for_improvement": ["Could add more examples"],
-                    "suggestions": ["Practice with real scenarios"]
-                },
+                "evaluation": fallback_skill_evaluation(user_answer, expected_answer),
                 "evaluated_at": datetime.now().isoformat()
             }
             
     except Exception as e:
-        print(f"Groq API error: {e}")
+        logger.warning("Groq API error", extra={"error": str(e)})
         return {
             "skill_name": skill_name,
             "question_context": question_context,
             "user_answer": user_answer,
-            "evaluation": {
-                "score": "7/10",
-                "feedback": "Good understanding shown",
-                "strengths": ["Clear explanation"],
-                "areas_for_improvement": ["Could add more examples"],
-                "suggestions": ["Practice with real scenarios"]
-            },
+            "evaluation": fallback_skill_evaluation(user_answer, expected_answer),
             "evaluated_at": datetime.now().isoformat()
         }
 
+class AnswerToScore(BaseModel):
+    expected_answer: str
+    answer: str
+
+MAX_SCORING_BATCH = 1000
+
+@app.post("/answers/score")
+async def score_answers_locally(answers: List[AnswerToScore]):
+    """First-pass grading of many answers against their expected answers in one batch"""
+    if len(answers) > MAX_SCORING_BATCH:
+        raise HTTPException(status_code=400, detail=f"Too many answers (max {MAX_SCORING_BATCH})")
+    if not answer_scoring.available():
+        raise HTTPException(status_code=503, detail="Local answer scoring requires scikit-learn")
+    similarities = answer_scoring.similarities([a.expected_answer for a in answers], [a.answer for a in answers])
+    return {
+        "scores": [
+            {"score": answer_scoring.similarity_to_score(similarity), "similarity": round(similarity, 4)}
+            for similarity in similarities
+        ],
+        "max_score": answer_scoring.MAX_SCORE
+    }
+
 @app.post("/ai/personalized-questions")
+@fast_json("user_id", "user_skills", "user_interests", "experience_level")
 async def get_personalized_questions(
     user_id: str,
     career_interest: str = None,
@@ -1143,12 +1537,14 @@ async def get_personalized_questions(
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        user_skills = user.get("current_skills", {})
+        user_skills = skills.normalize_skill_levels(user.get("current_skills", {}))
         user_interests = user.get("interests", [])
         experience_level = user.get("experience_level", "beginner")
+        if skill_focus:
+            skill_focus = skills.normalize_skill(skill_focus) or skill_focus
         
         # Generate personalized questions based on user profile
-        if not GROQ_AVAILABLE or not groq_client:
+        if not llm_gateway.available:
             return generate_personalized_mock_questions(user_skills, user_interests, experience_level, career_interest, skill_focus)
         
         try:
@@ -1187,14 +1583,7 @@ async def get_personalized_questions(
             }}
             """
             
-            response = groq_client.chat.completions.create(
-                model="llama3-8b-8192",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.8,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content
+            content = await llm_gateway.complete("personalized-questions", prompt, temperature=0.8, max_tokens=2000)
             try:
                 import json
                 data = json.loads(content)
@@ -1203,7 +1592,7 @@ async def get_personalized_questions(
                     "user_skills": user_skills,
                     "user_interests": user_interests,
                     "experience_level": experience_level,
-                    "questions": data.get("questions", []),
+                    "questions": await take_unseen_questions(user_id, data.get("questions", [])),
                     "personalized_insights": data.get("personalized_insights", ""),
                     "recommendations": data.get("recommendations", []),
                     "generated_at": datetime.now().isoformat()
@@ -1212,7 +1601,7 @@ async def get_personalized_questions(
                 return generate_personalized_mock_questions(user_skills, user_interests, experience_level, career_interest, skill_focus)
                 
         except Exception as e:
-            print(f"Groq API error: {e}")
+            logger.warning("Groq API error", extra={"error": str(e)})
             return generate_personalized_mock_questions(user_skills, user_interests, experience_level, career_interest, skill_focus)
             
     except Exception as e:
@@ -1288,6 +1677,350 @@ def generate_personalized_mock_questions(user_skills, user_interests, experience
         "note": "Using fallback data - Groq not available"
     }
 
+# Cohort Analytics Endpoints
+ANALYTICS_REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "900"))
+
+@app.on_event("startup")
+async def start_analytics_refresh():
+    """Keep the materialized cohort views fresh in the background"""
+    if ANALYTICS_REFRESH_SECONDS > 0:
+        app.state.analytics_task = asyncio.create_task(
+            analytics.run_refresh_loop(db, CAREER_PATHS, ANALYTICS_REFRESH_SECONDS)
+        )
+
+@app.on_event("shutdown")
+async def stop_analytics_refresh():
+    task = getattr(app.state, "analytics_task", None)
+    if task:
+        task.cancel()
+
+@app.get("/analytics/cohort-stats")
+async def get_cohort_stats(cohort: Optional[str] = None):
+    """Get skill distributions, career match and interview score histograms for a cohort"""
+    try:
+        return await analytics.read_cohort_stats(db, cohort)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to read cohort stats: {str(e)}")
+
+@app.post("/analytics/refresh")
+async def refresh_cohort_stats():
+    """Recompute the materialized cohort views now"""
+    try:
+        refreshed_at = await analytics.refresh_cohort_views(db, CAREER_PATHS)
+        return {"message": "Cohort views refreshed", "refreshed_at": refreshed_at.isoformat()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to refresh cohort stats: {str(e)}")
+
+# Live Interview Sessions
+interview_manager = interview_sessions.InterviewSessionManager(
+    db,
+    generate_interview_questions,
+    ttl_seconds=float(os.getenv("INTERVIEW_SESSION_TTL_SECONDS", str(interview_sessions.DEFAULT_TTL_SECONDS))),
+    flush_interval=float(os.getenv("INTERVIEW_FLUSH_INTERVAL_SECONDS", str(interview_sessions.DEFAULT_FLUSH_INTERVAL))),
+)
+app.mount("/ws", interview_sessions.create_socket_app(interview_manager, ["http://localhost:3000"]))
+
+@app.on_event("startup")
+async def start_interview_sessions():
+    interview_manager.start()
+
+@app.on_event("shutdown")
+async def stop_interview_sessions():
+    """Flush every live session before the worker exits"""
+    await interview_manager.stop()
+
+@app.get("/interview-sessions/stats")
+async def get_interview_session_stats():
+    """Live session counts and write-behind flush statistics"""
+    return interview_manager.stats()
+
+@app.get("/metrics/admission")
+async def get_admission_metrics():
+    """Queue depth, in-flight AI calls and rejection counts"""
+    return admission_controller.metrics()
+
+@app.get("/metrics/llm")
+async def get_llm_metrics():
+    """Model routing, hedging and latency statistics for Groq calls"""
+    return llm_gateway.stats()
+
+# Startup warm-up and health checks
+startup_warmup = warmup.Warmup()
+
+@startup_warmup.step("database", required=True)
+async def warm_database():
+    """Wait until MongoDB answers; retried so a slow replica does not fail readiness for good"""
+    delay = 0.5
+    while True:
+        try:
+            await db.command("ping")
+            return
+        except Exception as e:
+            logger.warning("MongoDB not reachable yet", extra={"error": str(e), "retry_in_s": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10.0)
+
+@startup_warmup.step("skill-vocabulary")
+async def warm_skill_vocabulary():
+    await skill_vectors.load_vocabulary(db)
+
+@startup_warmup.step("history-indexes")
+async def warm_history_indexes():
+    await history.ensure_indexes(db)
+
+@startup_warmup.step("llm-client")
+async def warm_llm_client():
+    await asyncio.to_thread(llm_gateway.connect)
+
+startup_warmup.preload("parquet-export", "pyarrow", "pyarrow.parquet")
+
+@startup_warmup.step("postings-index")
+async def warm_postings_index():
+    await asyncio.to_thread(load_postings_index)
+
+CATALOG_WARM_BATCH = 500
+
+@startup_warmup.step("catalog-index")
+async def warm_catalog_index():
+    if attached_snapshot is not None:
+        # Built and scored by the snapshot's publisher
+        return
+    await reindex_catalog()
+    # Score every word up front so no first typeahead pays for it; yield to requests between batches
+    terms = catalog_index.terms()
+    for start in range(0, len(terms), CATALOG_WARM_BATCH):
+        catalog_index.warm_terms(terms[start:start + CATALOG_WARM_BATCH])
+        await asyncio.sleep(0)
+
+@startup_warmup.step("answer-scoring")
+async def warm_answer_scoring():
+    await asyncio.to_thread(answer_scoring.available)
+
+@app.on_event("startup")
+async def start_warmup():
+    startup_warmup.start()
+
+@app.on_event("shutdown")
+async def stop_warmup():
+    startup_warmup.stop()
+
+# AI response cache warm-up
+AI_WARMUP_INTERVAL_SECONDS = float(os.getenv("AI_WARMUP_INTERVAL_SECONDS", "600"))
+AI_WARMUP_CONCURRENCY = int(os.getenv("AI_WARMUP_CONCURRENCY", "4"))
+AI_WARMUP_TOP_KEYS = int(os.getenv("AI_WARMUP_TOP_KEYS", "50"))
+
+AI_WARMUP_PRODUCERS = {
+    "assessment-questions": generate_ai_assessment_questions,
+    "interview-questions": generate_ai_interview_questions,
+    "market-insights": get_real_time_market_insights,
+}
+
+def configured_warmup_keys() -> List[ai_cache.CacheKey]:
+    """AI_WARMUP_KEYS as a JSON list of [endpoint, arg, ...], or the default hot set"""
+    configured = os.getenv("AI_WARMUP_KEYS")
+    if configured:
+        try:
+            return [ai_cache.make_key(*entry) for entry in json.loads(configured)]
+        except (TypeError, ValueError) as e:
+            logger.warning("Ignoring invalid AI_WARMUP_KEYS, warming the default keys", extra={"error": str(e)})
+
+    keys = [ai_cache.make_key("assessment-questions", "python", "intermediate")]
+    for career_path in CAREER_PATHS:
+        keys.append(ai_cache.make_key("interview-questions", career_path, "intermediate"))
+        keys.append(ai_cache.make_key("market-insights", career_path, "India"))
+    return keys
+
+async def warm_ai_cache():
+    """Generate the configured and most requested responses before users ask for them"""
+    if not llm_gateway.available:
+        response_cache.warmup["state"] = "disabled"
+        return
+    try:
+        logged = await asyncio.wait_for(ai_cache.load_access_log(db, AI_WARMUP_TOP_KEYS), timeout=5)
+    except Exception as e:
+        logger.warning("Could not read the AI access log", extra={"error": str(e)})
+        logged = []
+    keys = configured_warmup_keys() + logged + response_cache.hot_keys(AI_WARMUP_TOP_KEYS)
+    # Anything expiring before the next pass is regenerated now
+    await ai_cache.warm(response_cache, keys, AI_WARMUP_PRODUCERS,
+                        concurrency=AI_WARMUP_CONCURRENCY, horizon=AI_WARMUP_INTERVAL_SECONDS)
+
+async def run_ai_cache_warmup_loop():
+    while True:
+        # With a shared snapshot the publisher warms once for every worker
+        if attached_snapshot is None:
+            await warm_ai_cache()
+        try:
+            await ai_cache.save_access_log(db, response_cache)
+        except Exception as e:
+            logger.warning("Could not save the AI access log", extra={"error": str(e)})
+        if AI_WARMUP_INTERVAL_SECONDS <= 0:
+            return
+        await asyncio.sleep(AI_WARMUP_INTERVAL_SECONDS)
+
+@app.on_event("startup")
+async def start_ai_cache_warmup():
+    """Runs in the background; readiness never waits for it"""
+    app.state.ai_cache_task = asyncio.create_task(run_ai_cache_warmup_loop())
+
+@app.on_event("shutdown")
+async def stop_ai_cache_warmup():
+    task = getattr(app.state, "ai_cache_task", None)
+    if task:
+        task.cancel()
+    try:
+        await ai_cache.save_access_log(db, response_cache)
+    except Exception as e:
+        logger.warning("Could not save the AI access log", extra={"error": str(e)})
+
+@app.get("/metrics/ai-cache")
+async def get_ai_cache_metrics():
+    """Hit rate, size and warm-up progress of the AI response cache"""
+    return response_cache.stats()
+
+# Catalog index, career matrix and AI responses built once and shared by every worker on the host
+SHARED_SNAPSHOT_DIR = os.getenv("SHARED_SNAPSHOT_DIR", "")
+SHARED_SNAPSHOT_CHECK_SECONDS = float(os.getenv("SHARED_SNAPSHOT_CHECK_SECONDS", str(shared_snapshot.DEFAULT_CHECK_INTERVAL)))
+snapshot_store = (shared_snapshot.SnapshotStore(SHARED_SNAPSHOT_DIR, SHARED_SNAPSHOT_CHECK_SECONDS)
+                  if SHARED_SNAPSHOT_DIR else None)
+attached_snapshot: Optional[shared_snapshot.Snapshot] = None
+
+def attach_shared_snapshot() -> bool:
+    """Serve from the newest published snapshot; True if a new version was attached"""
+    global catalog_index, attached_snapshot
+    snapshot = snapshot_store.current() if snapshot_store is not None else None
+    if snapshot is None or snapshot is attached_snapshot:
+        return False
+    meta = snapshot.meta
+    catalog_index = catalog_search.FrozenCatalogIndex(snapshot.section("catalog"), meta["catalog"])
+    if not career_matching.matrix.use_levels(snapshot.arrays["career.levels"], meta["career"]["catalog_key"]):
+        logger.warning("Shared career matrix was built from another catalog; keeping the local one",
+                       extra={"snapshot_version": snapshot.version})
+    response_cache.shared = shared_snapshot.SharedResponses(meta["responses"], snapshot.arrays["responses"])
+    attached_snapshot = snapshot
+    logger.info("Attached shared snapshot", extra={"snapshot_version": snapshot.version, "bytes": snapshot.size})
+    return True
+
+async def publish_shared_snapshot(warm_ai: bool = True) -> int:
+    """Build the shared state from the database, publish it as a new version and attach to it"""
+    index = catalog_search.CatalogIndex()
+    index.sync(await load_catalog_items())
+    catalog_arrays, catalog_meta = await asyncio.to_thread(catalog_search.freeze, index)
+    if warm_ai:
+        await asyncio.to_thread(llm_gateway.connect)
+        await warm_ai_cache()
+    responses = {key: (expires_at, value) for key, expires_at, value in
+                 (response_cache.shared.entries() if response_cache.shared is not None else ())}
+    responses.update((key, (expires_at, value)) for key, expires_at, value in response_cache.export())
+    response_index, response_blob = shared_snapshot.pack_responses(
+        [(key, expires_at, value) for key, (expires_at, value) in responses.items()])
+
+    arrays = {f"catalog.{name}": array for name, array in catalog_arrays.items()}
+    arrays["career.levels"] = career_matching.matrix.levels
+    arrays["responses"] = response_blob
+    meta = {
+        "published_at": datetime.utcnow().isoformat(),
+        "publisher_pid": os.getpid(),
+        "catalog": catalog_meta,
+        "career": {"catalog_key": career_matching.matrix.catalog_key},
+        "responses": response_index,
+    }
+    version = await asyncio.to_thread(snapshot_store.publish, meta, arrays)
+    attach_shared_snapshot()
+    return version
+
+async def run_shared_snapshot_watch_loop():
+    while True:
+        await asyncio.sleep(SHARED_SNAPSHOT_CHECK_SECONDS)
+        try:
+            attach_shared_snapshot()
+        except Exception:
+            logger.exception("Could not attach the shared snapshot")
+
+if snapshot_store is not None:
+    try:
+        attach_shared_snapshot()
+    except Exception:
+        logger.exception("Could not attach the shared snapshot; building state locally")
+
+@app.on_event("startup")
+async def start_shared_snapshot_watch():
+    if snapshot_store is not None:
+        app.state.shared_snapshot_task = asyncio.create_task(run_shared_snapshot_watch_loop())
+
+@app.on_event("shutdown")
+async def stop_shared_snapshot_watch():
+    task = getattr(app.state, "shared_snapshot_task", None)
+    if task:
+        task.cancel()
+
+@app.get("/metrics/shared-snapshot")
+async def get_shared_snapshot_metrics():
+    """Which snapshot version this worker serves from"""
+    if snapshot_store is None:
+        return {"enabled": False}
+    if attached_snapshot is None:
+        return {"enabled": True, "attached": False}
+    return {
+        "enabled": True,
+        "attached": True,
+        "version": attached_snapshot.version,
+        "published_at": attached_snapshot.meta.get("published_at"),
+        "bytes": attached_snapshot.size,
+        "catalog_items": len(catalog_index),
+        "responses": len(response_cache.shared),
+        "shared_hits": response_cache.shared_hits,
+    }
+
+@app.on_event("startup")
+async def start_logging():
+    structured_logging.start()
+
+@app.on_event("shutdown")
+async def stop_logging():
+    """Registered last, so it writes out what the other shutdown hooks logged"""
+    structured_logging.stop()
+
+@app.get("/metrics/logging")
+async def get_logging_metrics():
+    """Queued, dropped and rate-limited log records"""
+    return structured_logging.stats()
+
+@app.get("/health/live")
+async def liveness():
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Ready once required warm-up steps finished; also reports the optional ones"""
+    status = startup_warmup.status()
+    status["ai_cache_warmup"] = dict(response_cache.warmup)
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+# Admin Export Endpoints
+@app.get("/admin/export/{collection}")
+async def export_collection(collection: str, format: str = "csv", batch_size: int = exports.DEFAULT_BATCH_SIZE):
+    """Stream a full export of users, skill assessments or mock interviews"""
+    if collection not in exports.EXPORT_COLUMNS:
+        raise HTTPException(status_code=404, detail="Collection not exportable")
+    if format not in exports.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    if format == "parquet":
+        try:
+            import pyarrow
+        except ImportError:
+            raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+
+    batch_size = max(1, min(batch_size, exports.MAX_BATCH_SIZE))
+    cursor = exports.open_export_cursor(db, collection, batch_size)
+    filename = f"{collection}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{format}"
+
+    return StreamingResponse(
+        exports.stream_export(cursor, collection, format, batch_size),
+        media_type=exports.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8002)
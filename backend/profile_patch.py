@@ -0,0 +1,164 @@
+"""Partial profile updates as minimal MongoDB update documents.
+
+A client sends either a JSON Merge Patch (RFC 7396: a partial document, where
+``null`` removes a key) or a JSON Patch (RFC 6902: a list of operations on
+JSON Pointer paths). The patch is applied to a copy of the stored profile, and
+``diff`` compares the result with what is stored to produce dotted-path
+``$set``/``$unset`` operations for only the values that actually changed. One
+changed skill level becomes ``{"$set": {"current_skills.python": 7}}`` rather
+than a rewrite of the whole map, and a patch that changes nothing produces no
+update at all, so saving an unchanged profile costs a read and no write.
+"""
+import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class PatchError(ValueError):
+    """The patch is malformed or cannot be applied to the document"""
+
+
+class PatchConflict(PatchError):
+    """A JSON Patch ``test`` operation did not hold"""
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def _pointer(path: Any) -> List[str]:
+    if not isinstance(path, str) or (path and not path.startswith("/")):
+        raise PatchError(f"Invalid JSON Pointer {path!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path.split("/")[1:]]
+
+
+def _resolve(document: Any, parts: List[str], path: str) -> Tuple[Any, str]:
+    """Container holding the last part of ``parts``, and that part"""
+    if not parts:
+        raise PatchError("Operations on the whole document are not supported")
+    container = document
+    for part in parts[:-1]:
+        if isinstance(container, dict) and part in container:
+            container = container[part]
+        elif isinstance(container, list) and part.isdigit() and int(part) < len(container):
+            container = container[int(part)]
+        else:
+            raise PatchError(f"Path {path} does not exist")
+    return container, parts[-1]
+
+
+def _get(document: Any, path: str) -> Any:
+    container, key = _resolve(document, _pointer(path), path)
+    if isinstance(container, dict) and key in container:
+        return container[key]
+    if isinstance(container, list) and key.isdigit() and int(key) < len(container):
+        return container[int(key)]
+    raise PatchError(f"Path {path} does not exist")
+
+
+def _add(document: Any, path: str, value: Any) -> None:
+    container, key = _resolve(document, _pointer(path), path)
+    if isinstance(container, dict):
+        container[key] = value
+    elif isinstance(container, list):
+        if key == "-":
+            container.append(value)
+        elif key.isdigit() and int(key) <= len(container):
+            container.insert(int(key), value)
+        else:
+            raise PatchError(f"Invalid list index in {path}")
+    else:
+        raise PatchError(f"Path {path} does not exist")
+
+
+def _remove(document: Any, path: str) -> Any:
+    value = _get(document, path)
+    container, key = _resolve(document, _pointer(path), path)
+    if isinstance(container, dict):
+        del container[key]
+    else:
+        del container[int(key)]
+    return value
+
+
+def apply_json_patch(document: Dict[str, Any], operations: Any) -> Dict[str, Any]:
+    if not isinstance(operations, list):
+        raise PatchError("A JSON Patch must be a list of operations")
+    result = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or "op" not in operation or "path" not in operation:
+            raise PatchError("Each operation needs an 'op' and a 'path'")
+        op, path = operation["op"], operation["path"]
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"'{op}' operation on {path} needs a 'value'")
+        if op in ("move", "copy") and "from" not in operation:
+            raise PatchError(f"'{op}' operation on {path} needs a 'from'")
+
+        if op == "add":
+            _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(result, path)
+        elif op == "replace":
+            _remove(result, path)
+            _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            _add(result, path, _remove(result, operation["from"]))
+        elif op == "copy":
+            _add(result, path, copy.deepcopy(_get(result, operation["from"])))
+        elif op == "test":
+            if _get(result, path) != operation["value"]:
+                raise PatchConflict(f"Test failed at {path}")
+        else:
+            raise PatchError(f"Unknown operation {op!r}")
+    return result
+
+
+def _plain_key(key: Any) -> bool:
+    return isinstance(key, str) and key != "" and "." not in key and not key.startswith("$")
+
+
+def diff(current: Dict[str, Any], updated: Dict[str, Any], prefix: str = "") -> Tuple[Dict[str, Any], List[str]]:
+    """Dotted-path ``$set`` values and ``$unset`` paths turning ``current`` into ``updated``
+
+    Nested documents are compared key by key; lists and scalars are replaced
+    whole. A document whose keys cannot be addressed by a dotted path (empty,
+    containing "." or starting with "$") is replaced whole too.
+    """
+    sets: Dict[str, Any] = {}
+    unsets: List[str] = []
+    for key, value in updated.items():
+        path = prefix + key
+        old = current.get(key, _MISSING)
+        if old is _MISSING or type(old) is not type(value):
+            sets[path] = value
+        elif isinstance(value, dict):
+            if value and old and all(_plain_key(name) for name in (*value, *old)):
+                nested_sets, nested_unsets = diff(old, value, path + ".")
+                sets.update(nested_sets)
+                unsets.extend(nested_unsets)
+            elif value != old:
+                sets[path] = value
+        elif value != old:
+            sets[path] = value
+    unsets.extend(prefix + key for key in current if key not in updated)
+    return sets, unsets
+
+
+def update_document(sets: Dict[str, Any], unsets: List[str],
+                    extra_sets: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """MongoDB update for a diff, or None when nothing changed"""
+    if not sets and not unsets:
+        return None
+    update: Dict[str, Any] = {"$set": {**sets, **(extra_sets or {})}}
+    if unsets:
+        update["$unset"] = {path: "" for path in unsets}
+    return update
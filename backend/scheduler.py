@@ -0,0 +1,167 @@
+"""Week-by-week learning schedules built from a user's profile.
+
+A career path's phases are ordered by a prerequisite DAG over skills, phases the
+learner already covers are skipped or shortened according to their skill gap,
+and the remaining hours are packed into weeks that respect the profile's
+``time_available`` budget. Everything is plain arithmetic over the immutable
+simulation templates, so a plan costs microseconds and needs no LLM call.
+"""
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from simulation import PathTemplate, PhaseTemplate, WEEKS_PER_MONTH
+
+DEFAULT_HOURS_PER_WEEK = 20
+MAX_LEVEL = 10
+MIN_PHASE_HOURS = 1
+
+# Skills that should be learned before the key skill, when both are on a path
+SKILL_PREREQUISITES: Dict[str, Tuple[str, ...]] = {
+    "react": ("javascript",),
+    "nodejs": ("javascript",),
+    "database": ("sql",),
+    "data_visualization": ("python",),
+    "statistics": ("mathematics",),
+    "machine_learning": ("python", "mathematics", "statistics"),
+    "deep_learning": ("machine_learning",),
+    "mlops": ("machine_learning", "cloud"),
+}
+
+# Relative effort by experience level
+EXPERIENCE_FACTORS = {
+    "beginner": 1.2,
+    "intermediate": 1.0,
+    "advanced": 0.85,
+}
+
+
+@lru_cache(maxsize=256)
+def phase_order(phases: Tuple[PhaseTemplate, ...]) -> Tuple[int, ...]:
+    """Indices of phases in prerequisite order, keeping catalog order among equals"""
+    first_index: Dict[str, int] = {}
+    for index, phase in enumerate(phases):
+        first_index.setdefault(phase.skill, index)
+
+    # Only edges between skills that are both on this path count
+    dependents: Dict[int, List[int]] = {index: [] for index in range(len(phases))}
+    indegree = [0] * len(phases)
+    for index, phase in enumerate(phases):
+        for prerequisite in SKILL_PREREQUISITES.get(phase.skill, ()):
+            source = first_index.get(prerequisite)
+            if source is not None and source != index:
+                dependents[source].append(index)
+                indegree[index] += 1
+
+    ready = [index for index in range(len(phases)) if indegree[index] == 0]
+    order: List[int] = []
+    while ready:
+        ready.sort()
+        index = ready.pop(0)
+        order.append(index)
+        for dependent in dependents[index]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+
+    if len(order) != len(phases):
+        raise ValueError("Skill prerequisites contain a cycle")
+    return tuple(order)
+
+
+def phase_hours(phase: PhaseTemplate, required_level: int, gap: int, effort: float) -> int:
+    """Hours left for a phase given the remaining gap on its skill"""
+    if required_level <= 0:
+        return 0
+    remaining = min(1.0, gap / required_level)
+    if remaining <= 0:
+        return 0
+    return max(MIN_PHASE_HOURS, math.ceil(phase.time_estimate * remaining * effort))
+
+
+def weekly_hours(value: Any) -> float:
+    """A stored hours-per-week value as a number; DEFAULT_HOURS_PER_WEEK unless it is positive and finite"""
+    if isinstance(value, bool):
+        return DEFAULT_HOURS_PER_WEEK
+    try:
+        hours = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_HOURS_PER_WEEK
+    if not math.isfinite(hours) or hours <= 0:
+        return DEFAULT_HOURS_PER_WEEK
+    return int(hours) if hours.is_integer() else hours
+
+
+def build_schedule(template: PathTemplate, skill_gaps: Dict[str, int], hours_per_week: Optional[float] = None,
+                   budget_constraints: str = "moderate", experience_level: str = "beginner",
+                   include_weeks: bool = True) -> Dict[str, Any]:
+    """Plan the remaining phases of a path into weeks of at most hours_per_week"""
+    # Profiles may hold anything here (strings, nulls), so never compare it as stored
+    hours_per_week = weekly_hours(hours_per_week)
+    effort = EXPERIENCE_FACTORS.get(experience_level, 1.0)
+    free_only = budget_constraints == "low"
+
+    phases: List[Dict[str, Any]] = []
+    skipped: List[str] = []
+    weeks: List[Dict[str, Any]] = []
+    week_number, week_used = 1, 0
+
+    for index in phase_order(template.phases):
+        phase = template.phases[index]
+        required_level = template.required_skills.get(phase.skill, MAX_LEVEL)
+        gap = skill_gaps.get(phase.skill, required_level)
+        hours = phase_hours(phase, required_level, gap, effort)
+        if hours == 0:
+            skipped.append(phase.skill)
+            continue
+
+        start_week = week_number if week_used < hours_per_week else week_number + 1
+        remaining = hours
+        while remaining > 0:
+            if week_used >= hours_per_week:
+                week_number, week_used = week_number + 1, 0
+            block = min(remaining, hours_per_week - week_used)
+            if include_weeks:
+                if not weeks or weeks[-1]["week"] != week_number:
+                    weeks.append({"week": week_number, "hours": 0, "items": []})
+                weeks[-1]["hours"] += block
+                weeks[-1]["items"].append({"skill": phase.skill, "hours": block})
+            week_used += block
+            remaining -= block
+
+        phases.append({
+            "skill": phase.skill,
+            "hours": hours,
+            "original_hours": phase.time_estimate,
+            "start_week": start_week,
+            "end_week": week_number,
+            "resources": [f"Free: {resource}" for resource in phase.resources] if free_only else list(phase.resources),
+        })
+
+    total_hours = sum(phase["hours"] for phase in phases)
+    total_weeks = week_number if phases else 0
+    plan = {
+        "career_path": template.path_id,
+        "hours_per_week": hours_per_week,
+        "total_hours": total_hours,
+        "total_weeks": total_weeks,
+        "estimated_months": round(total_weeks / WEEKS_PER_MONTH, 1),
+        "skipped_phases": skipped,
+        "phases": phases,
+    }
+    if include_weeks:
+        plan["weeks"] = weeks
+    return plan
+
+
+def schedule_for_user(template: PathTemplate, user: Dict[str, Any], skill_gaps: Dict[str, int],
+                      include_weeks: bool = True) -> Dict[str, Any]:
+    """Plan using the constraints stored on a user document"""
+    return build_schedule(
+        template,
+        skill_gaps,
+        hours_per_week=user.get("time_available", DEFAULT_HOURS_PER_WEEK),
+        budget_constraints=user.get("budget_constraints", "moderate"),
+        experience_level=user.get("experience_level", "beginner"),
+        include_weeks=include_weeks,
+    )
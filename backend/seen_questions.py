@@ -0,0 +1,133 @@
+"""Compact per-user record of the questions a user has already been shown.
+
+Each user gets a small Bloom filter in its own ``seen_questions`` collection, so
+the ``users`` document read on every request does not grow with question
+history. Two generations are kept: once the current filter holds
+``capacity`` questions it becomes the previous one and a fresh filter starts,
+which bounds the false-positive rate while remembering at least the last
+``capacity`` questions. With the defaults the two filters take 480 bytes
+(about 600 bytes as a stored document) and a lookup a few microseconds.
+
+Writes replace the whole document; if two requests for one user race, the
+marks from one of them can be lost, which only means a question may repeat.
+"""
+import hashlib
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+SEEN_QUESTIONS_COLLECTION = "seen_questions"
+DEFAULT_CAPACITY = 200
+DEFAULT_ERROR_RATE = 0.01
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(question: Any) -> bytes:
+    """Stable 16-byte digest of a question's text, ignoring case and spacing"""
+    text = question.get("question", "") if isinstance(question, dict) else str(question)
+    return hashlib.blake2b(_WHITESPACE.sub(" ", text.strip().lower()).encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    __slots__ = ("bits", "hashes", "size")
+
+    def __init__(self, size_bits: int, hashes: int, bits: Optional[bytes] = None):
+        self.size = size_bits
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+
+    def _positions(self, digest: bytes):
+        # Double hashing: position i is h1 + i * h2
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class SeenQuestions:
+    """Current and previous generation filters for one user"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE,
+                 document: Optional[Dict[str, Any]] = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        template = BloomFilter.for_capacity(capacity, error_rate)
+        document = document or {}
+        if document.get("size_bits") == template.size and document.get("hashes") == template.hashes:
+            self.current = BloomFilter(template.size, template.hashes, document.get("current"))
+            self.previous = BloomFilter(template.size, template.hashes, document.get("previous"))
+            self.count = document.get("count", 0)
+        else:
+            # New user, or the filter parameters changed since this document was written
+            self.current = template
+            self.previous = BloomFilter(template.size, template.hashes)
+            self.count = 0
+        self.changed = False
+
+    def seen(self, question: Any) -> bool:
+        digest = fingerprint(question)
+        return digest in self.current or digest in self.previous
+
+    def mark(self, questions: Iterable[Any]) -> None:
+        for question in questions:
+            digest = fingerprint(question)
+            if digest in self.current:
+                continue
+            if self.count >= self.capacity:
+                self.previous, self.current = self.current, BloomFilter(self.current.size, self.current.hashes)
+                self.count = 0
+            self.current.add(digest)
+            self.count += 1
+            self.changed = True
+
+    def document(self, user_id: str) -> Dict[str, Any]:
+        return {
+            "_id": user_id,
+            "size_bits": self.current.size,
+            "hashes": self.current.hashes,
+            "count": self.count,
+            "current": bytes(self.current.bits),
+            "previous": bytes(self.previous.bits),
+            "updated_at": datetime.utcnow(),
+        }
+
+
+def pick_unseen(candidates: List[Dict[str, Any]], seen: SeenQuestions, count: int) -> List[Dict[str, Any]]:
+    """Up to ``count`` candidates the user has not been shown, unseen first then topped up"""
+    picked: List[Dict[str, Any]] = []
+    repeats: List[Dict[str, Any]] = []
+    fingerprints = set()
+    for question in candidates:
+        digest = fingerprint(question)
+        if digest in fingerprints:
+            continue
+        fingerprints.add(digest)
+        (repeats if seen.seen(question) else picked).append(question)
+    return (picked + repeats)[:count]
+
+
+async def load_seen_questions(db, user_id: str, capacity: int = DEFAULT_CAPACITY,
+                              error_rate: float = DEFAULT_ERROR_RATE) -> SeenQuestions:
+    document = await db[SEEN_QUESTIONS_COLLECTION].find_one({"_id": user_id})
+    return SeenQuestions(capacity, error_rate, document)
+
+
+async def save_seen_questions(db, user_id: str, seen: SeenQuestions) -> None:
+    if seen.changed:
+        await db[SEEN_QUESTIONS_COLLECTION].replace_one({"_id": user_id}, seen.document(user_id), upsert=True)
+        seen.changed = False
@@ -0,0 +1,58 @@
+"""Fast JSON responses for the large AI payloads.
+
+FastAPI normally walks every returned value through ``jsonable_encoder`` before
+``json.dumps`` sees it. The AI endpoints already build plain dicts of strings,
+numbers and lists, so that pass is pure overhead. ``FastJSONResponse`` encodes
+them directly with orjson when it is installed, and only falls back to the
+generic encoder for values JSON cannot represent natively.
+
+The ``fast_json`` decorator returns such a response from an endpoint and adds
+an ``echo`` query parameter; ``echo=false`` drops fields that only repeat the
+request back to the caller.
+"""
+import functools
+import inspect
+import json
+from typing import Any, Callable, Iterable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                          default=jsonable_encoder).encode("utf-8")
+
+
+def omit_fields(content: Any, fields: Iterable[str]) -> Any:
+    if not isinstance(content, dict):
+        return content
+    fields = set(fields)
+    return {key: value for key, value in content.items() if key not in fields}
+
+
+def fast_json(*echo_fields: str) -> Callable:
+    """Serialize an endpoint's dict result with FastJSONResponse; ``echo_fields`` are omittable"""
+    def decorate(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def wrapper(*args, echo: bool = True, **kwargs):
+            content = await endpoint(*args, **kwargs)
+            if isinstance(content, Response):
+                return content
+            if not echo:
+                content = omit_fields(content, echo_fields)
+            return FastJSONResponse(content)
+
+        signature = inspect.signature(endpoint)
+        echo = inspect.Parameter("echo", inspect.Parameter.KEYWORD_ONLY, default=True, annotation=bool)
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), echo])
+        return wrapper
+    return decorate
@@ -0,0 +1,74 @@
+"""Run the API in several worker processes sharing one snapshot of the read-mostly state.
+
+Run from the backend directory:
+
+    python serve.py --workers 4 --port 8002
+
+This process builds the catalog search index, the career matrix and the hot
+AI responses once, publishes them to ``SHARED_SNAPSHOT_DIR`` (by default a
+directory under /dev/shm) and then starts uvicorn with ``--workers``; every
+worker maps the snapshot read-only instead of building its own copy. The
+snapshot is republished every ``--republish-seconds`` so AI responses are
+renewed before they expire and catalog_items changes show up, and workers
+switch to each new version as it appears. See ``shared_snapshot``.
+
+With ``WRITE_BEHIND_DIR`` set, every worker is given the same directory. Each
+one claims its own ``slot-NN`` subdirectory under a file lock and keeps its
+write-ahead log there; a restarted worker replays the slot of the one it
+replaces, and slots left by workers that are gone for good are replayed by the
+next worker to start. See ``write_behind``.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger("educursus.serve")
+
+DEFAULT_SNAPSHOT_DIR = os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+                                    "educursus-snapshot")
+
+
+async def publish_forever(published: threading.Event, interval: float) -> None:
+    import main
+
+    while True:
+        try:
+            version = await main.publish_shared_snapshot()
+            logger.info("Published shared snapshot", extra={"snapshot_version": version})
+        except Exception:
+            logger.exception("Could not publish the shared snapshot")
+        published.set()
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--republish-seconds", type=float,
+                        default=float(os.getenv("SHARED_SNAPSHOT_INTERVAL_SECONDS", "600")))
+    parser.add_argument("--first-publish-timeout", type=float, default=120.0,
+                        help="start the workers anyway after this long; they then build their state locally")
+    args = parser.parse_args()
+
+    # Inherited by the workers, which attach to what this process publishes
+    os.environ.setdefault("SHARED_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+    published = threading.Event()
+    # The publisher keeps its own event loop, since uvicorn takes over this thread
+    threading.Thread(target=lambda: asyncio.run(publish_forever(published, args.republish_seconds)),
+                     name="snapshot-publisher", daemon=True).start()
+    if not published.wait(args.first_publish_timeout):
+        logger.warning("First snapshot not published yet; starting workers anyway")
+
+    import uvicorn
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
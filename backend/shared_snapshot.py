@@ -0,0 +1,222 @@
+"""Read-only state shared by all API workers on a host.
+
+With several uvicorn workers each process would otherwise build its own
+catalog search index, career matrix and AI response cache. Instead one process
+(``serve.py``, or a worker handling a reindex) builds them once and publishes a
+snapshot: a single file of aligned flat arrays plus a JSON table of contents.
+Workers map the newest snapshot read-only, so its pages are shared through the
+page cache and arrays are numpy views of the mapping rather than copies. Put
+``SHARED_SNAPSHOT_DIR`` on a tmpfs such as ``/dev/shm`` to keep it in memory.
+
+Snapshots are versioned. Publishing writes ``snapshot-<version>.bin`` next to
+the current one, then atomically replaces the ``CURRENT`` file naming it;
+workers notice the new version on their next check and switch over, while
+requests already holding the old arrays finish with them. Older files are
+unlinked, which is safe on Linux since a mapping outlives its file name.
+Publishers take an exclusive lock on the directory, so versions never clash.
+
+File layout: ``MAGIC``, the table of contents length as a little-endian
+uint64, the table of contents, then every array at an ``ALIGNMENT`` boundary.
+"""
+import fcntl
+import json
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"EDUSNAP1"
+ALIGNMENT = 64
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "publish.lock"
+DEFAULT_CHECK_INTERVAL = 1.0
+# Versions kept besides the current one, for workers that have not switched yet
+KEEP_PREVIOUS = 1
+
+_LENGTH = struct.Struct("<Q")
+
+
+def snapshot_name(version: int) -> str:
+    return f"snapshot-{version:08d}.bin"
+
+
+def _padding(position: int) -> int:
+    return -position % ALIGNMENT
+
+
+def write_snapshot(path: str, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    """Write ``arrays`` and ``meta`` to ``path`` via a temporary file, so readers never see half a snapshot"""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    # Offsets depend on the header length, which depends on the offsets; settle it by padding the header
+    layout: Dict[str, List[Any]] = {}
+    header_length = 0
+    while True:
+        position = header_length
+        for name, array in arrays.items():
+            position += _padding(position)
+            layout[name] = [position, array.dtype.str, list(array.shape)]
+            position += array.nbytes
+        contents = json.dumps({"meta": meta, "arrays": layout}, separators=(",", ":"), default=str).encode("utf-8")
+        needed = len(MAGIC) + _LENGTH.size + len(contents)
+        needed += _padding(needed)
+        if needed == header_length:
+            break
+        header_length = needed
+
+    temporary = f"{path}.tmp-{os.getpid()}"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC + _LENGTH.pack(len(contents)) + contents)
+        f.write(b"\0" * (header_length - f.tell()))
+        for name, array in arrays.items():
+            f.write(b"\0" * (layout[name][0] - f.tell()))
+            f.write(array.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class Snapshot:
+    """A mapped snapshot file; ``arrays`` are read-only views into the mapping"""
+
+    def __init__(self, path: str, version: int):
+        self.path = path
+        self.version = version
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a snapshot")
+        start = len(MAGIC) + _LENGTH.size
+        (length,) = _LENGTH.unpack(self._map[len(MAGIC):start])
+        contents = json.loads(self._map[start:start + length])
+        self.meta: Dict[str, Any] = contents["meta"]
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, (offset, dtype, shape) in contents["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            if count == 0:
+                array = np.zeros(shape, dtype=dtype)
+            else:
+                array = np.frombuffer(self._map, dtype=dtype, count=count, offset=offset).reshape(shape)
+            self.arrays[name] = array
+
+    def section(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Arrays published under ``prefix.``, without the prefix"""
+        prefix += "."
+        return {name[len(prefix):]: array for name, array in self.arrays.items() if name.startswith(prefix)}
+
+    @property
+    def size(self) -> int:
+        return len(self._map)
+
+
+class SnapshotStore:
+    def __init__(self, directory: str, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._snapshot: Optional[Snapshot] = None
+        self._checked = 0.0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def current_version(self) -> int:
+        try:
+            with open(self._path(CURRENT_FILE)) as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def publish(self, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> int:
+        """Write a new version, make it current and remove the ones no worker should still open"""
+        with self._locked():
+            version = self.current_version() + 1
+            write_snapshot(self._path(snapshot_name(version)), dict(meta, version=version), arrays)
+            temporary = self._path(f"{CURRENT_FILE}.tmp-{os.getpid()}")
+            with open(temporary, "w") as f:
+                f.write(str(version))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self._path(CURRENT_FILE))
+            for name in os.listdir(self.directory):
+                if name.startswith("snapshot-") and name.endswith(".bin"):
+                    try:
+                        old = int(name[len("snapshot-"):-len(".bin")])
+                    except ValueError:
+                        continue
+                    if old < version - KEEP_PREVIOUS:
+                        os.unlink(self._path(name))
+        self._checked = 0.0
+        return version
+
+    def current(self) -> Optional[Snapshot]:
+        """The newest snapshot, re-checked at most every ``check_interval`` seconds; None if none is published"""
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return self._snapshot
+        self._checked = now
+        for _ in range(3):
+            version = self.current_version()
+            if not version or (self._snapshot is not None and self._snapshot.version == version):
+                break
+            try:
+                self._snapshot = Snapshot(self._path(snapshot_name(version)), version)
+                break
+            except FileNotFoundError:
+                # Pruned by a publisher between reading CURRENT and opening the file
+                continue
+        return self._snapshot
+
+
+def pack_responses(entries: List[Tuple[Tuple[str, Tuple[str, ...]], float, Any]]) -> Tuple[List[list], np.ndarray]:
+    """Index and JSON blob for cached responses given as (key, expires at as a Unix time, value)"""
+    index, chunks, offset = [], [], 0
+    for (endpoint, args), expires_at, value in entries:
+        try:
+            encoded = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            continue
+        index.append([endpoint, list(args), expires_at, offset, len(encoded)])
+        chunks.append(encoded)
+        offset += len(encoded)
+    return index, np.frombuffer(b"".join(chunks), dtype=np.uint8)
+
+
+class SharedResponses:
+    """Lookup of the AI responses published in a snapshot, decoded on access"""
+
+    def __init__(self, index: List[list], blob: np.ndarray):
+        self._blob = blob
+        self._index = {(endpoint, tuple(args)): (expires_at, offset, length)
+                       for endpoint, args, expires_at, offset, length in index}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: Tuple[str, Tuple[str, ...]]) -> Optional[Tuple[float, Any]]:
+        """(expires at as a Unix time, value) of a still valid entry"""
+        found = self._index.get(key)
+        if found is None or found[0] <= time.time():
+            return None
+        expires_at, offset, length = found
+        return expires_at, json.loads(self._blob[offset:offset + length].tobytes())
+
+    def entries(self) -> Iterator[Tuple[Tuple[str, Tuple[str, ...]], float, Any]]:
+        """Every still valid entry, to carry over into the next snapshot"""
+        for key in self._index:
+            found = self.get(key)
+            if found is not None:
+                yield key, found[0], found[1]
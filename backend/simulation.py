@@ -0,0 +1,205 @@
+"""Career simulation over immutable path templates.
+
+Career paths are compiled once into frozen templates (tuples and read-only
+mappings). Constraints become small overlays, and a simulated path is rendered
+from template + overlay into brand-new output dicts. Nothing shared is ever
+mutated, so concurrent simulations cannot see each other's constraints and the
+catalog never drifts between requests.
+"""
+import math
+from functools import lru_cache
+from itertools import product
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+PART_TIME_MULTIPLIER = 1.5
+PART_TIME_HOURS_PER_WEEK = 10
+FULL_TIME_HOURS_PER_WEEK = 25
+WEEKS_PER_MONTH = 4.33
+MAX_SCENARIOS = 1024
+
+
+class PhaseTemplate(NamedTuple):
+    skill: str
+    resources: Tuple[str, ...]
+    time_estimate: int
+
+
+class PathTemplate(NamedTuple):
+    path_id: str
+    name: str
+    description: str
+    required_skills: Mapping[str, int]
+    market_demand: float
+    salary_range: Mapping[str, float]
+    phases: Tuple[PhaseTemplate, ...]
+
+
+class ConstraintOverlay(NamedTuple):
+    """Changes a set of constraints makes to a template, without touching it"""
+    time_multiplier: float
+    free_resources: bool
+    extra_skills: Tuple[Tuple[str, int], ...]
+    extra_phases: Tuple[PhaseTemplate, ...]
+
+
+REMOTE_COLLABORATION_PHASE = PhaseTemplate(
+    skill="remote_collaboration",
+    resources=("Remote Work Best Practices", "Digital Collaboration Tools"),
+    time_estimate=15,
+)
+
+
+def compile_template(path_id: str, career_path: Dict[str, Any]) -> PathTemplate:
+    """Freeze a catalog entry into an immutable template"""
+    return PathTemplate(
+        path_id=path_id,
+        name=career_path["name"],
+        description=career_path["description"],
+        required_skills=MappingProxyType(dict(career_path["required_skills"])),
+        market_demand=career_path["market_demand"],
+        salary_range=MappingProxyType(dict(career_path["salary_range"])),
+        phases=tuple(
+            PhaseTemplate(item["skill"], tuple(item["resources"]), item["time_estimate"])
+            for item in career_path["learning_path"]
+        ),
+    )
+
+
+def compile_templates(career_paths: Dict[str, Dict[str, Any]]) -> Mapping[str, PathTemplate]:
+    return MappingProxyType({path_id: compile_template(path_id, path) for path_id, path in career_paths.items()})
+
+
+@lru_cache(maxsize=None)
+def _overlay_for(part_time: bool, budget_limited: bool, remote_only: bool) -> ConstraintOverlay:
+    return ConstraintOverlay(
+        time_multiplier=PART_TIME_MULTIPLIER if part_time else 1.0,
+        free_resources=budget_limited,
+        extra_skills=(("remote_collaboration", 6),) if remote_only else (),
+        extra_phases=(REMOTE_COLLABORATION_PHASE,) if remote_only else (),
+    )
+
+
+def build_overlay(constraints: Dict[str, Any]) -> ConstraintOverlay:
+    """Overlay for a constraints dict; identical flag sets share one cached overlay"""
+    return _overlay_for(
+        bool(constraints.get("part_time")),
+        bool(constraints.get("budget_limited")),
+        bool(constraints.get("remote_only")),
+    )
+
+
+def _phase_hours(phase: PhaseTemplate, overlay: ConstraintOverlay) -> int:
+    return int(phase.time_estimate * overlay.time_multiplier)
+
+
+def total_hours(template: PathTemplate, overlay: ConstraintOverlay) -> int:
+    """Hours of the constrained path, computed without rendering it"""
+    return (
+        sum(_phase_hours(phase, overlay) for phase in template.phases)
+        + sum(phase.time_estimate for phase in overlay.extra_phases)
+    )
+
+
+def render_path(template: PathTemplate, overlay: ConstraintOverlay) -> Dict[str, Any]:
+    """Materialize a constrained path as fresh dicts the caller is free to modify"""
+    required_skills = dict(template.required_skills)
+    required_skills.update(overlay.extra_skills)
+
+    learning_path = [
+        {
+            "skill": phase.skill,
+            "resources": [f"Free: {resource}" for resource in phase.resources] if overlay.free_resources else list(phase.resources),
+            "time_estimate": _phase_hours(phase, overlay),
+        }
+        for phase in template.phases
+    ]
+    # Extra phases are added after the constraints above, so they are not rescaled
+    learning_path.extend(
+        {"skill": phase.skill, "resources": list(phase.resources), "time_estimate": phase.time_estimate}
+        for phase in overlay.extra_phases
+    )
+
+    return {
+        "name": template.name,
+        "description": template.description,
+        "required_skills": required_skills,
+        "market_demand": template.market_demand,
+        "salary_range": dict(template.salary_range),
+        "learning_path": learning_path,
+    }
+
+
+def apply_constraints_to_path(career_path: Dict, constraints: Dict) -> Dict:
+    """Apply constraints to modify the learning path"""
+    template = compile_template("", career_path)
+    return render_path(template, build_overlay(constraints))
+
+
+def completion_time_from_hours(total: int, part_time: bool, hours_per_week: Optional[float] = None) -> Dict[str, Any]:
+    """Weeks and months for a number of hours at the given weekly pace"""
+    if not hours_per_week or hours_per_week <= 0:
+        hours_per_week = PART_TIME_HOURS_PER_WEEK if part_time else FULL_TIME_HOURS_PER_WEEK
+    weeks = total / hours_per_week
+    months = weeks / WEEKS_PER_MONTH
+    return {
+        "total_hours": total,
+        "estimated_weeks": round(weeks, 1),
+        "estimated_months": round(months, 1),
+        "learning_pace": "part_time" if part_time else "full_time",
+    }
+
+
+def parse_hours_per_week(value: Any) -> Optional[float]:
+    """Client-supplied hours per week as a float; ValueError if it is not a finite number"""
+    if value is None:
+        return None
+    try:
+        hours = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"hours_per_week must be a number, got {value!r}")
+    if not math.isfinite(hours):
+        raise ValueError("hours_per_week must be a finite number")
+    return hours
+
+
+def calculate_completion_time(modified_path: Dict, constraints: Dict) -> Dict[str, Any]:
+    """Calculate estimated completion time based on constraints"""
+    total = sum(item["time_estimate"] for item in modified_path["learning_path"])
+    hours_per_week = parse_hours_per_week(constraints.get("hours_per_week"))
+    return completion_time_from_hours(total, bool(constraints.get("part_time")), hours_per_week)
+
+
+def scenario_count(part_time: List[bool], budget_limited: List[bool], remote_only: List[bool],
+                   hours_per_week: List[Optional[float]]) -> int:
+    """Size of ``scenario_grid`` for these values, without building it"""
+    return len(part_time) * len(budget_limited) * len(remote_only) * max(1, len(hours_per_week))
+
+
+def scenario_grid(part_time: Iterable[bool], budget_limited: Iterable[bool], remote_only: Iterable[bool],
+                  hours_per_week: Iterable[Optional[float]]) -> List[Dict[str, Any]]:
+    """Cartesian product of constraint values as a list of constraint dicts"""
+    hours = list(hours_per_week) or [None]
+    return [
+        {"part_time": pt, "budget_limited": bl, "remote_only": ro, "hours_per_week": hw}
+        for pt, bl, ro, hw in product(list(part_time), list(budget_limited), list(remote_only), hours)
+    ]
+
+
+def simulate_scenarios(template: PathTemplate, scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One comparison row per scenario, using overlay totals only"""
+    rows = []
+    for constraints in scenarios:
+        overlay = build_overlay(constraints)
+        part_time = bool(constraints.get("part_time"))
+        row = {
+            "part_time": part_time,
+            "budget_limited": bool(constraints.get("budget_limited")),
+            "remote_only": bool(constraints.get("remote_only")),
+            "hours_per_week": constraints.get("hours_per_week"),
+            "phases": len(template.phases) + len(overlay.extra_phases),
+            "added_skills": [skill for skill, _ in overlay.extra_skills],
+        }
+        row.update(completion_time_from_hours(total_hours(template, overlay), part_time, constraints.get("hours_per_week")))
+        rows.append(row)
+    return rows
@@ -0,0 +1,164 @@
+"""Packed skill-level vectors stored alongside ``current_skills``.
+
+``current_skills`` stays the readable source of truth. Next to it each user
+carries ``skill_vector``: one signed byte per skill of a shared vocabulary, as
+BSON binary, plus ``skill_vector_version``. Batch scans project only those two
+fields, so decoding a user yields one bytes object instead of a key string and
+int per skill, and a page of users is stacked into an ``int8`` matrix with a
+handful of numpy calls.
+
+The vocabulary lives in the ``skill_vocabulary`` collection and is
+append-only: a skill keeps its position forever and new skills are appended
+with ``$addToSet``, so a vector encoded against an older, shorter vocabulary
+is still read correctly (missing trailing positions are zero). The version
+only changes if the vocabulary is ever rebuilt; vectors of another version are
+treated as absent and re-encoded by ``jobs.backfill_skill_vectors``.
+
+A level of 0 and an absent skill look the same in a vector, and levels are
+clipped to the int8 range.
+"""
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from bson.binary import Binary
+
+import skills
+from catalog import CAREER_PATHS
+
+VOCABULARY_COLLECTION = "skill_vocabulary"
+VOCABULARY_ID = "skills"
+VOCABULARY_VERSION = 1
+# Free-form skill names grow the vocabulary; past this many, new skills are left out of vectors
+MAX_VOCABULARY_SIZE = 16384
+VECTOR_FIELD = "skill_vector"
+VERSION_FIELD = "skill_vector_version"
+DEFAULT_SCAN_BATCH_SIZE = 5000
+
+
+def initial_skills() -> List[str]:
+    career_skills = {skill for path in CAREER_PATHS.values() for skill in path["required_skills"]}
+    return sorted(skills.registry.canonical_names | career_skills)
+
+
+class SkillVocabulary:
+    def __init__(self, version: int, names: List[str]):
+        self.version = version
+        self.names = list(names)
+        self.index = {name: position for position, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def missing(self, names: Iterable[str]) -> List[str]:
+        return [name for name in dict.fromkeys(names) if name not in self.index]
+
+    def encode(self, levels: Dict[str, Any]) -> bytes:
+        """Packed levels; skills outside the vocabulary are left out"""
+        positions = [(self.index[name], level) for name, level in levels.items() if name in self.index]
+        if not positions:
+            return b""
+        vector = np.zeros(max(position for position, _ in positions) + 1, dtype=np.int8)
+        for position, level in positions:
+            vector[position] = np.clip(round(level), -128, 127)
+        return vector.tobytes()
+
+    def fields(self, levels: Dict[str, Any]) -> Dict[str, Any]:
+        """``$set`` fields storing the packed form of normalized ``levels``"""
+        return {VECTOR_FIELD: Binary(self.encode(levels)), VERSION_FIELD: self.version}
+
+    def decode(self, vector: bytes) -> Dict[str, int]:
+        levels = np.frombuffer(vector, dtype=np.int8)
+        return {self.names[position]: int(levels[position]) for position in np.flatnonzero(levels)}
+
+    def columns(self, names: Iterable[str]) -> np.ndarray:
+        """Vocabulary positions of ``names``, -1 for names not in it"""
+        return np.array([self.index.get(name, -1) for name in names], dtype=np.int64)
+
+
+def decode_matrix(vectors: List[Optional[bytes]], width: int) -> np.ndarray:
+    """Stack packed vectors into a users x ``width`` int8 matrix, zero-padding short or missing ones"""
+    blobs = [vector or b"" for vector in vectors]
+    matrix = np.zeros((len(blobs), width), dtype=np.int8)
+    lengths = np.array(list(map(len, blobs)), dtype=np.int64)
+    total = int(lengths.sum())
+    if total:
+        values = np.frombuffer(b"".join(blobs), dtype=np.int8)
+        # Flat matrix position of every byte: its offset within its vector plus its row's start
+        offsets = np.arange(len(blobs), dtype=np.int64) * width - (np.cumsum(lengths) - lengths)
+        positions = np.arange(total, dtype=np.int64) + np.repeat(offsets, lengths)
+        if lengths.max() > width:
+            # Encoded against a longer vocabulary than the caller's
+            inside = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths) < width
+            positions, values = positions[inside], values[inside]
+        matrix.reshape(-1)[positions] = values
+    return matrix
+
+
+def select_columns(matrix: np.ndarray, vocabulary: SkillVocabulary, names: List[str]) -> np.ndarray:
+    """Levels of ``names`` per user (zero for skills the vocabulary does not know), as float64"""
+    columns = vocabulary.columns(names)
+    selected = np.zeros((matrix.shape[0], len(names)), dtype=np.float64)
+    known = columns >= 0
+    selected[:, known] = matrix[:, columns[known]]
+    return selected
+
+
+_vocabulary: Optional[SkillVocabulary] = None
+
+
+async def load_vocabulary(db) -> SkillVocabulary:
+    """The stored vocabulary, created from the registry and career catalog on first use"""
+    global _vocabulary
+    document = await db[VOCABULARY_COLLECTION].find_one({"_id": VOCABULARY_ID})
+    if document is None:
+        await db[VOCABULARY_COLLECTION].update_one(
+            {"_id": VOCABULARY_ID},
+            {"$setOnInsert": {"version": VOCABULARY_VERSION, "skills": initial_skills()}},
+            upsert=True,
+        )
+        document = await db[VOCABULARY_COLLECTION].find_one({"_id": VOCABULARY_ID})
+    _vocabulary = SkillVocabulary(document["version"], document["skills"])
+    return _vocabulary
+
+
+async def vocabulary_for(db, names: Iterable[str]) -> SkillVocabulary:
+    """A vocabulary containing ``names``, appending the ones not in it yet while there is room"""
+    vocabulary = _vocabulary or await load_vocabulary(db)
+    missing = vocabulary.missing(names)
+    if missing:
+        # Another process may have appended them already
+        vocabulary = await load_vocabulary(db)
+        missing = vocabulary.missing(names)
+    if missing and len(vocabulary) < MAX_VOCABULARY_SIZE:
+        await db[VOCABULARY_COLLECTION].update_one(
+            {"_id": VOCABULARY_ID, "version": vocabulary.version},
+            {"$addToSet": {"skills": {"$each": missing[:MAX_VOCABULARY_SIZE - len(vocabulary)]}}},
+        )
+        vocabulary = await load_vocabulary(db)
+    return vocabulary
+
+
+async def vector_fields(db, levels: Dict[str, Any]) -> Dict[str, Any]:
+    """``SkillVocabulary.fields`` of ``levels``, growing the vocabulary if needed"""
+    return (await vocabulary_for(db, levels)).fields(levels)
+
+
+async def scan_matrices(collection, vocabulary: SkillVocabulary, query: Optional[Dict[str, Any]] = None,
+                        batch_size: int = DEFAULT_SCAN_BATCH_SIZE) -> AsyncIterator[Tuple[List[Any], np.ndarray]]:
+    """(user ids, users x vocabulary int8 matrix) pages of a users collection, in ``_id`` order
+
+    Users without a vector of this vocabulary version come back as all-zero
+    rows; run the backfill job first for complete results.
+    """
+    projection = {VECTOR_FIELD: 1, VERSION_FIELD: 1}
+    cursor = collection.find(query or {}, projection).sort("_id", 1).batch_size(batch_size)
+    ids: List[Any] = []
+    vectors: List[Optional[bytes]] = []
+    async for document in cursor:
+        ids.append(document["_id"])
+        vectors.append(document.get(VECTOR_FIELD) if document.get(VERSION_FIELD) == vocabulary.version else None)
+        if len(ids) == batch_size:
+            yield ids, decode_matrix(vectors, len(vocabulary))
+            ids, vectors = [], []
+    if ids:
+        yield ids, decode_matrix(vectors, len(vocabulary))
@@ -0,0 +1,191 @@
+"""Canonical skill names.
+
+Clients send skills however users type them ("Python 3", "JS", "Node.js",
+"Data Viz"), while career paths and cached AI responses are keyed by canonical
+names such as ``python``, ``javascript`` and ``nodejs``. ``normalize_skill``
+maps a free-form name onto the registry in three steps:
+
+1. fold case, punctuation and whitespace and look the result up in the alias
+   table;
+2. otherwise walk a trie of folded aliases and take the longest alias that
+   ends on a word boundary, provided every word after it is a version number
+   or a generic qualifier, so "python 3.11" and "go programming" resolve but
+   "react native" and "go-to-market" do not;
+3. otherwise fall back to the closest alias by edit similarity, for typos in
+   multi-word names, comparing only aliases with the same first word so that
+   "stata" never becomes ``statistics``.
+
+Names that match nothing keep their folded form rather than a guess, so new
+skills still get a stable key. Results are memoized, which keeps repeated names at a dictionary
+lookup.
+"""
+import difflib
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+# canonical name -> aliases (the canonical name itself is always an alias)
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "python": ["py", "python3", "python 2", "python 3", "python programming", "cpython"],
+    "javascript": ["js", "java script", "ecmascript", "es6", "es2015", "vanilla js", "vanillajs"],
+    "typescript": ["ts"],
+    "nodejs": ["node", "node.js", "node js", "express", "expressjs", "express.js"],
+    "react": ["reactjs", "react.js", "react js"],
+    "html": ["html5"],
+    "css": ["css3", "scss", "sass"],
+    "java": ["java se", "java ee", "core java"],
+    "c++": ["cpp", "cplusplus", "c plus plus"],
+    "c#": ["csharp", "c sharp", ".net", "dotnet"],
+    "go": ["golang"],
+    "sql": ["structured query language", "mysql", "postgresql", "postgres", "sqlite", "t-sql", "tsql", "pl/sql",
+            "sql server", "mssql"],
+    "database": ["databases", "dbms", "rdbms", "database design", "db", "mongodb", "nosql", "database management"],
+    "excel": ["ms excel", "microsoft excel", "spreadsheets", "spreadsheet", "google sheets"],
+    "data_visualization": ["data visualisation", "data viz", "dataviz", "visualization", "visualisation",
+                           "tableau", "power bi", "powerbi", "matplotlib", "seaborn"],
+    "statistics": ["stats", "statistical analysis", "probability and statistics"],
+    "mathematics": ["math", "maths", "linear algebra", "calculus"],
+    "machine_learning": ["ml", "machine-learning", "scikit-learn", "sklearn", "scikit learn"],
+    "deep_learning": ["dl", "neural networks", "neural network", "tensorflow", "pytorch", "keras"],
+    "mlops": ["ml ops", "machine learning operations", "model deployment"],
+    "cloud": ["cloud computing", "aws", "amazon web services", "azure", "gcp", "google cloud"],
+    "git": ["github", "gitlab", "version control"],
+    "docker": ["containers", "containerization"],
+    "kubernetes": ["k8s"],
+    "pandas": [],
+    "numpy": [],
+    "data_analysis": ["data analytics", "analytics"],
+    "communication": ["communication skills"],
+}
+
+# Aliases that are ordinary words in running text ("go", "net", "express")
+TEXT_AMBIGUOUS_ALIASES = frozenset({"go", "net", "db", "dl", "ts", "express"})
+FUZZY_CUTOFF = 0.8
+# Very short inputs ("r", "c") are legitimate names, not typos to correct
+MIN_FUZZY_LENGTH = 4
+# Words that may follow an alias without naming a different skill ("python programming 3")
+QUALIFIER_WORDS = frozenset({"programming", "language", "development", "developer", "basics", "fundamentals",
+                             "beginner", "intermediate", "advanced", "expert"})
+NORMALIZE_CACHE_SIZE = 65536
+
+_SEPARATORS = re.compile(r"[^a-z0-9+#]+")
+_VERSION_WORD = re.compile(r"v?[0-9]+[a-z]?")
+
+
+def fold(name: str) -> str:
+    """Lowercase, with every run of punctuation or whitespace collapsed to one underscore"""
+    return _SEPARATORS.sub("_", name.lower()).strip("_")
+
+
+class _TrieNode:
+    __slots__ = ("children", "canonical")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.canonical: Optional[str] = None
+
+
+class SkillRegistry:
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        self.alias_index: Dict[str, str] = {}
+        self._root = _TrieNode()
+        for canonical, names in aliases.items():
+            for name in (canonical, *names):
+                folded = fold(name)
+                if folded:
+                    self.alias_index.setdefault(folded, canonical)
+        for folded, canonical in self.alias_index.items():
+            node = self._root
+            for char in folded:
+                node = node.children.setdefault(char, _TrieNode())
+            node.canonical = canonical
+        # first word -> aliases starting with it that are long enough to fuzzy-match
+        self._fuzzy_candidates: Dict[str, List[str]] = {}
+        for folded in sorted(self.alias_index):
+            if len(folded) >= MIN_FUZZY_LENGTH:
+                self._fuzzy_candidates.setdefault(folded.split("_")[0], []).append(folded)
+        self.canonical_names = frozenset(aliases)
+        # first word of an alias -> most words in any alias starting with it, for scanning text
+        self._alias_spans: Dict[str, int] = {}
+        for folded in self.alias_index:
+            words = folded.split("_")
+            self._alias_spans[words[0]] = max(self._alias_spans.get(words[0], 0), len(words))
+
+    def _longest_prefix(self, folded: str) -> Optional[str]:
+        """Longest alias ending on a word boundary that is followed only by versions or qualifiers"""
+        node, match = self._root, None
+        for index, char in enumerate(folded):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.canonical and (index + 1 == len(folded) or folded[index + 1] == "_"):
+                rest = folded[index + 2:].split("_") if index + 1 < len(folded) else []
+                if all(word in QUALIFIER_WORDS or _VERSION_WORD.fullmatch(word) for word in rest):
+                    match = node.canonical
+        return match
+
+    def resolve(self, name: str) -> str:
+        folded = fold(name)
+        if not folded:
+            return folded
+        canonical = self.alias_index.get(folded)
+        if canonical:
+            return canonical
+        # Version numbers stuck to the name: "python3", "html5", "es2015"
+        stripped = folded.rstrip("0123456789._")
+        canonical = self.alias_index.get(stripped) if stripped else None
+        if canonical:
+            return canonical
+        canonical = self._longest_prefix(folded)
+        if canonical:
+            return canonical
+        candidates = self._fuzzy_candidates.get(folded.split("_")[0])
+        if candidates and len(folded) >= MIN_FUZZY_LENGTH:
+            close = difflib.get_close_matches(folded, candidates, n=1, cutoff=FUZZY_CUTOFF)
+            if close:
+                return self.alias_index[close[0]]
+        return folded
+
+    def extract(self, text: str) -> Set[str]:
+        """Canonical skills mentioned anywhere in free text, longest alias wins where aliases overlap"""
+        words = fold(text).split("_")
+        found: Set[str] = set()
+        start = 0
+        while start < len(words):
+            step = 1
+            span = self._alias_spans.get(words[start], 0)
+            for end in range(min(len(words), start + span), start, -1):
+                phrase = "_".join(words[start:end])
+                canonical = self.alias_index.get(phrase)
+                if canonical and phrase not in TEXT_AMBIGUOUS_ALIASES:
+                    found.add(canonical)
+                    step = end - start
+                    break
+            start += step
+        return found
+
+
+registry = SkillRegistry(SKILL_ALIASES)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_skill(name: str) -> str:
+    """Canonical key for a free-form skill name"""
+    return registry.resolve(name)
+
+
+def normalize_skill_levels(skills: Dict[str, int]) -> Dict[str, int]:
+    """Skill levels keyed by canonical name; aliases of one skill keep the highest level"""
+    normalized: Dict[str, int] = {}
+    for name, level in skills.items():
+        key = normalize_skill(name)
+        if not key:
+            continue
+        if key not in normalized or level > normalized[key]:
+            normalized[key] = level
+    return normalized
+
+
+def extract_skills(text: str) -> Set[str]:
+    """Canonical skills mentioned in a job posting or other free text"""
+    return registry.extract(text) if text else set()
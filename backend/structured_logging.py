@@ -0,0 +1,249 @@
+"""Structured, non-blocking logging.
+
+Records are written as one JSON object per line. Request handlers never touch
+stdout themselves: ``configure`` installs a ``QueueHandler`` on the root logger
+that only resolves the message and drops the record on an in-memory queue,
+and a ``QueueListener`` thread formats and writes them. If the queue is full
+the record is dropped and counted rather than stalling the event loop.
+
+Every record made while serving a request carries that request's id, method
+and path, taken from a context variable set by ``AccessLogMiddleware``, which
+also writes one access line per request with the matched route and latency.
+
+Warnings and errors repeating the same message are limited to a burst per
+window; the first record after the window reports how many were suppressed.
+Pass values as ``extra`` fields rather than formatting them into the message,
+so that repeats share a key and the values stay queryable.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_REPEAT_BURST = 5
+DEFAULT_REPEAT_WINDOW_SECONDS = 60.0
+MAX_REPEAT_KEYS = 1024
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 128
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+_CONTEXT_FIELDS = ("request_id", "method", "path")
+
+request_context: ContextVar[Optional[Dict[str, str]]] = ContextVar("request_context", default=None)
+
+access_logger = logging.getLogger("educursus.access")
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+class RepeatFilter(logging.Filter):
+    """Pass at most ``burst`` warnings per (logger, level, message) every ``window`` seconds"""
+
+    def __init__(self, burst: int = DEFAULT_REPEAT_BURST, window: float = DEFAULT_REPEAT_WINDOW_SECONDS):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.suppressed = 0
+        # key -> [window start, records passed, records suppressed]
+        self._seen: "OrderedDict[tuple, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0 or record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None or now - seen[0] >= self.window:
+                if seen is not None and seen[2]:
+                    record.suppressed = seen[2]
+                self._seen[key] = [now, 1, 0]
+                self._seen.move_to_end(key)
+                if len(self._seen) > MAX_REPEAT_KEYS:
+                    self._seen.popitem(last=False)
+                return True
+            if seen[1] < self.burst:
+                seen[1] += 1
+                return True
+            seen[2] += 1
+            self.suppressed += 1
+            return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the listener thread and drops them when the queue is full"""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener is in-process, so the exception and extras can travel
+        # as they are; only the arguments are resolved now, while they still
+        # hold the values they had when the record was made
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        context = request_context.get()
+        if context is not None:
+            for field in _CONTEXT_FIELDS:
+                if not hasattr(record, field):
+                    setattr(record, field, context[field])
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_repeat_filter: Optional[RepeatFilter] = None
+_running = False
+
+
+def configure(level: str = "INFO", queue_size: int = DEFAULT_QUEUE_SIZE, repeat_burst: int = DEFAULT_REPEAT_BURST,
+              repeat_window: float = DEFAULT_REPEAT_WINDOW_SECONDS, stream=None) -> None:
+    """Route the root logger through the queue; safe to call again to reconfigure"""
+    global _listener, _queue_handler, _repeat_filter
+    stop()
+    _listener = None
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter())
+    log_queue: "queue.Queue" = queue.Queue(maxsize=max(queue_size, 1))
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _repeat_filter = RepeatFilter(repeat_burst, repeat_window)
+    _queue_handler.addFilter(_repeat_filter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    start()
+
+
+def start() -> None:
+    global _running
+    if _listener is not None and not _running:
+        _listener.start()
+        _running = True
+
+
+def stop() -> None:
+    """Write out everything still queued and stop the listener thread"""
+    global _running
+    if _listener is not None and _running:
+        _listener.stop()
+        _running = False
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "suppressed_repeats": _repeat_filter.suppressed if _repeat_filter else 0,
+    }
+
+
+def _request_id(headers) -> str:
+    for key, value in headers:
+        if key == REQUEST_ID_HEADER:
+            supplied = value.decode("latin-1").strip()
+            if supplied and len(supplied) <= MAX_REQUEST_ID_LENGTH and supplied.isprintable():
+                return supplied
+            break
+    return uuid.uuid4().hex
+
+
+def _route_template(scope) -> Optional[str]:
+    """Path template of the route that handled the request, e.g. ``/auth/profile/{user_id}``"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return None
+    templates = getattr(app.state, "_route_templates", None)
+    if templates is None:
+        templates = {}
+        for route in getattr(app, "routes", ()):
+            if getattr(route, "endpoint", None) is not None:
+                templates.setdefault(route.endpoint, route.path)
+        app.state._route_templates = templates
+    return templates.get(endpoint)
+
+
+class AccessLogMiddleware:
+    """Tags each request with an id and writes an access line once it completes.
+
+    ``sample_rate`` below 1 keeps only that share of access lines for
+    successful requests; 4xx/5xx responses and failures are always logged.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = _request_id(scope.get("headers") or [])
+        token = request_context.set({"request_id": request_id, "method": scope["method"], "path": scope["path"]})
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers") or []) + [
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        except Exception:
+            access_logger.exception("request failed", extra={
+                "endpoint": _route_template(scope) or scope["path"], "status": 500,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3)})
+            raise
+        else:
+            if status_code >= 400 or self.sample_rate >= 1 or random.random() < self.sample_rate:
+                access_logger.info("request", extra={
+                    "endpoint": _route_template(scope) or scope["path"], "status": status_code,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 3)})
+        finally:
+            request_context.reset(token)
@@ -0,0 +1,201 @@
+"""Unit tests for profile_patch and the PATCH /auth/profile route.
+
+Run from the backend directory with ``python -m pytest tests``. The route
+tests drive the app in-process against the benchmark fakes, so no MongoDB or
+Groq key is needed.
+"""
+import asyncio
+import os
+
+import pytest
+
+import profile_patch
+from profile_patch import PatchConflict, PatchError, apply_json_patch, apply_merge_patch, diff, update_document
+
+
+def test_pointer_unescapes_tilde_and_slash():
+    assert profile_patch._pointer("/a~1b/c~0d/~01") == ["a/b", "c~d", "~1"]
+    assert profile_patch._pointer("") == []
+
+
+@pytest.mark.parametrize("path", ["a/b", 3, None])
+def test_pointer_rejects_relative_or_non_string_paths(path):
+    with pytest.raises(PatchError):
+        profile_patch._pointer(path)
+
+
+def test_escaped_pointer_addresses_keys_with_slashes():
+    document = {"learning_preferences": {"video/audio": True}}
+    result = apply_json_patch(document, [{"op": "replace", "path": "/learning_preferences/video~1audio", "value": False}])
+    assert result == {"learning_preferences": {"video/audio": False}}
+
+
+def test_test_operation_passes_and_conflicts():
+    document = {"experience_level": "beginner"}
+    operations = [
+        {"op": "test", "path": "/experience_level", "value": "beginner"},
+        {"op": "replace", "path": "/experience_level", "value": "advanced"},
+    ]
+    assert apply_json_patch(document, operations) == {"experience_level": "advanced"}
+    with pytest.raises(PatchConflict):
+        apply_json_patch(document, [{"op": "test", "path": "/experience_level", "value": "expert"}])
+
+
+def test_move_and_copy():
+    document = {"current_skills": {"js": 5}, "career_goals": ["frontend"]}
+    moved = apply_json_patch(document, [{"op": "move", "from": "/current_skills/js", "path": "/current_skills/javascript"}])
+    assert moved["current_skills"] == {"javascript": 5}
+    copied = apply_json_patch(document, [{"op": "copy", "from": "/career_goals", "path": "/interests"}])
+    assert copied["interests"] == ["frontend"]
+    copied["interests"].append("backend")
+    assert copied["career_goals"] == ["frontend"]
+
+
+def test_dash_index_appends_and_numeric_index_inserts():
+    document = {"interests": ["ai", "web"]}
+    result = apply_json_patch(document, [
+        {"op": "add", "path": "/interests/-", "value": "data"},
+        {"op": "add", "path": "/interests/0", "value": "cloud"},
+    ])
+    assert result["interests"] == ["cloud", "ai", "web", "data"]
+    assert document["interests"] == ["ai", "web"]
+    with pytest.raises(PatchError):
+        apply_json_patch(document, [{"op": "add", "path": "/interests/5", "value": "x"}])
+
+
+def test_malformed_operations_are_rejected():
+    with pytest.raises(PatchError):
+        apply_json_patch({}, {"op": "add"})
+    with pytest.raises(PatchError):
+        apply_json_patch({}, [{"op": "add", "path": "/interests"}])
+    with pytest.raises(PatchError):
+        apply_json_patch({}, [{"op": "move", "path": "/a"}])
+    with pytest.raises(PatchError):
+        apply_json_patch({}, [{"op": "frobnicate", "path": "/a", "value": 1}])
+    with pytest.raises(PatchError):
+        apply_json_patch({}, [{"op": "remove", "path": "/missing"}])
+
+
+def test_merge_patch_null_removes_keys_at_any_depth():
+    document = {"current_skills": {"python": 7, "sql": 4}, "preferred_location": "India"}
+    result = apply_merge_patch(document, {"current_skills": {"sql": None, "go": 3}, "preferred_location": None})
+    assert result == {"current_skills": {"python": 7, "go": 3}}
+    assert document["current_skills"] == {"python": 7, "sql": 4}
+
+
+def test_merge_patch_replaces_lists_whole():
+    assert apply_merge_patch({"interests": ["ai", "web"]}, {"interests": ["data"]}) == {"interests": ["data"]}
+
+
+def test_diff_produces_dotted_set_and_unset():
+    current = {"current_skills": {"python": 7, "sql": 4}, "interests": ["ai"], "time_available": 10}
+    updated = {"current_skills": {"python": 8, "go": 3}, "interests": ["ai", "web"], "time_available": 10}
+    sets, unsets = diff(current, updated)
+    assert sets == {"current_skills.python": 8, "current_skills.go": 3, "interests": ["ai", "web"]}
+    assert unsets == ["current_skills.sql"]
+    assert update_document(sets, unsets, {"updated_at": "now"}) == {
+        "$set": {"current_skills.python": 8, "current_skills.go": 3, "interests": ["ai", "web"], "updated_at": "now"},
+        "$unset": {"current_skills.sql": ""},
+    }
+
+
+def test_diff_replaces_documents_with_unaddressable_keys():
+    sets, unsets = diff({"learning_preferences": {"a.b": 1}}, {"learning_preferences": {"a.b": 2}})
+    assert sets == {"learning_preferences": {"a.b": 2}} and unsets == []
+    sets, _ = diff({"current_skills": {}}, {"current_skills": {"python": 1}})
+    assert sets == {"current_skills": {"python": 1}}
+
+
+def test_unchanged_document_needs_no_update():
+    document = {"current_skills": {"python": 7}, "interests": ["ai"]}
+    assert update_document(*diff(document, dict(document))) is None
+
+
+# PATCH /auth/profile/{user_id} against the in-memory fakes
+
+USER = {
+    "_id": "user-1",
+    "username": "asha",
+    "email": "asha@example.com",
+    "password": "hashed",
+    "interests": ["ai"],
+    "current_skills": {"python": 6, "sql": 4},
+    "career_goals": [],
+    "learning_preferences": {},
+    "experience_level": "beginner",
+    "preferred_location": "India",
+    "time_available": 10,
+    "budget_constraints": "moderate",
+}
+
+
+@pytest.fixture(scope="module")
+def app_module():
+    # Background loops would keep running between tests
+    os.environ.setdefault("ANALYTICS_REFRESH_SECONDS", "0")
+    os.environ.setdefault("AI_WARMUP_INTERVAL_SECONDS", "0")
+    import main
+    return main
+
+
+def _patch(main, body, headers=None, user_id=USER["_id"]):
+    from benchmarks.asgi_client import ASGIClient
+    from benchmarks.fake_llm import FakeGroqClient
+    from benchmarks.fake_mongo import FakeDatabase
+    from benchmarks.load_test import install_fakes
+
+    async def run():
+        database = FakeDatabase()
+        await database.seed({"users": [dict(USER)]})
+        install_fakes(main, database, FakeGroqClient(median_ms=0))
+        client = ASGIClient(main.app)
+        response = await client.request("PATCH", f"/auth/profile/{user_id}", json_body=body, headers=headers)
+        return response, await database.users.find_one({"_id": USER["_id"]})
+
+    return asyncio.run(run())
+
+
+def test_route_merge_patch_writes_only_changed_fields(app_module):
+    response, stored = _patch(app_module, {"current_skills": {"sql": None, "Python 3": 8}, "time_available": 12})
+    assert response.status == 200
+    assert response.json()["changed_fields"] == ["current_skills.python", "current_skills.sql", "time_available"]
+    assert stored["current_skills"] == {"python": 8}
+    assert stored["time_available"] == 12
+    assert stored["password"] == "hashed"
+
+
+def test_route_json_patch_applies_operations(app_module):
+    response, stored = _patch(app_module, [
+        {"op": "test", "path": "/experience_level", "value": "beginner"},
+        {"op": "add", "path": "/interests/-", "value": "web"},
+    ], headers={"content-type": "application/json-patch+json"})
+    assert response.status == 200
+    assert response.json()["changed_fields"] == ["interests"]
+    assert stored["interests"] == ["ai", "web"]
+
+
+def test_route_unchanged_profile_skips_the_write(app_module):
+    response, stored = _patch(app_module, {"interests": ["ai"]})
+    assert response.status == 200
+    assert response.json() == {"message": "Profile unchanged", "changed_fields": []}
+    assert "updated_at" not in stored
+
+
+@pytest.mark.parametrize("body, status", [
+    ([{"op": "test", "path": "/experience_level", "value": "advanced"}], 409),
+    ([{"op": "remove", "path": "/nothing"}], 400),
+    ({"password": "x"}, 400),
+    ({"email": "other@example.com"}, 400),
+    ({"time_available": "lots"}, 422),
+    ("text", 400),
+])
+def test_route_rejects_bad_patches(app_module, body, status):
+    response, stored = _patch(app_module, body)
+    assert response.status == status
+    assert stored["time_available"] == 10 and stored["email"] == USER["email"]
+
+
+def test_route_unknown_user(app_module):
+    response, stored = _patch(app_module, {"interests": []}, user_id="missing")
+    assert response.status == 404
+    assert stored["interests"] == ["ai"]
@@ -0,0 +1,105 @@
+"""Background warm-up that runs once the server is already accepting traffic.
+
+Module import only does cheap work; anything slow (SDK imports, client
+construction, the database round-trip) is registered here as a step and run
+after startup. Readiness only waits for the steps marked ``required``; the
+others just make the first real request cheaper.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class WarmupStep:
+    __slots__ = ("name", "run", "required", "state", "error", "started", "duration")
+
+    def __init__(self, name: str, run: Callable[[], Awaitable[Any]], required: bool):
+        self.name = name
+        self.run = run
+        self.required = required
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+        self.duration: Optional[float] = None
+
+
+class Warmup:
+    def __init__(self):
+        self.steps: List[WarmupStep] = []
+        self.created = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def step(self, name: str, required: bool = False):
+        """Register a coroutine function as a warm-up step"""
+        def register(func: Callable[[], Awaitable[Any]]):
+            self.steps.append(WarmupStep(name, func, required))
+            return func
+        return register
+
+    def preload(self, name: str, *modules: str) -> None:
+        """Import heavy optional modules on a worker thread"""
+        def load() -> None:
+            import importlib
+            for module in modules:
+                importlib.import_module(module)
+
+        async def run() -> None:
+            await asyncio.to_thread(load)
+
+        self.steps.append(WarmupStep(name, run, False))
+
+    async def _run_step(self, step: WarmupStep) -> None:
+        step.state = RUNNING
+        step.started = time.monotonic()
+        try:
+            await step.run()
+            step.state = DONE
+        except Exception as e:
+            step.state = FAILED
+            step.error = str(e) or type(e).__name__
+            logger.error("Warm-up step failed", extra={"step": step.name, "error": step.error})
+        finally:
+            step.duration = time.monotonic() - step.started
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self._run_step(step) for step in self.steps))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    @property
+    def ready(self) -> bool:
+        return all(step.state == DONE for step in self.steps if step.required)
+
+    @property
+    def complete(self) -> bool:
+        return all(step.state in (DONE, FAILED) for step in self.steps)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warmup_complete": self.complete,
+            "uptime_s": round(time.monotonic() - self.created, 3),
+            "steps": {
+                step.name: {
+                    "state": step.state,
+                    "required": step.required,
+                    "duration_ms": round(step.duration * 1000, 1) if step.duration is not None else None,
+                    "error": step.error,
+                }
+                for step in self.steps
+            },
+        }
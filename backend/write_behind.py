@@ -0,0 +1,479 @@
+"""Write-behind buffer for insert and update bursts, backed by a local WAL.
+
+Handlers hand their writes to ``WriteBehindBuffer.insert``/``update``, which
+return as soon as the write is appended to a write-ahead log on local disk and
+fsynced. Writes arriving together share one fsync (group commit), so a burst
+costs a few disk syncs rather than one MongoDB round-trip per request. A
+background flusher applies the queued writes when ``flush_batch_size`` of them
+are waiting or every ``flush_interval`` seconds: per collection, one unordered
+``insert_many`` for the inserts followed by one ordered ``bulk_write`` for the
+updates, keeping updates in arrival order.
+
+The log is a sequence of segment files of CRC-checked BSON records. Flushing
+seals the active segment and deletes sealed segments once their writes are in
+MongoDB. On startup every segment still on disk is replayed, and a torn record
+at the tail from a crash mid-append is dropped; an append that fails part-way
+is cut off again before the next one, so a tear never hides later records.
+Replay can repeat writes that reached MongoDB just before the crash, so
+buffered writes must be idempotent: inserts carry their own ``_id``
+(duplicates are ignored) and updates use ``$set``-style operators.
+
+Several processes may share ``directory``. Each claims a ``slot-NN``
+subdirectory under an exclusive ``flock`` and keeps its segments there, so no
+process replays or deletes a log another one is still appending to. Slots
+whose lock is free belong to processes that exited; ``open`` replays and
+adopts them until their writes are flushed.
+
+A write MongoDB rejects for good (a validation error, an oversized document,
+an update that does not apply to the stored document) is appended to the
+slot's ``dead-letters.log`` in the same record format and dropped, so it
+cannot hold up the writes behind it. Anything else fails the flush, and the
+batch is retried.
+
+Buffered writes are visible to readers only after the flush; ``is_pending``
+lets a handler flush first when it needs its own write back.
+"""
+import asyncio
+import fcntl
+import logging
+import os
+import struct
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import IO, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import bson
+from bson.errors import InvalidDocument
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 0.2
+DEFAULT_FLUSH_BATCH_SIZE = 1000
+DEFAULT_MAX_DEPTH = 100000
+DUPLICATE_KEY = 11000
+# Server error codes that may pass on retry (elections, shutdowns, timeouts, write conflicts)
+TRANSIENT_ERROR_CODES = frozenset({6, 7, 50, 89, 91, 112, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436})
+DEAD_LETTER_FILE = "dead-letters.log"
+
+_CRC = struct.Struct("<I")
+_LENGTH = struct.Struct("<i")
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+_SLOT_PREFIX = "slot-"
+_LOCK_FILE = "lock"
+
+FlushCallback = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+class WriteBufferFull(Exception):
+    """Raised when the buffer holds ``max_depth`` unflushed writes"""
+
+
+def _segment_name(number: int) -> str:
+    return f"{_SEGMENT_PREFIX}{number:08d}{_SEGMENT_SUFFIX}"
+
+
+def _segment_number(name: str) -> Optional[int]:
+    if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+        digits = name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)]
+        if digits.isdigit():
+            return int(digits)
+    return None
+
+
+def _segment_numbers(directory: str) -> List[int]:
+    return sorted(number for number in map(_segment_number, os.listdir(directory)) if number is not None)
+
+
+def _lock_slot(path: str) -> Optional[IO]:
+    """The slot's lock file, held exclusively, or None if another process holds it"""
+    os.makedirs(path, exist_ok=True)
+    lock = open(os.path.join(path, _LOCK_FILE), "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    data = bson.encode(record)
+    return data + _CRC.pack(zlib.crc32(data))
+
+
+def read_records(data: bytes) -> Tuple[List[Dict[str, Any]], int]:
+    """Records of one segment and the byte length of its intact prefix"""
+    records = []
+    offset = 0
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        end = offset + length
+        if length < 5 or end + _CRC.size > len(data):
+            break
+        body = data[offset:end]
+        if _CRC.unpack_from(data, end)[0] != zlib.crc32(body):
+            break
+        records.append(bson.decode(body))
+        offset = end + _CRC.size
+    return records, offset
+
+
+class WriteBehindBuffer:
+    """Durable local queue of MongoDB writes, applied in batches"""
+
+    def __init__(self, db, directory: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 flush_batch_size: int = DEFAULT_FLUSH_BATCH_SIZE, max_depth: int = DEFAULT_MAX_DEPTH,
+                 fsync: bool = True, after_flush: Optional[FlushCallback] = None):
+        self.db = db
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.max_depth = max_depth
+        self.fsync = fsync
+        # Called with every batch once it is in MongoDB, e.g. to derive fields from the stored result
+        self.after_flush = after_flush
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_ids: Counter = Counter()
+        self._unsynced: List[Tuple[Dict[str, Any], bytes]] = []
+        self._sync_future: Optional[asyncio.Future] = None
+        self._sync_tasks: Set[asyncio.Task] = set()
+        self._append_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flush_wanted = asyncio.Event()
+        self.slot: Optional[str] = None
+        self._slot_lock: Optional[IO] = None
+        # Slots of exited processes being drained, until their segments are flushed
+        self._adopted: Dict[str, IO] = {}
+        self._segment_number = 0
+        self._segment = None
+        self._segment_size = 0
+        self._sealed: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self.replayed = 0
+        self.appended = 0
+        self.syncs = 0
+        self.last_sync_ms = 0.0
+        self.flushes = 0
+        self.flushed_writes = 0
+        self.flush_errors = 0
+        self.dead_letters = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.oldest_pending: Optional[float] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending) + len(self._unsynced)
+
+    def is_pending(self, collection: str, document_id: Any) -> bool:
+        """Whether an insert of this document is still waiting to be flushed"""
+        return self._pending_ids[(collection, document_id)] > 0
+
+    def open(self) -> int:
+        """Claim a slot, replay the segments it and any abandoned slots hold, and start a fresh segment"""
+        os.makedirs(self.directory, exist_ok=True)
+        number = 0
+        while self._slot_lock is None:
+            self.slot = os.path.join(self.directory, f"{_SLOT_PREFIX}{number:02d}")
+            self._slot_lock = _lock_slot(self.slot)
+            number += 1
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if not name.startswith(_SLOT_PREFIX) or path == self.slot or not os.path.isdir(path):
+                continue
+            lock = _lock_slot(path)
+            if lock is None:
+                continue
+            if _segment_numbers(path):
+                self._adopted[path] = lock
+                self._replay(path)
+            else:
+                lock.close()
+
+        numbers = _segment_numbers(self.slot)
+        self._replay(self.slot)
+        self._segment_number = numbers[-1] if numbers else 0
+        self._open_segment()
+        if self._pending:
+            self._flush_wanted.set()
+        return self.replayed
+
+    def _replay(self, slot: str) -> None:
+        for number in _segment_numbers(slot):
+            path = os.path.join(slot, _segment_name(number))
+            with open(path, "rb") as f:
+                data = f.read()
+            records, intact = read_records(data)
+            if intact < len(data):
+                logger.warning("Dropped a torn record from the write-behind log",
+                               extra={"path": path, "bytes": len(data) - intact})
+            for record in records:
+                self._queue(record)
+            self._sealed.append(path)
+            self.replayed += len(records)
+
+    def _open_segment(self) -> None:
+        self._segment_number += 1
+        # Unbuffered, so a failed append leaves nothing behind to be written later
+        self._segment = open(os.path.join(self.slot, _segment_name(self._segment_number)), "ab", buffering=0)
+        self._segment_size = 0
+
+    def _seal_segment(self) -> None:
+        self._segment.close()
+        self._sealed.append(self._segment.name)
+        self._segment = None
+
+    def _queue(self, record: Dict[str, Any]) -> None:
+        self._pending.append(record)
+        if record["kind"] == "insert":
+            self._pending_ids[(record["collection"], record["document"].get("_id"))] += 1
+        if self.oldest_pending is None:
+            self.oldest_pending = time.monotonic()
+        if len(self._pending) >= self.flush_batch_size:
+            self._flush_wanted.set()
+
+    async def insert(self, collection: str, document: Dict[str, Any]) -> None:
+        if "_id" not in document:
+            raise ValueError("Buffered inserts need an _id so a replay cannot duplicate them")
+        await self._append({"collection": collection, "kind": "insert", "document": document})
+
+    async def update(self, collection: str, query: Dict[str, Any], update: Dict[str, Any]) -> None:
+        await self._append({"collection": collection, "kind": "update", "query": query, "update": update})
+
+    async def _append(self, record: Dict[str, Any]) -> None:
+        if self._slot_lock is None:
+            raise RuntimeError("Write-behind buffer is not open")
+        if self.depth >= self.max_depth:
+            raise WriteBufferFull(f"{self.depth} writes waiting to be flushed")
+        self._unsynced.append((record, encode_record(record)))
+        future = self._sync_future
+        if future is None:
+            future = self._sync_future = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self._sync(future))
+            self._sync_tasks.add(task)
+            task.add_done_callback(self._sync_tasks.discard)
+        await asyncio.shield(future)
+
+    async def _sync(self, future: asyncio.Future) -> None:
+        """Append and fsync every record that joined ``future``'s group, then queue them for flushing"""
+        async with self._append_lock:
+            group, self._unsynced = self._unsynced, []
+            self._sync_future = None
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._write, b"".join(frame for _, frame in group))
+            except Exception as e:
+                await asyncio.to_thread(self._discard_torn_tail)
+                future.set_exception(e)
+                future.exception()
+                return
+            self.last_sync_ms = (time.perf_counter() - started) * 1000
+            self.syncs += 1
+            self.appended += len(group)
+            for record, _ in group:
+                self._queue(record)
+            future.set_result(None)
+
+    def _write(self, data: bytes) -> None:
+        if self._segment is None:
+            self._open_segment()
+        view = memoryview(data)
+        while view:
+            view = view[self._segment.write(view):]
+        if self.fsync:
+            os.fsync(self._segment.fileno())
+        self._segment_size += len(data)
+
+    def _discard_torn_tail(self) -> None:
+        """Cut a failed append off the segment, so later records are not stranded behind it on replay"""
+        if self._segment is None:
+            return
+        try:
+            os.ftruncate(self._segment.fileno(), self._segment_size)
+            return
+        except OSError:
+            pass
+        # Replay stops at the tear, which is now after every acknowledged record of this segment
+        try:
+            self._seal_segment()
+        except OSError:
+            self._segment = None
+        logger.error("Could not truncate a failed write-behind append; sealed the segment",
+                     extra={"slot": self.slot, "segment": self._segment_number})
+
+    async def flush(self) -> int:
+        """Apply every queued write to MongoDB; returns how many were applied"""
+        async with self._flush_lock:
+            async with self._append_lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, []
+                # Everything in ``batch`` is in the active or sealed segments; new writes go to a new one
+                if self._segment is not None:
+                    self._seal_segment()
+                sealed, oldest = list(self._sealed), self.oldest_pending
+                self.oldest_pending = None
+
+            started = time.perf_counter()
+            try:
+                await self._apply(batch)
+            except Exception:
+                # Retry the batch ahead of anything queued since
+                self._pending = batch + self._pending
+                self.oldest_pending = oldest if oldest is not None else self.oldest_pending
+                self.flush_errors += 1
+                raise
+            elapsed = (time.perf_counter() - started) * 1000
+            self.last_flush_ms = elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+            self.flushes += 1
+            self.flushed_writes += len(batch)
+            for record in batch:
+                if record["kind"] == "insert":
+                    key = (record["collection"], record["document"].get("_id"))
+                    self._pending_ids[key] -= 1
+                    if self._pending_ids[key] <= 0:
+                        del self._pending_ids[key]
+            for path in sealed:
+                os.remove(path)
+                self._sealed.remove(path)
+            for slot in [slot for slot in self._adopted if not any(
+                    os.path.dirname(path) == slot for path in self._sealed)]:
+                self._adopted.pop(slot).close()
+
+        if self.after_flush is not None:
+            try:
+                await self.after_flush(batch)
+            except Exception:
+                logger.exception("Write-behind after_flush callback failed")
+        return len(batch)
+
+    async def _apply(self, batch: List[Dict[str, Any]]) -> None:
+        by_collection: Dict[str, List[Dict[str, Any]]] = {}
+        for record in batch:
+            by_collection.setdefault(record["collection"], []).append(record)
+        await asyncio.gather(*(self._apply_collection(name, records) for name, records in by_collection.items()))
+
+    async def _apply_collection(self, name: str, records: List[Dict[str, Any]]) -> None:
+        collection = self.db[name]
+        inserts = [record for record in records if record["kind"] == "insert"]
+        if inserts:
+            try:
+                await collection.insert_many([record["document"] for record in inserts], ordered=False)
+            except BulkWriteError as e:
+                # Unordered, so every write without an error went in
+                for error in self._permanent_errors(e):
+                    # Duplicates were inserted by a flush that ran before a crash
+                    if error.get("code") != DUPLICATE_KEY:
+                        self._dead_letter(inserts[error["index"]], error.get("errmsg", ""))
+            except InvalidDocument:
+                await self._apply_separately(collection, inserts)
+
+        updates = [record for record in records if record["kind"] == "update"]
+        start = 0
+        while start < len(updates):
+            try:
+                await collection.bulk_write([UpdateOne(record["query"], record["update"])
+                                             for record in updates[start:]], ordered=True)
+                break
+            except BulkWriteError as e:
+                # Ordered, so it stopped at the one failed update; carry on after it
+                error = self._permanent_errors(e)[0]
+                self._dead_letter(updates[start + error["index"]], error.get("errmsg", ""))
+                start += error["index"] + 1
+            except InvalidDocument:
+                await self._apply_separately(collection, updates[start:])
+                break
+
+    @staticmethod
+    def _permanent_errors(error: BulkWriteError) -> List[Dict[str, Any]]:
+        """Write errors of ``error``, which is raised again if any of them may pass on retry"""
+        details = error.details or {}
+        errors = details.get("writeErrors") or []
+        if details.get("writeConcernErrors") or not errors or any(
+                write_error.get("code") in TRANSIENT_ERROR_CODES for write_error in errors):
+            raise error
+        return errors
+
+    async def _apply_separately(self, collection, records: List[Dict[str, Any]]) -> None:
+        """Apply writes one by one, to set apart those the driver refuses to send (e.g. oversized ones)"""
+        for record in records:
+            try:
+                if record["kind"] == "insert":
+                    await collection.insert_one(record["document"])
+                else:
+                    await collection.update_one(record["query"], record["update"])
+            except DuplicateKeyError as e:
+                if record["kind"] != "insert":
+                    self._dead_letter(record, str(e))
+            except InvalidDocument as e:
+                self._dead_letter(record, str(e))
+            except OperationFailure as e:
+                if e.code in TRANSIENT_ERROR_CODES:
+                    raise
+                self._dead_letter(record, str(e))
+
+    def _dead_letter(self, record: Dict[str, Any], error: str) -> None:
+        """Set a rejected write aside; it is written before its segment is deleted, so it is never lost"""
+        entry = encode_record({"record": record, "error": error, "failed_at": datetime.utcnow()})
+        with open(os.path.join(self.slot, DEAD_LETTER_FILE), "ab") as f:
+            f.write(entry)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.dead_letters += 1
+        logger.error("Dropped a write MongoDB rejected; kept in the dead-letter log", extra={
+            "collection": record["collection"], "kind": record["kind"], "error": error,
+            "path": os.path.join(self.slot, DEAD_LETTER_FILE)})
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wanted.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wanted.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        for lock in [*self._adopted.values(), self._slot_lock]:
+            if lock is not None:
+                lock.close()
+        self._adopted = {}
+        self._slot_lock = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "oldest_pending_seconds": round(time.monotonic() - self.oldest_pending, 3) if self.oldest_pending else 0.0,
+            "appended": self.appended,
+            "replayed": self.replayed,
+            "wal_syncs": self.syncs,
+            "last_wal_sync_ms": round(self.last_sync_ms, 3),
+            "flushes": self.flushes,
+            "flushed_writes": self.flushed_writes,
+            "flush_errors": self.flush_errors,
+            "dead_letters": self.dead_letters,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "sealed_segments": len(self._sealed),
+            "slot": os.path.basename(self.slot) if self.slot else None,
+        }